@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from itertools import pairwise
+from pathlib import Path
+
+import httpx
+from sqlmodel import (
+    Field,
+    Session,
+    SQLModel,
+    col,
+    create_engine,
+    delete,
+    func,
+    select,
+    update,
+)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class Embedder(ABC):
+    """Turns texts into vectors. Subclasses implement ``embed``."""
+
+    name = "base"
+    dimensions = 0
+
+    @property
+    def signature(self) -> str:
+        """Identifier of the model and its settings, used to key cached vectors."""
+        return f"{self.name}:{self.dimensions}"
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """Return one vector per text, in order."""
+
+    def close(self) -> None:
+        """Release any resources held by the embedder."""
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic local embedder based on signed feature hashing of word unigrams and bigrams.
+
+    Needs no model or network, so it suits tests and air-gapped deployments;
+    similarity reflects shared vocabulary rather than meaning.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dimensions: int = 384) -> None:
+        """
+        Initialize the embedder.
+
+        Args:
+            dimensions: Length of the produced vectors
+        """
+        if dimensions <= 0:
+            raise ValueError("dimensions must be positive")
+        self.dimensions = dimensions
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        words = _TOKEN_RE.findall(text.lower())
+        features = words + [f"{a} {b}" for a, b in pairwise(words)]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dimensions] += 1.0 if value >> 63 else -1.0
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+
+class OpenAIEmbedder(Embedder):
+    """Embedder calling the OpenAI embeddings API over a pooled HTTP connection."""
+
+    name = "openai"
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "text-embedding-3-large",
+        dimensions: int | None = None,
+        timeout: float = 30.0,
+        base_url: str = "https://api.openai.com/v1",
+    ) -> None:
+        """
+        Initialize the embedder.
+
+        Args:
+            api_key: OpenAI API key
+            model: Embedding model name
+            dimensions: Optional reduced vector size supported by v3 models
+            timeout: Request timeout in seconds
+            base_url: API base URL
+        """
+        self.model = model
+        self.dimensions = dimensions or 0
+        self._client = httpx.Client(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+        )
+
+    @property
+    def signature(self) -> str:
+        return f"{self.name}:{self.model}:{self.dimensions}"
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        payload: dict[str, object] = {"model": self.model, "input": texts}
+        if self.dimensions:
+            payload["dimensions"] = self.dimensions
+
+        response = self._client.post("/embeddings", json=payload)
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class CachedEmbedding(SQLModel, table=True):
+    """Embedding vector stored under a hash of the embedder signature and text."""
+
+    key: str = Field(primary_key=True)
+    vector: bytes
+    last_used: float = Field(index=True)
+
+
+class EmbeddingCache:
+    """Content-addressed on-disk embedding cache with least-recently-used eviction."""
+
+    def __init__(self, path: str | Path, max_entries: int = 100_000) -> None:
+        """
+        Initialize the cache database.
+
+        Args:
+            path: Path of the SQLite database file (created if missing)
+            max_entries: Maximum number of vectors kept before evicting the least recently used
+        """
+        db_path = Path(path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        SQLModel.metadata.create_all(self.engine, tables=[CachedEmbedding.__table__])
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        with Session(self.engine) as session:
+            self._size = session.exec(select(func.count()).select_from(CachedEmbedding)).one()
+
+    @staticmethod
+    def key(signature: str, text: str) -> str:
+        """Return the cache key of a text for a given embedder."""
+        return hashlib.sha256(f"{signature}\0{text}".encode()).hexdigest()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Return cached vectors for the keys that are present and mark them as used."""
+        if not keys:
+            return {}
+
+        found: dict[str, list[float]] = {}
+        with self._lock, Session(self.engine) as session:
+            rows = session.exec(select(CachedEmbedding).where(col(CachedEmbedding.key).in_(keys)))
+            for row in rows:
+                found[row.key] = array("f", row.vector).tolist()
+            if found:
+                session.exec(
+                    update(CachedEmbedding)
+                    .where(col(CachedEmbedding.key).in_(list(found)))
+                    .values(last_used=time.time())
+                )
+                session.commit()
+        return found
+
+    def put_many(self, vectors: dict[str, list[float]]) -> None:
+        """Store vectors and evict the least recently used entries beyond the limit."""
+        if not vectors:
+            return
+
+        now = time.time()
+        with self._lock, Session(self.engine) as session:
+            for key, vector in vectors.items():
+                session.merge(
+                    CachedEmbedding(key=key, vector=array("f", vector).tobytes(), last_used=now)
+                )
+            session.commit()
+            self._size += len(vectors)
+
+            excess = self._size - self.max_entries
+            if excess > 0:
+                self._size = session.exec(select(func.count()).select_from(CachedEmbedding)).one()
+                excess = self._size - self.max_entries
+            if excess > 0:
+                oldest = (
+                    select(CachedEmbedding.key)
+                    .order_by(CachedEmbedding.last_used)
+                    .limit(excess)
+                    .scalar_subquery()
+                )
+                session.exec(delete(CachedEmbedding).where(col(CachedEmbedding.key).in_(oldest)))
+                session.commit()
+                self._size -= excess
+
+
+class CachedEmbedder(Embedder):
+    """Embedder wrapper that serves repeated texts from an ``EmbeddingCache`` and batches misses."""
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        cache: EmbeddingCache | None = None,
+        batch_size: int = 64,
+    ) -> None:
+        """
+        Initialize the wrapper.
+
+        Args:
+            embedder: Embedder used for cache misses
+            cache: Optional embedding cache (no caching if omitted)
+            batch_size: Maximum number of texts sent to the embedder per call
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        self.embedder = embedder
+        self.cache = cache
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return self.embedder.name
+
+    @property
+    def dimensions(self) -> int:  # type: ignore[override]
+        return self.embedder.dimensions
+
+    @property
+    def signature(self) -> str:
+        return self.embedder.signature
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        signature = self.embedder.signature
+        keys = [EmbeddingCache.key(signature, text) for text in texts]
+        vectors = self.cache.get_many(list(set(keys))) if self.cache else {}
+
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), self.batch_size):
+            batch_keys = missing_keys[start:start + self.batch_size]
+            embedded = self.embedder.embed([missing[key] for key in batch_keys])
+            fresh = dict(zip(batch_keys, embedded))
+            vectors.update(fresh)
+            if self.cache:
+                self.cache.put_many(fresh)
+
+        return [vectors[key] for key in keys]
+
+    def close(self) -> None:
+        self.embedder.close()
+
+
+def create_embedder(
+    backend: str,
+    openai_api_key: str | None = None,
+    model: str = "text-embedding-3-large",
+    dimensions: int | None = None,
+    batch_size: int = 64,
+    cache_path: str | Path | None = None,
+    cache_max_entries: int = 100_000,
+) -> Embedder | None:
+    """
+    Build the client-side embedder selected in settings.
+
+    Args:
+        backend: "weaviate" (server-side vectorization, returns None), "openai" or "hashing"
+        openai_api_key: OpenAI API key for the "openai" backend
+        model: Embedding model name for the "openai" backend
+        dimensions: Vector size (defaults to the model's size, 384 for "hashing")
+        batch_size: Maximum number of texts per embedding request
+        cache_path: Path of the embedding cache database (no cache if None)
+        cache_max_entries: Maximum number of cached vectors
+
+    Returns:
+        Cached embedder, or None when vectors are computed by Weaviate
+    """
+    if backend == "weaviate":
+        return None
+    if backend == "hashing":
+        embedder: Embedder = HashingEmbedder(dimensions=dimensions or 384)
+    elif backend == "openai":
+        if not openai_api_key:
+            raise ValueError("OPENAI_API_KEY is required for the openai embedding backend")
+        embedder = OpenAIEmbedder(api_key=openai_api_key, model=model, dimensions=dimensions)
+    else:
+        raise ValueError(
+            f"Unknown embedding backend {backend!r}; expected weaviate, openai or hashing"
+        )
+
+    cache = EmbeddingCache(cache_path, cache_max_entries) if cache_path and cache_max_entries > 0 else None
+    return CachedEmbedder(embedder, cache=cache, batch_size=batch_size)
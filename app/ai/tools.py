@@ -1,27 +1,27 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from typing import Any
 
 from langchain_core.tools import tool
-from tavily import TavilyClient
 
-from app.repositories.weaviate_repository import WeaviateRepository
+from app.ai.web_search import TavilySearchClient
+from app.repositories.async_weaviate_repository import AsyncWeaviateRepository
+from app.repositories.weaviate_repository import SearchOptions
 
 
-def create_tavily_tool(api_key: str) -> Any:
+def create_tavily_tool(client: TavilySearchClient) -> Any:
     """
     Create a LangChain tool wrapper for Tavily search.
 
     Args:
-        api_key: Tavily API key
+        client: Shared TavilySearchClient instance
 
     Returns:
         LangChain tool for Tavily search
     """
-    tavily_client = TavilyClient(api_key=api_key)
-
     @tool
-    def tavily_search(query: str) -> str:
+    async def tavily_search(query: str) -> str:
         """
         Search the web for current information using Tavily.
 
@@ -35,38 +35,38 @@ def create_tavily_tool(api_key: str) -> Any:
             Formatted string with search results
         """
         try:
-            response = tavily_client.search(query=query, max_results=5)
-            results = response.get("results", [])
+            results = await client.search(query)
 
             if not results:
                 return "No results found."
 
-            formatted_results = []
-            for result in results:
-                title = result.get("title", "No title")
-                url = result.get("url", "")
-                content = result.get("content", "")
-                formatted_results.append(f"Title: {title}\nURL: {url}\nContent: {content}\n")
-
-            return "\n---\n".join(formatted_results)
+            return "\n---\n".join(result.text for result in results)
         except Exception as e:
             return f"Error searching: {str(e)}"
 
     return tavily_search
 
 
-def create_weaviate_tool(repo: WeaviateRepository) -> Any:
+def create_weaviate_tool(
+    repo: AsyncWeaviateRepository,
+    options: SearchOptions | None = None,
+) -> Any:
     """
     Create a LangChain tool wrapper for Weaviate retrieval.
 
     Args:
-        repo: WeaviateRepository instance
+        repo: AsyncWeaviateRepository instance
+        options: Default search options; the tool's source and alpha arguments override them
 
     Returns:
         LangChain tool for Weaviate retrieval
     """
     @tool
-    def weaviate_retrieve(query: str) -> str:
+    async def weaviate_retrieve(
+        query: str,
+        source: str | None = None,
+        alpha: float | None = None,
+    ) -> str:
         """
         Search internal knowledge base using Weaviate vector search.
 
@@ -75,12 +75,21 @@ def create_weaviate_tool(repo: WeaviateRepository) -> Any:
 
         Args:
             query: Search query string
+            source: Only search chunks of this document (its file name)
+            alpha: Balance of semantic (1.0) against exact keyword (0.0) matching
 
         Returns:
             Formatted string with retrieved documents
         """
         try:
-            results = repo.search(query, limit=5)
+            search_options = options or SearchOptions()
+            if source is not None:
+                search_options = replace(
+                    search_options, filters={**(search_options.filters or {}), "source": source}
+                )
+            if alpha is not None:
+                search_options = replace(search_options, alpha=alpha)
+            results = await repo.search(query, limit=5, options=search_options)
 
             if not results:
                 return "No documents found in knowledge base."
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from app.utils.cache import TTLCache, normalize_query
+
+
+@dataclass(frozen=True)
+class WebSearchResult:
+    """One web search hit."""
+
+    title: str
+    url: str
+    content: str
+    score: float | None = None
+
+    @property
+    def text(self) -> str:
+        """The result formatted as a context part for the prompt."""
+        return f"Title: {self.title}\nURL: {self.url}\nContent: {self.content}\n"
+
+
+class TavilySearchClient:
+    """Async Tavily search client over a pooled HTTP connection, with a result cache.
+
+    One client is shared by all requests, so TLS connections to the API are
+    reused. Each call is bounded by ``timeout``, and results are cached per
+    normalized query and result count.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_results: int = 5,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        cache: TTLCache | None = None,
+        base_url: str = "https://api.tavily.com",
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            api_key: Tavily API key
+            max_results: Default number of results per search
+            timeout: Request timeout in seconds
+            max_connections: Maximum pooled connections to the API
+            cache: Optional cache of results keyed on query and result count
+            base_url: API base URL
+            transport: Optional HTTP transport replacing the network one
+        """
+        self.max_results = max_results
+        self.cache = cache
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections),
+            transport=transport,
+        )
+
+    async def search(self, query: str, max_results: int | None = None) -> list[WebSearchResult]:
+        """
+        Search the web.
+
+        Args:
+            query: Search query string
+            max_results: Number of results (defaults to the client's max_results)
+
+        Returns:
+            Results in Tavily's relevance order
+
+        Raises:
+            httpx.HTTPError: If the request fails or times out
+        """
+        count = max_results or self.max_results
+        key = (normalize_query(query), count)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        generation = self.cache.generation if self.cache is not None else None
+        results = await self._search(query, count)
+        if self.cache is not None:
+            self.cache.put(key, results, generation)
+        return results
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self._client.aclose()
+
+    async def _search(self, query: str, max_results: int) -> list[WebSearchResult]:
+        response = await self._client.post(
+            "/search", json={"query": query, "max_results": max_results}
+        )
+        response.raise_for_status()
+        return [web_search_result(item) for item in response.json().get("results", [])]
+
+
+def web_search_result(item: dict[str, Any]) -> WebSearchResult:
+    """Build a result from an item of Tavily's ``results`` list."""
+    score = item.get("score")
+    return WebSearchResult(
+        title=item.get("title") or "No title",
+        url=item.get("url") or "",
+        content=item.get("content") or "",
+        score=float(score) if score is not None else None,
+    )
@@ -1,5 +1,6 @@
 from fastapi import Depends
 
+from app.core.config import Settings
 from app.core.container import AppContainer, get_container
 
 
@@ -7,9 +8,29 @@ def get_app_container() -> AppContainer:
     return get_container()
 
 
+def get_app_settings(container: AppContainer = Depends(get_app_container)) -> Settings:
+    return container.settings
+
+
 def get_query_service(container: AppContainer = Depends(get_app_container)):
     return container.query_service
 
 
+def get_ingest_service(container: AppContainer = Depends(get_app_container)):
+    return container.ingest_service
+
+
+def get_ingest_jobs(container: AppContainer = Depends(get_app_container)):
+    return container.ingest_jobs
+
+
 def get_weaviate_repository(container: AppContainer = Depends(get_app_container)):
     return container.weaviate_repo
+
+
+def get_async_weaviate_repository(container: AppContainer = Depends(get_app_container)):
+    return container.async_weaviate_repo
+
+
+def get_status_monitor(container: AppContainer = Depends(get_app_container)):
+    return container.status_monitor
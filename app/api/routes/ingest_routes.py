@@ -1,63 +1,452 @@
+import asyncio
+import tarfile
+import zipfile
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 
-from app.api.dependencies import get_weaviate_repository
-from app.repositories.weaviate_repository import WeaviateRepository
-from app.schemas.ingest_schema import IngestResponse
-from app.utils.pdf_parser import parse_pdf
+from app.api.dependencies import get_app_settings, get_ingest_jobs, get_ingest_service
+from app.core.config import Settings
+from app.repositories.weaviate_repository import WEAVIATE_ERRORS
+from app.schemas.ingest_schema import (
+    BulkIngestFileResult,
+    BulkIngestResponse,
+    DeleteSourceResponse,
+    IngestJobResponse,
+    IngestResponse,
+)
+from app.services.ingest_job_queue import IngestJob, IngestJobQueue
+from app.services.ingest_service import IngestProgress, IngestService, duplicate_sources
 
 router = APIRouter(prefix="/ingest", tags=["ingest"])
 
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+class ArchiveLimitError(Exception):
+    """An upload exceeds the bulk request's file count or uncompressed size limit."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
 
 @router.post("/pdf", response_model=IngestResponse)
 async def ingest_pdf(
     file: UploadFile = File(...),
-    repo: WeaviateRepository = Depends(get_weaviate_repository),
+    replace: bool = Query(
+        False, description="Delete chunks of the previous version that are no longer present"
+    ),
+    service: IngestService = Depends(get_ingest_service),
+    settings: Settings = Depends(get_app_settings),
 ) -> IngestResponse:
     """
     Upload and ingest PDF file into Weaviate.
 
-    PDF will be parsed and split into chunks for indexing.
-    Works for PDFs of any size.
-    """
-    # Validate file type
-    if not file.filename or not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only PDF files are supported",
-        )
+    The upload is spooled to disk, its pages are extracted in worker
+    processes and chunks are written to Weaviate in bounded batches, so
+    memory use does not grow with file size and the event loop stays free.
 
-    # Save uploaded file temporarily
-    with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_path = tmp_file.name
+    With `replace=true` the upload becomes the new version of the source:
+    chunks of the previous version that it no longer produces are deleted once
+    the new chunks are written, so unchanged chunks are never re-embedded.
+    """
+    _validate_pdf(file)
+    tmp_path = await _spool_upload(file, settings.ingest_upload_chunk_bytes)
 
     try:
-        # Parse PDF into chunks
-        chunks = parse_pdf(tmp_path)
+        # Parse PDF off the event loop and add chunks to Weaviate batch by batch
+        result = await service.ingest_pdf(
+            tmp_path, source=Path(file.filename).name, replace=replace
+        )
+
+        if result.unchanged:
+            return IngestResponse(status="unchanged", count=0)
 
-        if not chunks:
+        if not result.chunks_written and not result.chunks_skipped:
+            # Nothing extracted, or every chunk was rejected after retries
             return IngestResponse(
                 status="error",
                 count=0,
+                failed=result.failures,
+                retries=result.retries,
+                objects_per_second=result.objects_per_second,
             )
 
-        # Add to Weaviate
-        documents = [
-            {"text": chunk["text"], "metadata": chunk["metadata"]}
-            for chunk in chunks
-        ]
-        repo.add_documents(documents)
-
-        return IngestResponse(status="success", count=len(documents))
+        return IngestResponse(
+            status="partial" if result.failures else "success",
+            count=result.chunks_written,
+            skipped=result.chunks_skipped,
+            failed=result.failures,
+            retries=result.retries,
+            deleted=result.chunks_deleted,
+            objects_per_second=result.objects_per_second,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing PDF: {str(e)}",
+            detail=f"Error processing PDF: {e}",
         )
     finally:
         # Cleanup temp file
-        Path(tmp_path).unlink(missing_ok=True)
\ No newline at end of file
+        Path(tmp_path).unlink(missing_ok=True)
+
+
+@router.post("/bulk", response_model=BulkIngestResponse)
+async def ingest_bulk(
+    files: list[UploadFile] = File(...),
+    replace: bool = Query(
+        False, description="Delete chunks of the previous version that are no longer present"
+    ),
+    service: IngestService = Depends(get_ingest_service),
+    settings: Settings = Depends(get_app_settings),
+) -> BulkIngestResponse:
+    """
+    Upload many PDF files, or zip/tar archives of PDFs, and ingest them together.
+
+    Files are parsed concurrently and all chunks are streamed through a single
+    Weaviate batch. Archive members are reported by their path in the archive.
+    """
+    for file in files:
+        name = (file.filename or "").lower()
+        if not name.endswith(".pdf") and not name.endswith(ARCHIVE_SUFFIXES):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported file {file.filename!r}: expected PDF, zip or tar",
+            )
+
+    spooled: list[tuple[str, str]] = []
+    spooled_bytes = 0
+    max_files = settings.ingest_bulk_max_files
+    max_bytes = settings.ingest_bulk_max_bytes
+    try:
+        for file in files:
+            # Limits are checked while each upload streams in, not after it is on disk
+            remaining_bytes = max_bytes - spooled_bytes
+            if file.filename.lower().endswith(".pdf"):
+                _check_bulk_limits(len(spooled) + 1, spooled_bytes, max_files, max_bytes)
+                tmp_path = await _spool_upload(
+                    file, settings.ingest_upload_chunk_bytes, max_bytes=remaining_bytes
+                )
+                spooled.append((tmp_path, Path(file.filename).name))
+                spooled_bytes += Path(tmp_path).stat().st_size
+                continue
+
+            archive_path = await _spool_upload(
+                file, settings.ingest_upload_chunk_bytes, suffix="", max_bytes=remaining_bytes
+            )
+            try:
+                spooled_bytes += await asyncio.to_thread(
+                    _extract_pdfs,
+                    archive_path,
+                    settings.ingest_upload_chunk_bytes,
+                    spooled,
+                    max_files,
+                    remaining_bytes,
+                )
+            except (ValueError, zipfile.BadZipFile, tarfile.TarError) as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unable to read archive {file.filename!r}: {exc}",
+                )
+            finally:
+                Path(archive_path).unlink(missing_ok=True)
+
+        duplicates = duplicate_sources(source for _, source in spooled)
+        if duplicates:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Each PDF needs a distinct name; duplicated: {', '.join(duplicates[:10])}",
+            )
+
+        results = await service.ingest_many(spooled, replace=replace)
+        write_rate = max(
+            (r.objects_per_second for r in results if isinstance(r, IngestProgress)), default=0.0
+        )
+    except HTTPException:
+        raise
+    except ArchiveLimitError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+    except OSError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing PDFs: {e}",
+        )
+    finally:
+        for tmp_path, _ in spooled:
+            Path(tmp_path).unlink(missing_ok=True)
+
+    file_results = [
+        _bulk_file_result(source, result) for (_, source), result in zip(spooled, results)
+    ]
+    succeeded = sum(1 for result in file_results if result.status in ("success", "unchanged"))
+    if file_results and succeeded == len(file_results):
+        overall = "success"
+    elif succeeded:
+        overall = "partial"
+    else:
+        overall = "error"
+
+    return BulkIngestResponse(
+        status=overall,
+        count=sum(result.count for result in file_results),
+        failed=sum(result.failed for result in file_results),
+        objects_per_second=write_rate,
+        files=file_results,
+    )
+
+
+@router.post(
+    "/jobs",
+    response_model=IngestJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_ingest_job(
+    file: UploadFile = File(...),
+    replace: bool = Query(
+        False, description="Delete chunks of the previous version that are no longer present"
+    ),
+    jobs: IngestJobQueue = Depends(get_ingest_jobs),
+    settings: Settings = Depends(get_app_settings),
+) -> IngestJobResponse:
+    """
+    Upload a PDF file and ingest it in the background.
+
+    Returns a job id immediately; poll `GET /ingest/jobs/{job_id}` for progress.
+    Responds with 429 when the ingestion queue is full.
+    """
+    _validate_pdf(file)
+    if jobs.full():
+        raise _queue_full_error()
+
+    tmp_path = await _spool_upload(file, settings.ingest_upload_chunk_bytes)
+    try:
+        job = jobs.submit(tmp_path, source=Path(file.filename).name, replace=replace)
+    except asyncio.QueueFull:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise _queue_full_error()
+
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=IngestJobResponse)
+def get_ingest_job(
+    job_id: str,
+    jobs: IngestJobQueue = Depends(get_ingest_jobs),
+) -> IngestJobResponse:
+    """Return status and progress of a background ingestion job."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ingestion job {job_id} not found",
+        )
+
+    return _job_response(job)
+
+
+@router.delete("/sources/{source:path}", response_model=DeleteSourceResponse)
+async def delete_source(
+    source: str,
+    service: IngestService = Depends(get_ingest_service),
+) -> DeleteSourceResponse:
+    """
+    Delete every chunk ingested from a source, without touching other documents.
+
+    The source is also removed from the ingest manifest, so uploading the file
+    again ingests it from scratch.
+    """
+    try:
+        deleted = await service.delete_source(source)
+    except WEAVIATE_ERRORS as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error deleting source: {e}",
+        )
+
+    return DeleteSourceResponse(
+        status="deleted" if deleted else "not_found",
+        source=source,
+        deleted=deleted,
+    )
+
+
+def _validate_pdf(file: UploadFile) -> None:
+    """Reject uploads that are not PDF files."""
+    if not file.filename or not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only PDF files are supported",
+        )
+
+
+async def _spool_upload(
+    file: UploadFile,
+    chunk_bytes: int,
+    suffix: str = ".pdf",
+    max_bytes: int | None = None,
+) -> str:
+    """
+    Copy an upload to a temporary file piece by piece and return its path.
+
+    The temporary file is removed if the copy fails or exceeds ``max_bytes``.
+
+    Raises:
+        ArchiveLimitError: If the upload is larger than ``max_bytes``
+    """
+    tmp_path: str | None = None
+    spooled = False
+    try:
+        with NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+            tmp_path = tmp_file.name
+            written = 0
+            while data := await file.read(chunk_bytes):
+                written += len(data)
+                if max_bytes is not None and written > max_bytes:
+                    raise ArchiveLimitError(
+                        413, f"{file.filename!r} exceeds the {max_bytes} bytes left in this request"
+                    )
+                tmp_file.write(data)
+        spooled = True
+        return tmp_path
+    finally:
+        if not spooled and tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+
+
+def _check_bulk_limits(files: int, total_bytes: int, max_files: int, max_bytes: int) -> None:
+    """Raise ArchiveLimitError once a bulk request has too many files or bytes."""
+    if files > max_files:
+        raise ArchiveLimitError(
+            status.HTTP_400_BAD_REQUEST, f"At most {max_files} PDF files per request"
+        )
+    if total_bytes > max_bytes:
+        # 413 Content Too Large (its status constant was renamed across Starlette versions)
+        raise ArchiveLimitError(
+            413,
+            f"PDF files exceed {max_bytes} bytes uncompressed per request",
+        )
+
+
+def _extract_pdfs(
+    archive_path: str,
+    chunk_bytes: int,
+    into: list[tuple[str, str]],
+    max_files: int,
+    max_bytes: int,
+) -> int:
+    """
+    Copy every PDF member of a zip or tar archive to its own temporary file.
+
+    Members are streamed one at a time; (temporary path, member path) pairs are
+    appended to ``into`` as they are written so the caller can clean up on error.
+    Limits are enforced per member, before and while it is copied, so an
+    archive bomb is rejected before it fills the disk.
+
+    Args:
+        archive_path: Path of the spooled archive
+        chunk_bytes: Bytes copied per read
+        into: Files spooled so far for the request, extended in place
+        max_files: Maximum length of ``into``
+        max_bytes: Uncompressed bytes this archive may still add
+
+    Returns:
+        Uncompressed bytes written
+
+    Raises:
+        ArchiveLimitError: If either limit is exceeded
+    """
+    written = 0
+
+    def copy_member(source, member_name: str, declared_size: int) -> None:
+        nonlocal written
+        # Declared sizes reject most bombs up front; the copy is counted too
+        _check_bulk_limits(len(into) + 1, written + declared_size, max_files, max_bytes)
+        with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+            into.append((tmp_file.name, member_name))
+            while data := source.read(chunk_bytes):
+                written += len(data)
+                _check_bulk_limits(len(into), written, max_files, max_bytes)
+                tmp_file.write(data)
+
+    def wanted(member_name: str) -> bool:
+        return member_name.lower().endswith(".pdf") and not member_name.startswith("__MACOSX/")
+
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and wanted(info.filename):
+                    with archive.open(info) as source:
+                        copy_member(source, info.filename, info.file_size)
+        return written
+
+    if tarfile.is_tarfile(archive_path):
+        with tarfile.open(archive_path, mode="r:*") as archive:
+            for member in archive:
+                if member.isfile() and wanted(member.name):
+                    source = archive.extractfile(member)
+                    if source is not None:
+                        with source:
+                            copy_member(source, member.name, member.size)
+        return written
+
+    raise ValueError("not a zip or tar archive")
+
+
+def _queue_full_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Ingestion queue is full, retry later",
+        headers={"Retry-After": "5"},
+    )
+
+
+def _bulk_file_result(source: str, result: IngestProgress | Exception) -> BulkIngestFileResult:
+    if isinstance(result, Exception):
+        return BulkIngestFileResult(source=source, status="error", error=str(result))
+    if result.unchanged:
+        return BulkIngestFileResult(source=source, status="unchanged")
+    if not result.chunks_written and not result.chunks_skipped:
+        return BulkIngestFileResult(
+            source=source,
+            status="error",
+            pages=result.pages_parsed,
+            failed=result.failures,
+            error=(
+                f"All {result.failures} chunks failed to write"
+                if result.failures
+                else "No text could be extracted"
+            ),
+        )
+    return BulkIngestFileResult(
+        source=source,
+        status="partial" if result.failures else "success",
+        count=result.chunks_written,
+        skipped=result.chunks_skipped,
+        pages=result.pages_parsed,
+        failed=result.failures,
+        deleted=result.chunks_deleted,
+    )
+
+
+def _job_response(job: IngestJob) -> IngestJobResponse:
+    return IngestJobResponse(
+        job_id=job.id,
+        status=job.status,
+        source=job.source,
+        pages_parsed=job.progress.pages_parsed,
+        chunks_written=job.progress.chunks_written,
+        chunks_skipped=job.progress.chunks_skipped,
+        chunks_deleted=job.progress.chunks_deleted,
+        unchanged=job.progress.unchanged,
+        failures=job.progress.failures,
+        retries=job.progress.retries,
+        pages_per_second=job.pages_per_second,
+        chunks_per_second=job.chunks_per_second,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
@@ -1,10 +1,22 @@
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+import orjson
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from app.api.dependencies import get_query_service
 from app.schemas.query_schema import QueryRequest, QueryResponse
 from app.services.query_service import QueryService
 
 router = APIRouter(prefix="/query", tags=["query"])
+logger = logging.getLogger(__name__)
+
+
+def sse_event(event: str, data: dict[str, Any]) -> bytes:
+    """Encode one Server-Sent Event with a JSON payload."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
 
 
 @router.post("", response_model=QueryResponse)
@@ -23,4 +35,31 @@ async def query(
     return await service.query(payload)
 
 
+@router.post("/stream")
+async def query_stream(
+    payload: QueryRequest,
+    service: QueryService = Depends(get_query_service),
+) -> StreamingResponse:
+    """
+    Process a query like `POST /query`, streaming the answer as Server-Sent Events.
+
+    Events, each with a JSON `data` payload:
+    - `sources`: sources and context size, sent as soon as retrieval finishes
+    - `token`: the next piece of answer text (`{"text": ...}`)
+    - `done`: summary with sources, context tokens and timings
+    - `error`: sent instead of `done` if the query fails mid-stream
+    """
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async for event, data in service.stream(payload):
+                yield sse_event(event, data)
+        except Exception as exc:
+            logger.exception("Streaming query failed")
+            yield sse_event("error", {"detail": str(exc)})
 
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,32 +1,156 @@
-from fastapi import APIRouter, Depends, Query
+from collections.abc import AsyncIterator
+from uuid import UUID
 
-from app.api.dependencies import get_weaviate_repository
-from app.repositories.weaviate_repository import WeaviateRepository
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from weaviate.exceptions import WeaviateConnectionError
+
+from app.api.dependencies import (
+    get_app_settings,
+    get_async_weaviate_repository,
+    get_status_monitor,
+)
+from app.core.config import Settings
+from app.repositories.async_weaviate_repository import AsyncWeaviateRepository
+from app.repositories.weaviate_repository import DELETE_PAGE_LIMIT, EXPORT_PAGE_SIZE
+from app.schemas.weaviate_schema import (
+    BatchSearchRequest,
+    BatchSearchResponse,
+    BatchSearchResult,
+    SearchHit,
+)
+from app.services.status_monitor import StatusMonitor
 
 router = APIRouter(prefix="/weaviate", tags=["weaviate"])
 
 
 @router.get("/status")
-def get_weaviate_status(
-    repo: WeaviateRepository = Depends(get_weaviate_repository),
+async def get_weaviate_status(
+    fresh: bool = Query(
+        default=False,
+        description="Query Weaviate now instead of serving the background-refreshed snapshot",
+    ),
+    monitor: StatusMonitor = Depends(get_status_monitor),
 ) -> dict[str, object]:
-    """Return current Weaviate status and collection statistics."""
+    """
+    Return Weaviate status and collection statistics.
 
-    return repo.get_status()
+    Served from a snapshot refreshed every `WEAVIATE_STATUS_REFRESH_INTERVAL`
+    seconds (see `refreshed_at` and `age_seconds`), so polling costs nothing
+    on the database. `online` is always current.
+    """
+
+    return await monitor.get(fresh=fresh)
 
 
 @router.get("/objects")
-def list_weaviate_objects(
+async def list_weaviate_objects(
     limit: int = Query(
         default=20,
         ge=1,
         le=200,
         description="Maximum number of objects to return",
     ),
-    repo: WeaviateRepository = Depends(get_weaviate_repository),
+    after: UUID | None = Query(
+        default=None,
+        description="Cursor: return objects after this id (next_after of the previous page)",
+    ),
+    include_vector: bool = Query(default=False, description="Include object vectors"),
+    repo: AsyncWeaviateRepository = Depends(get_async_weaviate_repository),
 ) -> dict[str, object]:
-    """Return recent objects stored in Weaviate for quick inspection."""
+    """Return a page of stored objects in id order; follow `next_after` to page through all."""
+
+    objects = await repo.list_objects(
+        limit=limit,
+        after=str(after) if after else None,
+        include_vector=include_vector,
+    )
+    return {
+        "count": len(objects),
+        "items": objects,
+        "next_after": objects[-1]["id"] if len(objects) == limit else None,
+    }
+
+
+@router.get("/objects/export")
+async def export_weaviate_objects(
+    include_vector: bool = Query(default=False, description="Include object vectors"),
+    page_size: int = Query(
+        default=EXPORT_PAGE_SIZE,
+        ge=1,
+        le=DELETE_PAGE_LIMIT,
+        description="Objects fetched from Weaviate per request",
+    ),
+    repo: AsyncWeaviateRepository = Depends(get_async_weaviate_repository),
+) -> StreamingResponse:
+    """
+    Stream every object of the collection as NDJSON (one JSON object per line).
+
+    Objects are read page by page with a cursor and written as they arrive, so
+    memory stays constant regardless of collection size. Use it for backups,
+    migrations or offline inspection.
+    """
+    if not repo.is_online:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Weaviate is unavailable",
+        )
+
+    pages = repo.iter_object_pages(include_vector=include_vector, page_size=page_size)
+    try:
+        # Fetch the first page before responding, so an unreachable cluster is a 502
+        first = await anext(pages, [])
+    except WeaviateConnectionError as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+
+    async def lines() -> AsyncIterator[bytes]:
+        page = first
+        while page:
+            yield b"".join(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE) for entry in page)
+            page = await anext(pages, [])
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{repo.collection_name}.ndjson"'},
+    )
+
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_batch(
+    payload: BatchSearchRequest,
+    repo: AsyncWeaviateRepository = Depends(get_async_weaviate_repository),
+    settings: Settings = Depends(get_app_settings),
+) -> BatchSearchResponse:
+    """
+    Run many hybrid searches in one request, e.g. for evaluation or cache warming.
+
+    Queries run concurrently (at most `WEAVIATE_SEARCH_CONCURRENCY` at a time)
+    and results are returned in request order. A failing query is reported in
+    its own entry without failing the batch.
+    """
+    if len(payload.queries) > settings.weaviate_search_batch_max_queries:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.weaviate_search_batch_max_queries} queries per request",
+        )
 
-    objects = repo.list_objects(limit=limit)
-    return {"count": len(objects), "items": objects}
+    results = await repo.search_many(
+        payload.queries,
+        limit=payload.limit,
+        concurrency=settings.weaviate_search_concurrency,
+        options=payload.options,
+    )
 
+    items = [
+        BatchSearchResult(query=query, error=str(result))
+        if isinstance(result, Exception)
+        else BatchSearchResult(query=query, results=[SearchHit(**hit) for hit in result])
+        for query, result in zip(payload.queries, results)
+    ]
+    return BatchSearchResponse(
+        count=len(items),
+        failed=sum(1 for item in items if item.error is not None),
+        results=items,
+    )
@@ -17,12 +17,75 @@ class Settings(BaseSettings):
 
     anthropic_api_key: str | None = None
     tavily_api_key: str | None = None
+    tavily_max_results: int = 5
+    tavily_timeout: float = 10.0
+    tavily_max_connections: int = 10
+    tavily_cache_enabled: bool = True
+    tavily_cache_max_entries: int = 256
+    tavily_cache_ttl_seconds: float = 600.0
     openai_api_key: str | None = None
     weaviate_url: str = "http://localhost:8080"
     weaviate_grpc_port: int | None = None
     weaviate_api_key: str | None = None
     weaviate_collection_name: str = "Documents"
     allow_weaviate_fallback: bool = True
+    weaviate_replica_urls: str = ""
+    weaviate_read_strategy: str = "round_robin"
+    weaviate_health_check_interval: float = 10.0
+    weaviate_search_concurrency: int = 16
+    weaviate_search_batch_max_queries: int = 1000
+    weaviate_status_refresh_interval: float = 30.0
+    weaviate_batch_mode: str = "dynamic"
+    weaviate_batch_size: int = 100
+    weaviate_batch_concurrent_requests: int = 2
+    weaviate_batch_requests_per_minute: int = 600
+    weaviate_batch_max_retries: int = 3
+    weaviate_batch_retry_backoff: float = 1.0
+
+    vector_store_backend: str = "weaviate"
+    vector_store_path: str = "data/vector_store"
+    vector_store_alpha: float = 0.75
+    vector_store_flush_interval: float = 5.0
+
+    retrieval_cache_enabled: bool = True
+    retrieval_cache_max_entries: int = 1024
+    retrieval_cache_ttl_seconds: float = 300.0
+    retrieval_limit: int = 5
+    retrieval_mmr_enabled: bool = True
+    retrieval_mmr_candidates: int = 20
+    retrieval_mmr_lambda: float = 0.5
+    retrieval_merge_adjacent: bool = True
+    context_max_tokens: int = 4000
+    retrieval_fanout_enabled: bool = False
+    retrieval_weaviate_timeout: float = 3.0
+    retrieval_tavily_timeout: float = 5.0
+    answer_cache_enabled: bool = False
+    answer_cache_threshold: float = 0.98
+    answer_cache_max_entries: int = 1024
+    answer_cache_ttl_seconds: float = 3600.0
+    query_coalescing_enabled: bool = True
+
+    embedding_backend: str = "weaviate"
+    embedding_model: str = "text-embedding-3-large"
+    embedding_dimensions: int | None = None
+    embedding_batch_size: int = 64
+    embedding_cache_path: str = "data/embedding_cache.db"
+    embedding_cache_max_entries: int = 100_000
+
+    ingest_batch_size: int = 100
+    ingest_upload_chunk_bytes: int = 1024 * 1024
+    ingest_chunk_size: int = 1000
+    ingest_chunk_overlap: int = 200
+    ingest_chunk_strategy: str = "fixed"
+    ingest_workers: int = 2
+    ingest_pages_per_task: int = 16
+    ingest_queue_size: int = 8
+    ingest_job_workers: int = 1
+    ingest_job_history: int = 1000
+    ingest_bulk_max_files: int = 10000
+    ingest_bulk_max_bytes: int = 2 * 1024**3
+    ingest_dedup_enabled: bool = True
+    ingest_manifest_path: str = "data/ingest_manifest.db"
 
     langchain_api_key: str | None = None
     langchain_tracing_v2: bool = False
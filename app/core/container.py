@@ -1,8 +1,22 @@
 from functools import lru_cache
+from pathlib import Path
 
+from app.ai.embeddings import Embedder, create_embedder
+from app.ai.web_search import TavilySearchClient
 from app.graphs.query_agent_graph import QueryAgentGraph
+from app.repositories.async_weaviate_repository import AsyncWeaviateRepository
+from app.repositories.batch_writer import BatchWriter
+from app.repositories.embedded_vector_store import (
+    AsyncEmbeddedVectorStore,
+    EmbeddedVectorStore,
+)
+from app.repositories.ingest_manifest_repository import IngestManifestRepository
 from app.repositories.weaviate_repository import WeaviateRepository
+from app.services.ingest_job_queue import IngestJobQueue
+from app.services.ingest_service import IngestService
 from app.services.query_service import QueryService
+from app.services.status_monitor import StatusMonitor
+from app.utils.cache import SemanticCache, TTLCache
 
 from .config import Settings, get_settings
 
@@ -13,30 +27,216 @@ class AppContainer:
     def __init__(self, settings: Settings | None = None) -> None:
         self.settings = settings or get_settings()
 
-        # Initialize Weaviate repository
-        self.weaviate_repo = WeaviateRepository(
-            url=self.settings.weaviate_url,
-            api_key=self.settings.weaviate_api_key,
-            collection_name=self.settings.weaviate_collection_name,
+        # Initialize optional client-side embedder (None = Weaviate vectorizes).
+        # Embedders are shared by repositories and services, so the container
+        # owns them and the app lifespan closes each one once.
+        self.embedder = create_embedder(
+            backend=self.settings.embedding_backend,
             openai_api_key=self.settings.openai_api_key,
-            allow_fallback=self.settings.allow_weaviate_fallback,
-            grpc_port=self.settings.weaviate_grpc_port,
+            model=self.settings.embedding_model,
+            dimensions=self.settings.embedding_dimensions,
+            batch_size=self.settings.embedding_batch_size,
+            cache_path=self.settings.embedding_cache_path,
+            cache_max_entries=self.settings.embedding_cache_max_entries,
+        )
+        self.embedders: list[Embedder] = [self.embedder] if self.embedder is not None else []
+
+        # Initialize search result cache shared by both repositories, so writes
+        # through either one invalidate it
+        self.search_cache = (
+            TTLCache(
+                max_entries=self.settings.retrieval_cache_max_entries,
+                ttl=self.settings.retrieval_cache_ttl_seconds,
+            )
+            if self.settings.retrieval_cache_enabled
+            else None
+        )
+
+        backend = self.settings.vector_store_backend
+        if backend not in ("weaviate", "embedded"):
+            raise ValueError(f"Unknown vector store backend {backend!r}; expected weaviate or embedded")
+
+        self.embedded_store: EmbeddedVectorStore | None = None
+        if backend == "weaviate":
+            # Initialize Weaviate repository
+            self.weaviate_repo = WeaviateRepository(
+                url=self.settings.weaviate_url,
+                api_key=self.settings.weaviate_api_key,
+                collection_name=self.settings.weaviate_collection_name,
+                openai_api_key=self.settings.openai_api_key,
+                allow_fallback=self.settings.allow_weaviate_fallback,
+                grpc_port=self.settings.weaviate_grpc_port,
+                embedder=self.embedder,
+                batch_writer=BatchWriter(
+                    mode=self.settings.weaviate_batch_mode,
+                    batch_size=self.settings.weaviate_batch_size,
+                    concurrent_requests=self.settings.weaviate_batch_concurrent_requests,
+                    requests_per_minute=self.settings.weaviate_batch_requests_per_minute,
+                    max_retries=self.settings.weaviate_batch_max_retries,
+                    retry_backoff=self.settings.weaviate_batch_retry_backoff,
+                ),
+                search_cache=self.search_cache,
+            )
+
+            # Initialize async Weaviate repository for request-path reads (connected in the app lifespan)
+            self.async_weaviate_repo = AsyncWeaviateRepository(
+                url=self.settings.weaviate_url,
+                api_key=self.settings.weaviate_api_key,
+                collection_name=self.settings.weaviate_collection_name,
+                openai_api_key=self.settings.openai_api_key,
+                allow_fallback=self.settings.allow_weaviate_fallback,
+                grpc_port=self.settings.weaviate_grpc_port,
+                embedder=self.embedder,
+                batch_size=self.settings.weaviate_batch_size,
+                search_cache=self.search_cache,
+                replica_urls=[
+                    url.strip() for url in self.settings.weaviate_replica_urls.split(",") if url.strip()
+                ],
+                read_strategy=self.settings.weaviate_read_strategy,
+                health_check_interval=self.settings.weaviate_health_check_interval,
+            )
+
+        else:
+            # Initialize embedded vector store, shared by the sync (ingest) and async (query) paths.
+            # Only an explicit choice: falling back to it while Weaviate is down would
+            # send ingests to local disk for the life of the process, where Weaviate
+            # never sees them even after the pool recovers.
+            store_embedder = self.embedder
+            if store_embedder is None:
+                store_embedder = create_embedder(
+                    backend="hashing",
+                    dimensions=self.settings.embedding_dimensions,
+                    batch_size=self.settings.embedding_batch_size,
+                )
+                self.embedders.append(store_embedder)
+            self.embedded_store = EmbeddedVectorStore(
+                path=self.settings.vector_store_path,
+                embedder=store_embedder,
+                collection_name=self.settings.weaviate_collection_name,
+                search_cache=self.search_cache,
+                alpha=self.settings.vector_store_alpha,
+                flush_interval=self.settings.vector_store_flush_interval,
+            )
+            self.weaviate_repo = self.embedded_store
+            self.async_weaviate_repo = AsyncEmbeddedVectorStore(self.embedded_store)
+
+        # Initialize background-refreshed status (started in the app lifespan)
+        self.status_monitor = StatusMonitor(
+            self.async_weaviate_repo,
+            interval=self.settings.weaviate_status_refresh_interval,
         )
 
         # Initialize query agent graph
         if not self.settings.anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY is required")
 
+        # Initialize shared web search client with its result cache
+        self.web_search = (
+            TavilySearchClient(
+                api_key=self.settings.tavily_api_key,
+                max_results=self.settings.tavily_max_results,
+                timeout=self.settings.tavily_timeout,
+                max_connections=self.settings.tavily_max_connections,
+                cache=(
+                    TTLCache(
+                        max_entries=self.settings.tavily_cache_max_entries,
+                        ttl=self.settings.tavily_cache_ttl_seconds,
+                    )
+                    if self.settings.tavily_cache_enabled
+                    else None
+                ),
+            )
+            if self.settings.tavily_api_key
+            else None
+        )
+
         self.agent_graph = QueryAgentGraph(
             anthropic_api_key=self.settings.anthropic_api_key,
             tavily_api_key=self.settings.tavily_api_key,
-            weaviate_repo=self.weaviate_repo,
+            weaviate_repo=self.async_weaviate_repo,
+            retrieval_limit=self.settings.retrieval_limit,
+            mmr_candidates=(
+                self.settings.retrieval_mmr_candidates if self.settings.retrieval_mmr_enabled else None
+            ),
+            mmr_lambda=self.settings.retrieval_mmr_lambda,
+            merge_adjacent=self.settings.retrieval_merge_adjacent,
+            context_max_tokens=self.settings.context_max_tokens,
+            fanout=self.settings.retrieval_fanout_enabled,
+            weaviate_timeout=self.settings.retrieval_weaviate_timeout,
+            tavily_timeout=self.settings.retrieval_tavily_timeout,
+            web_search=self.web_search,
         )
 
+        # Initialize answer cache, keyed on query embeddings from the client-side
+        # embedder, else OpenAI (only created when there is no client-side embedder
+        # to reuse). Lexical (hashing) vectors score questions that differ in one
+        # word ("enable"/"disable") as near-identical, so they are refused.
+        self.answer_cache: SemanticCache | None = None
+        answer_embedder = None
+        if self.settings.answer_cache_enabled:
+            answer_embedder = self.embedder
+            if answer_embedder is None and self.settings.openai_api_key:
+                answer_embedder = create_embedder(
+                    backend="openai",
+                    openai_api_key=self.settings.openai_api_key,
+                    model=self.settings.embedding_model,
+                    dimensions=self.settings.embedding_dimensions,
+                    batch_size=self.settings.embedding_batch_size,
+                    cache_path=self.settings.embedding_cache_path,
+                    cache_max_entries=self.settings.embedding_cache_max_entries,
+                )
+                self.embedders.append(answer_embedder)
+            if answer_embedder is None or answer_embedder.name == "hashing":
+                raise ValueError(
+                    "ANSWER_CACHE_ENABLED requires a semantic embedder: set "
+                    "EMBEDDING_BACKEND=openai or OPENAI_API_KEY"
+                )
+            self.answer_cache = SemanticCache(
+                threshold=self.settings.answer_cache_threshold,
+                max_entries=self.settings.answer_cache_max_entries,
+                ttl=self.settings.answer_cache_ttl_seconds,
+            )
+
         # Initialize query service
         self.query_service = QueryService(
             agent_graph=self.agent_graph,
+            weaviate_repo=self.async_weaviate_repo,
+            answer_cache=self.answer_cache,
+            embedder=answer_embedder,
+            coalesce=self.settings.query_coalescing_enabled,
+        )
+
+        # Initialize ingest manifest for skipping unchanged documents
+        # (the embedded store keeps its own, so it never skips files only Weaviate has)
+        self.ingest_manifest = (
+            IngestManifestRepository(
+                Path(self.settings.vector_store_path) / "ingest_manifest.db"
+                if self.embedded_store is not None
+                else self.settings.ingest_manifest_path
+            )
+            if self.settings.ingest_dedup_enabled
+            else None
+        )
+
+        # Initialize ingest service
+        self.ingest_service = IngestService(
             weaviate_repo=self.weaviate_repo,
+            batch_size=self.settings.ingest_batch_size,
+            chunk_size=self.settings.ingest_chunk_size,
+            chunk_overlap=self.settings.ingest_chunk_overlap,
+            chunk_strategy=self.settings.ingest_chunk_strategy,
+            workers=self.settings.ingest_workers,
+            pages_per_task=self.settings.ingest_pages_per_task,
+            manifest=self.ingest_manifest,
+            answer_cache=self.answer_cache,
+        )
+
+        # Initialize background ingestion queue (workers start in the app lifespan)
+        self.ingest_jobs = IngestJobQueue(
+            ingest_service=self.ingest_service,
+            max_size=self.settings.ingest_queue_size,
+            workers=self.settings.ingest_job_workers,
+            history_size=self.settings.ingest_job_history,
         )
 
 
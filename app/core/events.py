@@ -25,5 +25,17 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         settings.api_prefix,
         base_url,
     )
+    await container.async_weaviate_repo.connect()
+    container.status_monitor.start()
+    container.ingest_jobs.start()
     yield
+    await container.ingest_jobs.stop()
+    await container.status_monitor.stop()
+    container.ingest_service.close()
+    if container.web_search is not None:
+        await container.web_search.aclose()
+    await container.async_weaviate_repo.close()
+    container.weaviate_repo.close()
+    for embedder in container.embedders:
+        embedder.close()
     await asyncio.sleep(0)
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
-import re
-from typing import Literal, TypedDict
-
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import replace
+from itertools import zip_longest
+from typing import Any, Literal, TypedDict
+
+import httpx
 from langchain_anthropic import ChatAnthropic
 from langgraph.graph import END, START, StateGraph
 
 from app.ai.tools import create_tavily_tool, create_weaviate_tool
-from app.repositories.weaviate_repository import WeaviateRepository
+from app.ai.web_search import TavilySearchClient
+from app.repositories.async_weaviate_repository import AsyncWeaviateRepository
+from app.repositories.weaviate_repository import WEAVIATE_ERRORS, SearchOptions
+from app.utils.context import PackedContext, pack_context
+from app.utils.diversity import diversify
+
+# Properties retrieve_node uses besides the text (chunk and page numbers for
+# merging adjacent chunks); the rest are not fetched
+RETRIEVE_PROPERTIES = ["source", "chunk_index", "page_start", "page_end"]
 
 
 class QueryState(TypedDict, total=False):
@@ -15,9 +29,14 @@ class QueryState(TypedDict, total=False):
 
     query: str
     context: list[str]
+    context_scores: list[float | None]
+    context_tokens: int
     sources: list[str]
     response: str
     use_weaviate: bool
+    fanout: bool
+    skipped_sources: list[str]
+    search_options: SearchOptions | None
 
 
 class QueryAgentGraph:
@@ -27,7 +46,16 @@ class QueryAgentGraph:
         self,
         anthropic_api_key: str,
         tavily_api_key: str | None,
-        weaviate_repo: WeaviateRepository,
+        weaviate_repo: AsyncWeaviateRepository,
+        retrieval_limit: int = 5,
+        mmr_candidates: int | None = 20,
+        mmr_lambda: float = 0.5,
+        merge_adjacent: bool = True,
+        context_max_tokens: int = 4000,
+        fanout: bool = False,
+        weaviate_timeout: float = 3.0,
+        tavily_timeout: float = 5.0,
+        web_search: TavilySearchClient | None = None,
     ) -> None:
         """
         Initialize the query agent graph.
@@ -35,8 +63,19 @@ class QueryAgentGraph:
         Args:
             anthropic_api_key: Anthropic API key for Claude
             tavily_api_key: Tavily API key for web search (optional)
-            weaviate_repo: WeaviateRepository instance
+            weaviate_repo: AsyncWeaviateRepository instance
+            retrieval_limit: Number of chunks retrieved into the context
+            mmr_candidates: Candidates fetched for MMR diversification (None disables it)
+            mmr_lambda: MMR relevance/diversity trade-off (1 = relevance only)
+            merge_adjacent: Merge consecutive chunks of the same source into one span
+            context_max_tokens: Token budget for the context in the prompt (0 = unlimited)
+            fanout: Query Weaviate and Tavily concurrently instead of routing by keywords
+                (needs a Tavily API key)
+            weaviate_timeout: Seconds fan-out waits for Weaviate retrieval (0 = no deadline)
+            tavily_timeout: Seconds fan-out waits for Tavily search (0 = no deadline)
+            web_search: Shared Tavily client (built from tavily_api_key if not given)
         """
+        self._logger = logging.getLogger(__name__)
         self.llm = ChatAnthropic(
             model="claude-sonnet-4-20250514",
             api_key=anthropic_api_key,
@@ -44,20 +83,34 @@ class QueryAgentGraph:
         )
         self.weaviate_repo = weaviate_repo
         self.tavily_api_key = tavily_api_key
+        self.web_search = web_search or (TavilySearchClient(tavily_api_key) if tavily_api_key else None)
+        self.retrieval_limit = retrieval_limit
+        self.mmr_candidates = mmr_candidates
+        self.mmr_lambda = mmr_lambda
+        self.merge_adjacent = merge_adjacent
+        self.context_max_tokens = context_max_tokens
+        self.fanout = fanout and self.web_search is not None
+        self.weaviate_timeout = weaviate_timeout
+        self.tavily_timeout = tavily_timeout
 
         # Create tools
         tools = [create_weaviate_tool(weaviate_repo)]
-        if tavily_api_key:
-            tools.append(create_tavily_tool(tavily_api_key))
+        if self.web_search is not None:
+            tools.append(create_tavily_tool(self.web_search))
 
         self.llm_with_tools = self.llm.bind_tools(tools)
 
-        # Build graph
+        # Build graph, and the same graph without generation for streaming
+        self.graph = self._build_graph(generate=True)
+        self.context_graph = self._build_graph(generate=False)
+
+    def _build_graph(self, generate: bool) -> Any:
+        """Compile router -> retrieve/search, followed by generate if requested."""
         graph = StateGraph(QueryState)
         graph.add_node("router", self.router_node)
         graph.add_node("retrieve", self.retrieve_node)
         graph.add_node("search", self.search_node)
-        graph.add_node("generate", self.generate_node)
+        graph.add_node("fanout", self.fanout_node)
 
         graph.add_edge(START, "router")
         graph.add_conditional_edges(
@@ -66,20 +119,24 @@ class QueryAgentGraph:
             {
                 "weaviate": "retrieve",
                 "tavily": "search",
+                "fanout": "fanout",
             },
         )
-        graph.add_edge("retrieve", "generate")
-        graph.add_edge("search", "generate")
-        graph.add_edge("generate", END)
+        last = "generate" if generate else END
+        if generate:
+            graph.add_node("generate", self.generate_node)
+            graph.add_edge("generate", END)
+        for node in ("retrieve", "search", "fanout"):
+            graph.add_edge(node, last)
 
-        self.graph = graph.compile()
+        return graph.compile()
 
     def router_node(self, state: QueryState) -> QueryState:
         """
         Router node: decides whether to use Weaviate or Tavily.
 
         Simple heuristic: if query mentions "recent", "latest", "current", "news",
-        or "today", use Tavily. Otherwise, Weaviate.
+        or "today", use Tavily. Otherwise, Weaviate. In fan-out mode both are used.
         """
         query = state.get("query", "").lower()
         web_keywords = [
@@ -107,28 +164,48 @@ class QueryAgentGraph:
         return {
             **state,
             "use_weaviate": use_weaviate,
+            "fanout": self.fanout,
             "context": [],
             "sources": [],
         }
 
-    def route_decision(self, state: QueryState) -> Literal["weaviate", "tavily"]:
+    def route_decision(self, state: QueryState) -> Literal["weaviate", "tavily", "fanout"]:
         """Conditional routing based on router decision."""
+        if state.get("fanout"):
+            return "fanout"
         if state.get("use_weaviate", True):
             return "weaviate"
         return "tavily"
 
     async def retrieve_node(self, state: QueryState) -> QueryState:
-        """Retrieve documents from Weaviate."""
+        """Retrieve documents from Weaviate, diversified and with adjacent chunks merged."""
         query = state.get("query", "")
-        results = self.weaviate_repo.search(query, limit=5)
+        options = state.get("search_options") or SearchOptions()
+        if options.return_properties is None:
+            options = replace(options, return_properties=RETRIEVE_PROPERTIES)
+
+        limit = self.retrieval_limit
+        if self.mmr_candidates and self.mmr_candidates > limit:
+            # Over-fetch with vectors and let MMR drop near-duplicate (overlapping) chunks
+            options = replace(options, include_vector=True)
+            limit = self.mmr_candidates
+        candidates = await self.weaviate_repo.search(query, limit=limit, options=options)
+        results = diversify(
+            candidates,
+            k=self.retrieval_limit,
+            lambda_mult=self.mmr_lambda,
+            merge_adjacent=self.merge_adjacent,
+        )
 
         context_parts = []
+        context_scores = []
         sources = []
 
         for result in results:
             text = result.get("text", "")
             metadata = result.get("metadata", {})
             context_parts.append(text)
+            context_scores.append(result.get("score"))
             # Extract source from metadata if available
             if "url" in metadata:
                 sources.append(metadata["url"])
@@ -138,6 +215,7 @@ class QueryAgentGraph:
         return {
             **state,
             "context": context_parts,
+            "context_scores": context_scores,
             "sources": sources,
         }
 
@@ -145,33 +223,106 @@ class QueryAgentGraph:
         """Search the web using Tavily."""
         query = state.get("query", "")
 
-        if not self.tavily_api_key:
-            return {**state, "context": ["Tavily search not available."]}
+        if self.web_search is None:
+            return {**state, "context": [], "sources": [], "skipped_sources": ["tavily"]}
 
-        tavily_tool = create_tavily_tool(self.tavily_api_key)
-        result = tavily_tool.invoke({"query": query})
-        context_parts = [result] if result else []
-        
-        # Extract URLs from Tavily result (they're in the formatted string)
-        sources = []
-        if result:
-            # Simple extraction - URLs are in the formatted result
-            urls = re.findall(r'URL: (https?://[^\s]+)', result)
-            sources.extend(urls)
+        try:
+            results = await self.web_search.search(query)
+        except httpx.HTTPError as exc:
+            self._logger.warning("Tavily search failed: %s", exc)
+            return {**state, "context": [], "sources": [], "skipped_sources": ["tavily"]}
 
+        # One part per web result, with Tavily's relevance scores for packing
         return {
             **state,
-            "context": context_parts,
+            "context": [result.text for result in results],
+            "context_scores": [result.score for result in results],
+            "sources": [result.url for result in results if result.url],
+        }
+
+    async def fanout_node(self, state: QueryState) -> QueryState:
+        """
+        Retrieve from Weaviate and search Tavily concurrently, each under its own deadline.
+
+        Whatever returns in time is merged, alternating knowledge base and web
+        parts by rank so both survive context packing; a source that is slow or
+        fails is dropped and listed in ``skipped_sources``.
+        """
+        knowledge, web = await asyncio.gather(
+            self._within_deadline("weaviate", self.retrieve_node, state, self.weaviate_timeout),
+            self._within_deadline("tavily", self.search_node, state, self.tavily_timeout),
+        )
+
+        branches = {"weaviate": knowledge, "tavily": web}
+        skipped = [
+            name
+            for name, result in branches.items()
+            if result is None or name in result.get("skipped_sources", [])
+        ]
+        returned = [result for result in branches.values() if result is not None]
+        context = [
+            part
+            for parts in zip_longest(*(result.get("context", []) for result in returned))
+            for part in parts
+            if part is not None
+        ]
+        sources = list(dict.fromkeys(source for result in returned for source in result.get("sources", [])))
+
+        return {
+            **state,
+            "context": context,
+            # Parts are already in merged rank order; knowledge base and web
+            # scores are on different scales, so they are not compared
+            "context_scores": None,
             "sources": sources,
+            "skipped_sources": skipped,
         }
 
+    async def _within_deadline(
+        self,
+        name: str,
+        node: Callable[[QueryState], Awaitable[QueryState]],
+        state: QueryState,
+        timeout: float,
+    ) -> QueryState | None:
+        """Run a fan-out branch, returning None if it fails or misses its deadline."""
+        try:
+            return await asyncio.wait_for(node(state), timeout if timeout > 0 else None)
+        except asyncio.TimeoutError:
+            self._logger.warning("Fan-out dropped %s: no result within %.1fs", name, timeout)
+        except (*WEAVIATE_ERRORS, httpx.HTTPError) as exc:
+            self._logger.warning("Fan-out dropped %s: %s", name, exc)
+        return None
+
     async def generate_node(self, state: QueryState) -> QueryState:
         """Generate final response using Claude with context."""
+        prompt, packed = self.build_prompt(state)
+
+        # Generate response
+        response = await self.llm.ainvoke(prompt)
+        answer = response.content if hasattr(response, "content") else str(response)
+
+        return {
+            **state,
+            "response": answer,
+            "context_tokens": packed.tokens,
+        }
+
+    def build_prompt(self, state: QueryState) -> tuple[str, PackedContext]:
+        """Build the generation prompt from the query and its packed context."""
         query = state.get("query", "")
         context = state.get("context", [])
 
-        # Build context string
-        context_str = "\n\n".join(context) if context else "No additional context available."
+        # Pack context into the token budget, most relevant parts first
+        packed = pack_context(context, self.context_max_tokens, scores=state.get("context_scores"))
+        if packed.dropped or packed.truncated:
+            self._logger.debug(
+                "Context packed to %d tokens: %d parts dropped, truncated=%s",
+                packed.tokens,
+                packed.dropped,
+                packed.truncated,
+            )
+        context_str = packed.text if packed.parts else "No additional context available."
 
         # Create prompt
         prompt = f"""You are a helpful AI assistant. Answer the user's question using the provided context.
@@ -183,26 +334,77 @@ User Question: {query}
 
 Provide a clear, accurate answer based on the context. If the context doesn't contain enough information, say so."""
 
-        # Generate response
-        response = await self.llm.ainvoke(prompt)
-        answer = response.content if hasattr(response, "content") else str(response)
+        return prompt, packed
 
-        return {
-            **state,
-            "response": answer,
-        }
-
-    async def run(self, query: str) -> QueryState:
+    async def run(self, query: str, search_options: SearchOptions | None = None) -> QueryState:
         """
         Execute the query agent graph.
 
         Args:
             query: User query string
+            search_options: Optional knowledge base search tuning for retrieval
 
         Returns:
             Final state with response and sources
         """
-        initial_state: QueryState = {"query": query}
+        initial_state: QueryState = {"query": query, "search_options": search_options}
         result = await self.graph.ainvoke(initial_state)
         return result
 
+    async def stream(
+        self,
+        query: str,
+        search_options: SearchOptions | None = None,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """
+        Execute the graph, streaming the answer as it is generated.
+
+        Routing and retrieval run as in ``run``; then the prompt is sent with
+        ``llm.astream`` and text is yielded chunk by chunk.
+
+        Args:
+            query: User query string
+            search_options: Optional knowledge base search tuning for retrieval
+
+        Yields:
+            ("sources", ...) once retrieval is done, then ("token", {"text": ...})
+            per chunk, and finally ("done", ...) with timings and token counts
+        """
+        started = time.perf_counter()
+        state = await self.context_graph.ainvoke({"query": query, "search_options": search_options})
+        prompt, packed = self.build_prompt(state)
+        sources = state.get("sources", [])
+        yield "sources", {"sources": sources, "context_tokens": packed.tokens}
+
+        first_token: float | None = None
+        characters = 0
+        async for chunk in self.llm.astream(prompt):
+            text = chunk_text(chunk)
+            if not text:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            characters += len(text)
+            yield "token", {"text": text}
+
+        yield "done", {
+            "sources": sources,
+            "context_tokens": packed.tokens,
+            "skipped_sources": state.get("skipped_sources", []),
+            "answer_chars": characters,
+            "first_token_ms": round(first_token * 1000, 1) if first_token is not None else None,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def chunk_text(chunk: Any) -> str:
+    """Return the text of a streamed message chunk (string or content-block list)."""
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") if isinstance(block, dict) else str(block)
+        for block in content or []
+        if not isinstance(block, dict) or block.get("type", "text") == "text"
+    )
+
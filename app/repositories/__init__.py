@@ -1,6 +1,23 @@
-from app.repositories.weaviate_repository import WeaviateRepository
+from app.repositories.async_weaviate_repository import AsyncWeaviateRepository
+from app.repositories.batch_writer import BatchObject, BatchWriter, BatchWriteReport
+from app.repositories.embedded_vector_store import (
+    AsyncEmbeddedVectorStore,
+    EmbeddedVectorStore,
+)
+from app.repositories.ingest_manifest_repository import IngestManifestRepository
+from app.repositories.weaviate_repository import WeaviateRepository, document_uuid
 
-__all__ = ["WeaviateRepository"]
+__all__ = [
+    "AsyncEmbeddedVectorStore",
+    "AsyncWeaviateRepository",
+    "BatchObject",
+    "BatchWriteReport",
+    "BatchWriter",
+    "EmbeddedVectorStore",
+    "IngestManifestRepository",
+    "WeaviateRepository",
+    "document_uuid",
+]
 
 
 
@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import weaviate
+from weaviate.classes.data import DataObject
+from weaviate.exceptions import WeaviateConnectionError
+
+from app.ai.embeddings import Embedder
+from app.repositories.batch_writer import MAX_REPORTED_ERRORS, BatchWriteReport
+from app.repositories.weaviate_pool import WeaviatePool
+from app.repositories.weaviate_repository import (
+    EXPORT_PAGE_SIZE,
+    WEAVIATE_ERRORS,
+    SearchOptions,
+    collection_config,
+    document_uuid,
+    hybrid_arguments,
+    object_entry,
+    schema_summary,
+    search_cache_key,
+    search_result,
+)
+from app.utils.cache import TTLCache
+from app.utils.pdf_parser import iter_batches
+from app.utils.singleflight import SingleFlight
+
+
+class AsyncWeaviateRepository:
+    """Weaviate wrapper on the v4 ``WeaviateAsyncClient`` for use on the event loop.
+
+    Requests are awaited instead of blocking the loop, so concurrent queries
+    on one worker overlap their Weaviate round trips. With replica URLs, reads
+    are balanced over a ``WeaviatePool`` and fail over between nodes; writes go
+    to the first healthy node. Clients are created unconnected; call ``connect``
+    from the running loop (the app lifespan).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: str | None = None,
+        collection_name: str = "Documents",
+        openai_api_key: str | None = None,
+        allow_fallback: bool = False,
+        grpc_port: int | None = None,
+        embedder: Embedder | None = None,
+        batch_size: int = 100,
+        search_cache: TTLCache | None = None,
+        replica_urls: list[str] | None = None,
+        read_strategy: str = "round_robin",
+        health_check_interval: float = 10.0,
+    ) -> None:
+        """
+        Initialize the async Weaviate client without connecting.
+
+        Args:
+            url: Weaviate instance URL (e.g., http://localhost:8080 or https://...)
+            api_key: Optional Weaviate API key for authentication
+            collection_name: Name of the collection to use
+            openai_api_key: OpenAI API key for embeddings (required for vectorizer)
+            allow_fallback: Continue in offline mode if Weaviate is unreachable
+            grpc_port: Optional gRPC port override
+            embedder: Optional client-side embedder, run in a worker thread
+            batch_size: Objects per ``insert_many`` request in ``add_documents``
+            search_cache: Optional cache of search results, invalidated on every
+                write; may be shared with other repositories on the same collection
+            replica_urls: Additional Weaviate nodes of the same cluster to read from
+            read_strategy: "round_robin" or "least_latency" node selection for reads
+            health_check_interval: Seconds between node readiness probes
+        """
+        self._logger = logging.getLogger(__name__)
+        auth = weaviate.auth.AuthApiKey(api_key=api_key) if api_key else None
+        self.url = url
+        self.collection_name = collection_name
+        self.openai_api_key = openai_api_key
+        self.allow_fallback = allow_fallback
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.search_cache = search_cache
+        self._inflight = SingleFlight()
+        self.pool = WeaviatePool(
+            [url, *(replica_urls or [])],
+            auth=auth,
+            grpc_port=grpc_port,
+            strategy=read_strategy,
+            health_check_interval=health_check_interval,
+        )
+
+    @property
+    def client(self) -> weaviate.WeaviateAsyncClient | None:
+        """Client of the first healthy node, or None when no node is available."""
+        node = self.pool.primary
+        return node.client if node is not None else None
+
+    @property
+    def is_online(self) -> bool:
+        """Return True if at least one Weaviate node is healthy."""
+        return self.pool.primary is not None
+
+    async def connect(self) -> None:
+        """Connect all nodes, falling back to offline mode if none is reachable and allowed.
+
+        In offline mode the health checks keep probing, so the repository comes
+        back online as soon as a node becomes ready.
+        """
+        if await self.pool.connect():
+            return
+
+        errors = "; ".join(f"{node.url}: {node.last_error}" for node in self.pool.nodes)
+        if not self.allow_fallback:
+            await self.pool.close()
+            raise WeaviateConnectionError(f"Unable to connect to Weaviate. {errors}")
+        self._logger.warning(
+            "Unable to connect to Weaviate. Continuing in offline mode. Error: %s", errors
+        )
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 5,
+        options: SearchOptions | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Perform hybrid search on documents, served from the search cache when possible.
+
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+            options: Optional projection, filters and hybrid tuning
+
+        Returns:
+            List of documents with text and metadata
+        """
+        if not self.is_online:
+            self._logger.debug("Offline Weaviate repo - returning empty search results")
+            return []
+
+        key = search_cache_key(query, limit, options)
+        if self.search_cache is not None:
+            cached = self.search_cache.get(key)
+            if cached is not None:
+                return list(cached)
+
+        # Identical searches missing the cache at the same time share one request
+        results = await self._inflight.do(key, lambda: self._search_and_cache(key, query, limit, options))
+        return list(results)
+
+    async def _search_and_cache(
+        self,
+        key: tuple[Any, ...],
+        query: str,
+        limit: int,
+        options: SearchOptions | None,
+    ) -> list[dict[str, Any]]:
+        generation = self.search_cache.generation if self.search_cache is not None else None
+        results = await self._search(query, limit, options=options)
+        if self.search_cache is not None:
+            self.search_cache.put(key, results, generation)
+        return results
+
+    async def search_many(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        concurrency: int = 16,
+        options: SearchOptions | None = None,
+    ) -> list[list[dict[str, Any]] | Exception]:
+        """
+        Run many hybrid searches concurrently and return their results in order.
+
+        Duplicate queries (after normalization) and cached ones are not sent
+        again, client-side query vectors are computed in one embedding call,
+        and at most ``concurrency`` searches are in flight over the gRPC channels.
+
+        Args:
+            queries: Search query strings
+            limit: Maximum number of results per query
+            concurrency: Maximum number of concurrent Weaviate requests
+            options: Optional projection, filters and hybrid tuning applied to every query
+
+        Returns:
+            Per-query result lists, or the exception that query failed with
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        if not self.is_online:
+            self._logger.debug("Offline Weaviate repo - returning empty search results")
+            return [[] for _ in queries]
+
+        keys = [search_cache_key(query, limit, options) for query in queries]
+        unique: dict[Any, str] = {}
+        for key, query in zip(keys, queries):
+            unique.setdefault(key, query)
+        found: dict[Any, list[dict[str, Any]] | Exception] = {}
+        generation = self.search_cache.generation if self.search_cache is not None else None
+        if self.search_cache is not None:
+            for key in unique:
+                cached = self.search_cache.get(key)
+                if cached is not None:
+                    found[key] = cached
+
+        missing = [key for key in unique if key not in found]
+        vectors: list[list[float] | None] = [None] * len(missing)
+        if self.embedder and missing:
+            vectors = await asyncio.to_thread(
+                self.embedder.embed, [unique[key] for key in missing]
+            )
+
+        slots = asyncio.Semaphore(concurrency)
+
+        async def run(key: Any, vector: list[float] | None) -> None:
+            async with slots:
+                try:
+                    found[key] = await self._search(unique[key], limit, vector, options)
+                except WEAVIATE_ERRORS as exc:
+                    found[key] = exc
+                    return
+            if self.search_cache is not None:
+                self.search_cache.put(key, found[key], generation)
+
+        await asyncio.gather(*(run(key, vector) for key, vector in zip(missing, vectors)))
+        return [
+            result if isinstance(result, Exception) else list(result)
+            for result in (found[key] for key in keys)
+        ]
+
+    async def _search(
+        self,
+        query: str,
+        limit: int,
+        vector: list[float] | None = None,
+        options: SearchOptions | None = None,
+    ) -> list[dict[str, Any]]:
+        """Run a hybrid search against Weaviate, embedding the query if needed."""
+        try:
+            if vector is None and self.embedder:
+                vector = (await asyncio.to_thread(self.embedder.embed, [query]))[0]
+            response = await self.pool.read(
+                lambda client: client.collections.get(self.collection_name).query.hybrid(
+                    query=query,
+                    vector=vector,
+                    limit=limit,
+                    **hybrid_arguments(options),
+                )
+            )
+            return [search_result(obj) for obj in response.objects]
+        except Exception as e:
+            # If collection doesn't exist, return empty list
+            if "does not exist" in str(e).lower():
+                return []
+            raise
+
+    async def add_documents(self, documents: list[dict[str, Any]]) -> BatchWriteReport:
+        """
+        Add documents to the collection with ``insert_many`` requests.
+
+        Args:
+            documents: List of documents, each with 'text' and optional 'metadata'
+
+        Returns:
+            Report with written and failed object counts
+        """
+        if not self.is_online:
+            self._logger.debug("Offline Weaviate repo - skipping document add")
+            return BatchWriteReport(objects=len(documents))
+
+        if not await self.client.collections.exists(self.collection_name):
+            await self.client.collections.create(
+                **collection_config(self.collection_name, self.embedder, self.openai_api_key)
+            )
+        collection = self.client.collections.get(self.collection_name)
+
+        try:
+            return await self._insert(collection, documents)
+        finally:
+            if self.search_cache is not None:
+                self.search_cache.invalidate()
+
+    async def _insert(self, collection: Any, documents: list[dict[str, Any]]) -> BatchWriteReport:
+        """Insert documents in ``batch_size`` groups and report failures."""
+        report = BatchWriteReport()
+        started = time.perf_counter()
+        for group in iter_batches(documents, self.batch_size):
+            texts = [doc.get("text", "") for doc in group]
+            vectors = (
+                await asyncio.to_thread(self.embedder.embed, texts)
+                if self.embedder
+                else [None] * len(group)
+            )
+            objects = [
+                DataObject(
+                    properties={"text": text, **doc.get("metadata", {})},
+                    uuid=document_uuid(doc),
+                    vector=vector,
+                )
+                for doc, text, vector in zip(group, texts, vectors)
+            ]
+            result = await collection.data.insert_many(objects)
+
+            report.objects += len(objects) - len(result.errors)
+            report.failed += len(result.errors)
+            for index, error in result.errors.items():
+                if len(report.errors) < MAX_REPORTED_ERRORS:
+                    report.errors.append(error.message)
+                report.failed_by_source[str(objects[index].properties.get("source", ""))] += 1
+
+        report.elapsed = time.perf_counter() - started
+        if report.failed:
+            self._logger.error("%d objects could not be written to Weaviate", report.failed)
+        return report
+
+    async def get_status(self) -> dict[str, Any]:
+        """Return basic health info and collection statistics."""
+        status: dict[str, Any] = {
+            "collection": self.collection_name,
+            "online": False,
+        }
+
+        if not self.is_online:
+            status["message"] = "Weaviate client unavailable (offline mode)."
+            return status
+
+        try:
+            collection = self.client.collections.get(self.collection_name)
+        except WEAVIATE_ERRORS as exc:
+            status["message"] = f"Unable to access collection: {exc}"
+            return status
+
+        status["online"] = True
+        status["nodes"] = self.pool.stats()
+        if self.search_cache is not None:
+            status["search_cache"] = self.search_cache.stats()
+
+        try:
+            status["schema"] = schema_summary(await collection.config.get())
+        except WEAVIATE_ERRORS as exc:
+            status["schema_error"] = str(exc)
+
+        try:
+            aggregate = await collection.aggregate.over_all(total_count=True)
+            status["object_count"] = aggregate.total_count or 0
+        except WEAVIATE_ERRORS as exc:
+            status["aggregation_error"] = str(exc)
+
+        return status
+
+    async def list_objects(
+        self,
+        limit: int = 20,
+        after: str | None = None,
+        include_vector: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Return a page of objects in UUID order.
+
+        Args:
+            limit: Maximum number of objects to return
+            after: Return objects after this UUID (the last one of the previous page)
+            include_vector: Include each object's vectors
+
+        Returns:
+            Object entries with id, text and metadata
+        """
+        if not self.is_online:
+            self._logger.debug("Offline Weaviate repo - cannot list objects")
+            return []
+
+        try:
+            return await self._fetch_page(limit, after, include_vector)
+        except WEAVIATE_ERRORS as exc:
+            self._logger.error("Error fetching objects from Weaviate: %s", exc)
+            return []
+
+    async def iter_object_pages(
+        self,
+        include_vector: bool = False,
+        page_size: int = EXPORT_PAGE_SIZE,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Walk the whole collection with an ``after`` cursor, one page at a time.
+
+        This is the cursor the client's collection iterator uses, but each page
+        is a separate pool read, so a node failing mid-export fails over to a
+        replica instead of ending the stream. Only one page is held in memory.
+
+        Args:
+            include_vector: Include each object's vectors
+            page_size: Objects fetched per request
+
+        Yields:
+            Pages of object entries in UUID order
+
+        Raises:
+            WeaviateConnectionError: If no Weaviate node can serve a page
+        """
+        after: str | None = None
+        while True:
+            page = await self._fetch_page(page_size, after, include_vector)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            after = page[-1]["id"]
+
+    async def _fetch_page(
+        self,
+        limit: int,
+        after: str | None,
+        include_vector: bool,
+    ) -> list[dict[str, Any]]:
+        try:
+            response = await self.pool.read(
+                lambda client: client.collections.get(self.collection_name).query.fetch_objects(
+                    limit=limit, after=after, include_vector=include_vector
+                )
+            )
+        except Exception as e:
+            if "does not exist" in str(e).lower():
+                return []
+            raise
+        return [object_entry(obj) for obj in response.objects or []]
+
+    async def close(self) -> None:
+        """Stop health checks and close all Weaviate client connections."""
+        await self.pool.close()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+BATCH_MODES = ("dynamic", "fixed_size", "rate_limit")
+MAX_REPORTED_ERRORS = 10
+
+
+@dataclass
+class BatchObject:
+    """One object to insert: properties, deterministic UUID and optional vector."""
+
+    properties: dict[str, Any]
+    uuid: str
+    vector: Sequence[float] | None = None
+
+
+@dataclass
+class BatchWriteReport:
+    """Outcome of a batch write: throughput, failures and retries."""
+
+    objects: int = 0
+    failed: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+    errors: list[str] = field(default_factory=list)
+    failed_by_source: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def objects_per_second(self) -> float:
+        """Successfully written objects per second of write time."""
+        return self.objects / self.elapsed if self.elapsed > 0 else 0.0
+
+    def merge(self, other: BatchWriteReport) -> None:
+        """Add the counters of another report to this one."""
+        self.objects += other.objects
+        self.failed += other.failed
+        self.retries += other.retries
+        self.elapsed += other.elapsed
+        self.errors.extend(other.errors[: MAX_REPORTED_ERRORS - len(self.errors)])
+        self.failed_by_source.update(other.failed_by_source)
+
+
+class BatchWriter:
+    """Writes objects to a Weaviate collection with a configurable batching mode.
+
+    Objects that Weaviate reports in ``failed_objects`` are re-sent with
+    exponential backoff, and every write returns a ``BatchWriteReport``.
+    """
+
+    def __init__(
+        self,
+        mode: str = "dynamic",
+        batch_size: int = 100,
+        concurrent_requests: int = 2,
+        requests_per_minute: int = 600,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+    ) -> None:
+        """
+        Initialize the batch writer.
+
+        Args:
+            mode: "dynamic" (server-load adaptive), "fixed_size" or "rate_limit"
+            batch_size: Objects per request in fixed_size mode
+            concurrent_requests: Parallel requests in fixed_size mode
+            requests_per_minute: Request rate in rate_limit mode
+            max_retries: Times failed objects are re-sent before giving up
+            retry_backoff: Delay in seconds before the first retry, doubled each time
+        """
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Unknown batch mode {mode!r}; expected one of {BATCH_MODES}")
+
+        self._logger = logging.getLogger(__name__)
+        self.mode = mode
+        self.batch_size = batch_size
+        self.concurrent_requests = concurrent_requests
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    def write(self, collection: Any, objects: Iterable[BatchObject]) -> BatchWriteReport:
+        """
+        Insert objects into a collection, retrying the ones that fail.
+
+        Args:
+            collection: Weaviate collection handle
+            objects: Objects to insert (consumed lazily)
+
+        Returns:
+            Report with written, failed and retried object counts
+        """
+        report = BatchWriteReport()
+        started = time.perf_counter()
+
+        sent, failed = self._send(collection, objects)
+        for attempt in range(self.max_retries):
+            if not failed:
+                break
+            time.sleep(self.retry_backoff * (2 ** attempt))
+            self._logger.warning(
+                "Retrying %d failed Weaviate objects (attempt %d/%d): %s",
+                len(failed),
+                attempt + 1,
+                self.max_retries,
+                failed[0].message,
+            )
+            report.retries += len(failed)
+            _, failed = self._send(
+                collection,
+                (
+                    BatchObject(
+                        properties=error.object_.properties or {},
+                        uuid=str(error.object_.uuid),
+                        vector=error.object_.vector,
+                    )
+                    for error in failed
+                ),
+            )
+
+        report.objects = sent - len(failed)
+        report.failed = len(failed)
+        report.errors = [error.message for error in failed[:MAX_REPORTED_ERRORS]]
+        report.failed_by_source = Counter(
+            str((error.object_.properties or {}).get("source", "")) for error in failed
+        )
+        report.elapsed = time.perf_counter() - started
+
+        if failed:
+            self._logger.error(
+                "%d objects could not be written to Weaviate after %d retries",
+                len(failed),
+                self.max_retries,
+            )
+        return report
+
+    def _send(self, collection: Any, objects: Iterable[BatchObject]) -> tuple[int, list[Any]]:
+        """Run one batch context over the objects and return (sent count, failed objects)."""
+        sent = 0
+        with self._open(collection) as batch:
+            for obj in objects:
+                batch.add_object(properties=obj.properties, uuid=obj.uuid, vector=obj.vector)
+                sent += 1
+        return sent, list(collection.batch.failed_objects)
+
+    def _open(self, collection: Any) -> Any:
+        if self.mode == "fixed_size":
+            return collection.batch.fixed_size(
+                batch_size=self.batch_size,
+                concurrent_requests=self.concurrent_requests,
+            )
+        if self.mode == "rate_limit":
+            return collection.batch.rate_limit(requests_per_minute=self.requests_per_minute)
+        return collection.batch.dynamic()
@@ -0,0 +1,682 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.ai.embeddings import Embedder
+from app.repositories.batch_writer import BatchWriteReport
+from app.repositories.weaviate_repository import (
+    EMBED_BATCH_SIZE,
+    EXPORT_PAGE_SIZE,
+    SearchOptions,
+    document_uuid,
+    search_cache_key,
+)
+from app.utils.cache import TTLCache
+from app.utils.pdf_parser import iter_batches
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Okapi BM25 parameters (Weaviate's defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Rank offset of Weaviate's ranked (reciprocal rank) fusion
+RANKED_FUSION_OFFSET = 60
+# Deleted rows are dropped from memory once there are this many and they outnumber live rows
+COMPACT_MIN_DEAD_ROWS = 1024
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _min_max(scores: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Scale scores of the masked rows to [0, 1] (relative score fusion); 0 elsewhere."""
+    if not mask.any():
+        return np.zeros(len(scores), dtype=np.float32)
+    low = scores[mask].min()
+    high = scores[mask].max()
+    if high - low <= 0:
+        return np.where(mask, 1.0 if high > 0 else 0.0, 0.0).astype(np.float32)
+    return np.where(mask, (scores - low) / (high - low), 0.0).astype(np.float32)
+
+
+def _reciprocal_ranks(scores: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Score the masked rows by 1 / (rank + offset) (ranked fusion); 0 elsewhere."""
+    rows = np.flatnonzero(mask)
+    ranked = rows[np.argsort(-scores[rows], kind="stable")]
+    fused = np.zeros(len(scores), dtype=np.float32)
+    fused[ranked] = 1.0 / (np.arange(len(ranked)) + RANKED_FUSION_OFFSET)
+    return fused
+
+
+def autocut(scores: np.ndarray, cut_off: int) -> int:
+    """
+    Return how many results to keep, cutting after ``cut_off`` jumps in score.
+
+    Port of Weaviate's autocut: scores are scaled from 0 (first) to 1 (last)
+    and compared with a straight line; each local maximum of the difference
+    is a jump.
+
+    Args:
+        scores: Result scores in ranking order
+        cut_off: Number of jumps after which to cut
+
+    Returns:
+        Number of leading results to keep
+    """
+    count = len(scores)
+    if count <= 1 or scores[0] == scores[-1]:
+        return count
+    steps = np.arange(count) / (count - 1)
+    diff = (scores - scores[0]) / (scores[-1] - scores[0]) - steps
+    jumps = 0
+    for i in range(1, count - 1):
+        if diff[i] > diff[i - 1] and diff[i] > diff[i + 1]:
+            jumps += 1
+            if jumps >= cut_off:
+                return i
+    return count
+
+
+class EmbeddedVectorStore:
+    """In-process replacement for ``WeaviateRepository`` for small corpora and offline use.
+
+    Vectors live in one NumPy matrix searched by brute-force cosine similarity,
+    text in a BM25 inverted index, and hybrid results fuse both with min-max
+    normalized scores weighted by ``alpha`` (like Weaviate's relative score
+    fusion). Objects are keyed by the same deterministic UUIDs, so re-adding a
+    chunk replaces it in place; rows of deleted objects are compacted away
+    once they outnumber the live ones.
+
+    The store persists to ``path`` (vectors as a ``.npy`` file opened
+    memory-mapped on startup, objects as JSON lines). Writes are flushed at
+    most every ``flush_interval`` seconds and on ``close``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None,
+        embedder: Embedder,
+        collection_name: str = "Documents",
+        search_cache: TTLCache | None = None,
+        alpha: float = 0.75,
+        flush_interval: float = 5.0,
+    ) -> None:
+        """
+        Initialize the store, loading persisted data if present.
+
+        Args:
+            path: Directory for the persisted store (None keeps it in memory only)
+            embedder: Embedder producing document and query vectors
+            collection_name: Name reported in status output
+            search_cache: Optional cache of search results, invalidated on every write
+            alpha: Weight of vector similarity against BM25 (1 = pure vector search)
+            flush_interval: Minimum seconds between writes to disk (0 flushes every write)
+        """
+        if not 0.0 <= alpha <= 1.0:
+            raise ValueError("alpha must be between 0 and 1")
+
+        self._logger = logging.getLogger(__name__)
+        self.path = Path(path) if path is not None else None
+        self.embedder = embedder
+        self.collection_name = collection_name
+        self.search_cache = search_cache
+        self.alpha = alpha
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+
+        self._ids: list[str] = []
+        self._properties: list[dict[str, Any] | None] = []
+        self._rows: dict[str, int] = {}
+        self._sorted_ids: list[str] | None = None
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._postings: dict[str, dict[int, int]] = {}
+        self._total_length = 0
+        self._dirty = False
+        self._flushed_at = time.monotonic()
+
+        if self.path is not None:
+            self._load()
+
+    @property
+    def is_online(self) -> bool:
+        """The embedded store is always available."""
+        return True
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        options: SearchOptions | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Perform hybrid (vector + BM25) search on documents.
+
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+            options: Optional projection, filters and hybrid tuning
+
+        Returns:
+            List of documents with text, metadata and cosine distance
+        """
+        return self.search_many([query], limit, options)[0]
+
+    def search_many(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        options: SearchOptions | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Run several hybrid searches with one embedding call and one matrix product.
+
+        Args:
+            queries: Search query strings
+            limit: Maximum number of results per query
+            options: Optional projection, filters and hybrid tuning applied to every query
+
+        Returns:
+            Per-query result lists, in input order
+        """
+        keys = [search_cache_key(query, limit, options) for query in queries]
+        found: dict[Any, list[dict[str, Any]]] = {}
+        generation = self.search_cache.generation if self.search_cache is not None else None
+        if self.search_cache is not None:
+            for key in dict.fromkeys(keys):
+                cached = self.search_cache.get(key)
+                if cached is not None:
+                    found[key] = cached
+
+        missing: dict[Any, str] = {}
+        for key, query in zip(keys, queries):
+            if key not in found:
+                missing.setdefault(key, query)
+
+        if missing and not self._rows:
+            found.update((key, []) for key in missing)
+        elif missing:
+            vectors = self._normalize(np.asarray(self.embedder.embed(list(missing.values()))))
+            with self._lock:
+                similarities = vectors @ self._vectors[: len(self._ids)].T
+                for (key, query), similarity in zip(missing.items(), similarities):
+                    found[key] = self._hybrid(query, similarity, limit, options)
+            if self.search_cache is not None:
+                for key in missing:
+                    self.search_cache.put(key, found[key], generation)
+
+        return [list(found[key]) for key in keys]
+
+    def add_documents(self, documents: list[dict[str, Any]]) -> BatchWriteReport:
+        """
+        Add documents to the store.
+
+        Args:
+            documents: List of documents, each with 'text' and optional 'metadata'
+
+        Returns:
+            Report with the number of stored objects
+        """
+        return self.add_document_stream(documents)
+
+    def add_document_stream(self, documents: Iterable[dict[str, Any]]) -> BatchWriteReport:
+        """
+        Add documents from a (possibly lazy) iterable, embedding them in batches.
+
+        Args:
+            documents: Iterable of documents, each with 'text' and optional 'metadata'
+
+        Returns:
+            Report with the number of stored objects
+        """
+        report = BatchWriteReport()
+        started = time.perf_counter()
+        try:
+            for group in iter_batches(documents, EMBED_BATCH_SIZE):
+                texts = [doc.get("text", "") for doc in group]
+                vectors = self._normalize(np.asarray(self.embedder.embed(texts)))
+                with self._lock:
+                    for doc, text, vector in zip(group, texts, vectors):
+                        self._upsert(
+                            document_uuid(doc), {"text": text, **doc.get("metadata", {})}, vector
+                        )
+                    self._maybe_compact()
+                report.objects += len(group)
+        finally:
+            self._changed()
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def delete_by_source(self, source: str) -> int:
+        """
+        Delete all chunks of a source.
+
+        Args:
+            source: Value of the 'source' property to delete
+
+        Returns:
+            Number of deleted objects
+        """
+        return self.delete_objects(self.source_object_ids(source))
+
+    def delete_objects(self, ids: Iterable[str]) -> int:
+        """
+        Delete objects by UUID.
+
+        Args:
+            ids: UUIDs of objects to delete
+
+        Returns:
+            Number of deleted objects
+        """
+        with self._lock:
+            deleted = sum(1 for object_id in list(ids) if self._remove(object_id))
+            self._maybe_compact()
+        if deleted:
+            self._changed()
+        return deleted
+
+    def source_object_ids(self, source: str) -> set[str]:
+        """Return UUIDs of all objects stored for a source."""
+        with self._lock:
+            return {
+                object_id
+                for object_id, row in self._rows.items()
+                if (self._properties[row] or {}).get("source") == source
+            }
+
+    def get_status(self) -> dict[str, Any]:
+        """Return store statistics in the same shape as the Weaviate status."""
+        status: dict[str, Any] = {
+            "collection": self.collection_name,
+            "online": True,
+            "backend": "embedded",
+            "object_count": len(self._rows),
+            "dimensions": int(self._vectors.shape[1]),
+            "vocabulary": len(self._postings),
+            "path": str(self.path) if self.path is not None else None,
+        }
+        if self.search_cache is not None:
+            status["search_cache"] = self.search_cache.stats()
+        return status
+
+    def list_objects(
+        self,
+        limit: int = 20,
+        after: str | None = None,
+        include_vector: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Return a page of objects in UUID order, like Weaviate's cursor.
+
+        Args:
+            limit: Maximum number of objects to return
+            after: Return objects after this UUID (the last one of the previous page)
+            include_vector: Include each object's (normalized) vector
+
+        Returns:
+            Object entries with id, text and metadata
+        """
+        with self._lock:
+            # Sorted once and reused by every page until the next write
+            if self._sorted_ids is None:
+                self._sorted_ids = sorted(self._rows)
+            ids = self._sorted_ids
+            start = bisect_right(ids, after) if after is not None else 0
+            entries = []
+            for object_id in ids[start : start + limit]:
+                row = self._rows[object_id]
+                properties = self._properties[row] or {}
+                entry: dict[str, Any] = {
+                    "id": object_id,
+                    "text": properties.get("text", ""),
+                    "metadata": {k: v for k, v in properties.items() if k != "text"},
+                }
+                if include_vector:
+                    entry["vector"] = {"default": self._vectors[row].tolist()}
+                entries.append(entry)
+            return entries
+
+    def flush(self) -> None:
+        """Write live objects to disk, compacting deleted rows away."""
+        if self.path is None:
+            return
+
+        # One flush at a time: concurrent writers would share the temporary files,
+        # and a later snapshot must not be overwritten by an earlier one
+        with self._flush_lock:
+            with self._lock:
+                live = np.flatnonzero(self._alive[: len(self._ids)])
+                vectors = np.ascontiguousarray(self._vectors[live])
+                lines = [
+                    json.dumps({"id": self._ids[row], "properties": self._properties[row]})
+                    for row in live
+                ]
+                self._dirty = False
+                self._flushed_at = time.monotonic()
+
+            self.path.mkdir(parents=True, exist_ok=True)
+            # Write to temporary files and rename, so a crash never leaves a torn store
+            vectors_tmp = self.path / "vectors.tmp.npy"
+            objects_tmp = self.path / "objects.tmp.jsonl"
+            np.save(vectors_tmp, vectors)
+            objects_tmp.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+            os.replace(vectors_tmp, self.path / "vectors.npy")
+            os.replace(objects_tmp, self.path / "objects.jsonl")
+
+    def close(self) -> None:
+        """Flush pending writes (the embedder is closed by its owner)."""
+        if self._dirty:
+            self.flush()
+
+    def _load(self) -> None:
+        assert self.path is not None
+        vectors_path = self.path / "vectors.npy"
+        objects_path = self.path / "objects.jsonl"
+        if not vectors_path.exists() or not objects_path.exists():
+            return
+
+        # Memory-mapped: pages are read lazily, and the first append copies into RAM
+        vectors = np.load(vectors_path, mmap_mode="r")
+        with objects_path.open(encoding="utf-8") as handle:
+            objects = [json.loads(line) for line in handle if line.strip()]
+        if len(objects) != len(vectors):
+            raise ValueError(
+                f"Embedded store at {self.path} is inconsistent: "
+                f"{len(objects)} objects for {len(vectors)} vectors"
+            )
+
+        self._vectors = vectors
+        self._alive = np.ones(len(objects), dtype=bool)
+        self._lengths = np.zeros(len(objects), dtype=np.float32)
+        for row, obj in enumerate(objects):
+            self._ids.append(obj["id"])
+            self._properties.append(obj["properties"])
+            self._rows[obj["id"]] = row
+            self._index_text(row, obj["properties"].get("text", ""))
+        self._logger.info("Loaded %d objects from embedded store %s", len(objects), self.path)
+
+    def _hybrid(
+        self,
+        query: str,
+        similarity: np.ndarray,
+        limit: int,
+        options: SearchOptions | None = None,
+    ) -> list[dict[str, Any]]:
+        """Fuse a query's cosine similarities with BM25 and return the top ``limit`` rows."""
+        options = options or SearchOptions()
+        count = len(self._ids)
+        vector_hits = self._alive[:count].copy()
+        if options.filters:
+            vector_hits &= self._filter_mask(options.filters, count)
+        keyword_hits = vector_hits.copy()
+        if options.max_vector_distance is not None:
+            vector_hits &= 1.0 - similarity <= options.max_vector_distance
+
+        alpha = self.alpha if options.alpha is None else options.alpha
+        fuse = _reciprocal_ranks if options.fusion_type == "ranked" else _min_max
+        scores = alpha * fuse(similarity, vector_hits)
+        if alpha < 1.0:
+            keyword = self._bm25(query, count)
+            keyword_hits &= keyword > 0
+            scores += (1.0 - alpha) * fuse(keyword, keyword_hits)
+        else:
+            keyword_hits[:] = False
+
+        candidates = vector_hits | keyword_hits
+        found = int(candidates.sum())
+        if not found or limit <= 0:
+            return []
+        scores[~candidates] = -np.inf
+
+        k = min(limit, found)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        if options.auto_limit is not None:
+            top = top[: autocut(scores[top], options.auto_limit)]
+
+        projection = set(options.return_properties) if options.return_properties is not None else None
+        results = []
+        for row in top:
+            properties = self._properties[row] or {}
+            result = {
+                "text": properties.get("text", ""),
+                "metadata": {
+                    k: v
+                    for k, v in properties.items()
+                    if k != "text" and (projection is None or k in projection)
+                },
+                "distance": float(1.0 - similarity[row]),
+                "score": float(scores[row]),
+            }
+            if options.include_vector:
+                # A copy: rows move when the matrix grows (float32, as from Weaviate)
+                result["vector"] = self._vectors[row].copy()
+            results.append(result)
+        return results
+
+    def _filter_mask(self, filters: dict[str, Any], count: int) -> np.ndarray:
+        """Return which rows match every filter (a list value matches any of its items)."""
+        accepted = {
+            name: set(value) if isinstance(value, list) else {value}
+            for name, value in filters.items()
+        }
+        mask = np.zeros(count, dtype=bool)
+        for row in range(count):
+            properties = self._properties[row]
+            if properties is not None:
+                mask[row] = all(properties.get(name) in values for name, values in accepted.items())
+        return mask
+
+    def _bm25(self, query: str, count: int) -> np.ndarray:
+        """Return BM25 scores of all rows for a query."""
+        scores = np.zeros(count, dtype=np.float32)
+        documents = len(self._rows)
+        if not documents:
+            return scores
+
+        average_length = self._total_length / documents or 1.0
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[:count] / average_length)
+        for term in set(_tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            rows = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            tf = np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+            idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+            scores[rows] += idf * tf * (BM25_K1 + 1) / (tf + norms[rows])
+        return scores
+
+    def _upsert(self, object_id: str, properties: dict[str, Any], vector: np.ndarray) -> None:
+        row = self._rows.get(object_id)
+        if row is not None:
+            # Replace in place, so re-adding a chunk leaves no deleted row behind
+            self._unindex_text(row)
+        else:
+            row = len(self._ids)
+            self._reserve(row + 1, vector.shape[0])
+            self._ids.append(object_id)
+            self._properties.append(None)
+            self._rows[object_id] = row
+            self._sorted_ids = None
+        if not self._vectors.flags.writeable:
+            self._reserve(len(self._ids), vector.shape[0])
+        self._vectors[row] = vector
+        self._alive[row] = True
+        self._properties[row] = properties
+        self._index_text(row, properties.get("text", ""))
+
+    def _remove(self, object_id: str) -> bool:
+        row = self._rows.pop(object_id, None)
+        if row is None:
+            return False
+
+        self._unindex_text(row)
+        self._alive[row] = False
+        self._properties[row] = None
+        self._sorted_ids = None
+        return True
+
+    def _maybe_compact(self) -> None:
+        """Drop deleted rows from memory once they outnumber the live ones."""
+        dead = len(self._ids) - len(self._rows)
+        if dead < COMPACT_MIN_DEAD_ROWS or dead <= len(self._rows):
+            return
+
+        live = np.flatnonzero(self._alive[: len(self._ids)])
+        renumbered = np.full(len(self._ids), -1, dtype=np.int64)
+        renumbered[live] = np.arange(len(live))
+        capacity = max(len(live), 64)
+
+        vectors = np.zeros((capacity, self._vectors.shape[1]), dtype=np.float32)
+        vectors[: len(live)] = self._vectors[live]
+        lengths = np.zeros(capacity, dtype=np.float32)
+        lengths[: len(live)] = self._lengths[live]
+        self._vectors = vectors
+        self._lengths = lengths
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[: len(live)] = True
+
+        self._ids = [self._ids[row] for row in live]
+        self._properties = [self._properties[row] for row in live]
+        self._rows = {object_id: row for row, object_id in enumerate(self._ids)}
+        self._postings = {
+            term: {int(renumbered[row]): tf for row, tf in postings.items()}
+            for term, postings in self._postings.items()
+        }
+
+    def _unindex_text(self, row: int) -> None:
+        for term in Counter(_tokenize((self._properties[row] or {}).get("text", ""))):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(row, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= int(self._lengths[row])
+        self._lengths[row] = 0
+
+    def _index_text(self, row: int, text: str) -> None:
+        terms = Counter(_tokenize(text))
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[row] = tf
+        length = sum(terms.values())
+        self._lengths[row] = length
+        self._total_length += length
+
+    def _reserve(self, rows: int, dimensions: int) -> None:
+        """Grow the arrays geometrically so appends are amortized O(1)."""
+        if self._vectors.shape[1] not in (0, dimensions):
+            raise ValueError(
+                f"Vector size {dimensions} does not match the store's {self._vectors.shape[1]}"
+            )
+        if rows <= len(self._vectors) and self._vectors.flags.writeable:
+            return
+
+        capacity = max(rows, 2 * len(self._vectors), 64)
+        vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        if self._ids:
+            vectors[: len(self._ids)] = self._vectors[: len(self._ids)]
+        self._vectors = vectors
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), bool)])
+        self._lengths = np.concatenate(
+            [self._lengths, np.zeros(capacity - len(self._lengths), np.float32)]
+        )
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = vectors.astype(np.float32, copy=False).reshape(len(vectors), -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+    def _changed(self) -> None:
+        """Invalidate cached searches and flush if the flush interval has passed."""
+        if self.search_cache is not None:
+            self.search_cache.invalidate()
+        self._dirty = True
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+
+class AsyncEmbeddedVectorStore:
+    """Async facade over ``EmbeddedVectorStore`` matching ``AsyncWeaviateRepository``.
+
+    Work runs in a worker thread so large matrix products never stall the
+    event loop; for small corpora the whole call stays well under a millisecond.
+    """
+
+    def __init__(self, store: EmbeddedVectorStore) -> None:
+        self.store = store
+        self.collection_name = store.collection_name
+        self.search_cache = store.search_cache
+
+    @property
+    def is_online(self) -> bool:
+        return True
+
+    async def connect(self) -> None:
+        """Nothing to connect; the store is loaded on construction."""
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 5,
+        options: SearchOptions | None = None,
+    ) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.store.search, query, limit, options)
+
+    async def search_many(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        concurrency: int = 16,
+        options: SearchOptions | None = None,
+    ) -> list[list[dict[str, Any]] | Exception]:
+        return await asyncio.to_thread(self.store.search_many, queries, limit, options)
+
+    async def add_documents(self, documents: list[dict[str, Any]]) -> BatchWriteReport:
+        return await asyncio.to_thread(self.store.add_documents, documents)
+
+    async def get_status(self) -> dict[str, Any]:
+        return self.store.get_status()
+
+    async def list_objects(
+        self,
+        limit: int = 20,
+        after: str | None = None,
+        include_vector: bool = False,
+    ) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.store.list_objects, limit, after, include_vector)
+
+    async def iter_object_pages(
+        self,
+        include_vector: bool = False,
+        page_size: int = EXPORT_PAGE_SIZE,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        after: str | None = None
+        while page := await self.list_objects(page_size, after, include_vector):
+            yield page
+            if len(page) < page_size:
+                return
+            after = page[-1]["id"]
+
+    async def close(self) -> None:
+        """The shared store is closed with the sync repository."""
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlmodel import Field, Session, SQLModel, create_engine, delete, select
+
+
+class IngestedFile(SQLModel, table=True):
+    """Last successfully ingested version of a source file."""
+
+    source: str = Field(primary_key=True)
+    file_hash: str
+    chunking: str
+    chunk_count: int = 0
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class IngestedChunk(SQLModel, table=True):
+    """Chunk id (deterministic Weaviate UUID) known to be stored for a source."""
+
+    chunk_id: str = Field(primary_key=True)
+    source: str = Field(index=True)
+
+
+class IngestManifestRepository:
+    """Local SQLite manifest of ingested file and chunk hashes used for deduplication.
+
+    The manifest mirrors what has been written to Weaviate; if the collection is
+    dropped or rebuilt, delete the manifest file as well.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Initialize the manifest database.
+
+        Args:
+            path: Path of the SQLite database file (created if missing)
+        """
+        db_path = Path(path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+        )
+        SQLModel.metadata.create_all(
+            self.engine, tables=[IngestedFile.__table__, IngestedChunk.__table__]
+        )
+        self._lock = threading.Lock()
+
+    def is_unchanged(self, source: str, file_hash: str, chunking: str) -> bool:
+        """Return True if this exact file was already ingested with the same chunking."""
+        with Session(self.engine) as session:
+            record = session.get(IngestedFile, source)
+            return (
+                record is not None
+                and record.file_hash == file_hash
+                and record.chunking == chunking
+            )
+
+    def chunk_ids(self, source: str) -> set[str]:
+        """Return ids of chunks recorded for a source."""
+        with Session(self.engine) as session:
+            statement = select(IngestedChunk.chunk_id).where(IngestedChunk.source == source)
+            return set(session.exec(statement))
+
+    def record(
+        self,
+        source: str,
+        file_hash: str,
+        chunking: str,
+        chunk_ids: Iterable[str],
+    ) -> None:
+        """Replace the recorded file hash and chunk ids of a source."""
+        ids = set(chunk_ids)
+        with self._lock, Session(self.engine) as session:
+            session.exec(delete(IngestedChunk).where(IngestedChunk.source == source))
+            session.merge(
+                IngestedFile(
+                    source=source,
+                    file_hash=file_hash,
+                    chunking=chunking,
+                    chunk_count=len(ids),
+                )
+            )
+            session.add_all(IngestedChunk(chunk_id=chunk_id, source=source) for chunk_id in ids)
+            session.commit()
+
+    def forget(self, source: str) -> None:
+        """Remove everything recorded for a source."""
+        with self._lock, Session(self.engine) as session:
+            session.exec(delete(IngestedChunk).where(IngestedChunk.source == source))
+            session.exec(delete(IngestedFile).where(IngestedFile.source == source))
+            session.commit()
+
+
+def file_sha256(path: str | Path, chunk_bytes: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file, read in bounded pieces."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while data := handle.read(chunk_bytes):
+            digest.update(data)
+    return digest.hexdigest()
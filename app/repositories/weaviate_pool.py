@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import weaviate
+from httpx import ConnectError as HTTPXConnectError
+from weaviate.exceptions import (
+    WeaviateClosedClientError,
+    WeaviateConnectionError,
+    WeaviateGRPCUnavailableError,
+    WeaviateQueryError,
+    WeaviateRetryError,
+    WeaviateTimeoutError,
+)
+
+from app.repositories.weaviate_repository import WEAVIATE_ERRORS, connection_params
+
+T = TypeVar("T")
+
+READ_STRATEGIES = ("round_robin", "least_latency")
+# Errors that mean the node itself is unreachable, as opposed to a bad request
+NODE_ERRORS = (
+    WeaviateConnectionError,
+    WeaviateClosedClientError,
+    WeaviateTimeoutError,
+    WeaviateGRPCUnavailableError,
+    WeaviateRetryError,
+    HTTPXConnectError,
+    OSError,
+)
+# Weight of the newest sample in the latency moving average
+LATENCY_SMOOTHING = 0.2
+
+
+@dataclass
+class WeaviateNode:
+    """One Weaviate endpoint with its client and health counters."""
+
+    url: str
+    client: weaviate.WeaviateAsyncClient
+    healthy: bool = False
+    latency: float = 0.0
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0
+    last_error: str | None = None
+    checked_at: float = field(default_factory=time.time)
+
+    def observe(self, seconds: float) -> None:
+        """Fold a request duration into the latency moving average."""
+        if self.latency == 0.0:
+            self.latency = seconds
+        else:
+            self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+
+    def load(self, default_latency: float) -> float:
+        """Expected wait for a new request: average latency times queued requests."""
+        return (self.latency or default_latency) * (self.in_flight + 1)
+
+
+class WeaviatePool:
+    """Pool of async clients to Weaviate replicas with read balancing and failover.
+
+    Reads go to a healthy node picked round-robin or by least expected latency;
+    a node that fails with a connection error is marked unhealthy and the read
+    is retried on the next one. A background task probes every node's
+    readiness endpoint and returns recovered nodes to rotation.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        auth: Any = None,
+        grpc_port: int | None = None,
+        strategy: str = "round_robin",
+        health_check_interval: float = 10.0,
+    ) -> None:
+        """
+        Create unconnected clients for every endpoint.
+
+        Args:
+            urls: Weaviate endpoint URLs; the first one is preferred for writes
+            auth: Optional Weaviate credentials shared by all nodes
+            grpc_port: Optional gRPC port override shared by all nodes
+            strategy: Read balancing, "round_robin" or "least_latency"
+            health_check_interval: Seconds between readiness probes (0 disables them)
+        """
+        if not urls:
+            raise ValueError("At least one Weaviate URL is required")
+        if strategy not in READ_STRATEGIES:
+            raise ValueError(f"Unknown read strategy {strategy!r}; expected one of {READ_STRATEGIES}")
+
+        self._logger = logging.getLogger(__name__)
+        self.strategy = strategy
+        self.health_check_interval = health_check_interval
+        self.nodes = [
+            WeaviateNode(
+                url=url,
+                client=weaviate.use_async_with_custom(
+                    **connection_params(url, grpc_port),
+                    auth_credentials=auth,
+                ),
+            )
+            for url in urls
+        ]
+        self._rotation = itertools.count()
+        self._health_task: asyncio.Task[None] | None = None
+
+    @property
+    def healthy_nodes(self) -> list[WeaviateNode]:
+        return [node for node in self.nodes if node.healthy]
+
+    @property
+    def primary(self) -> WeaviateNode | None:
+        """First healthy node in configuration order, used for writes."""
+        return next((node for node in self.nodes if node.healthy), None)
+
+    async def connect(self) -> int:
+        """
+        Connect all nodes concurrently and start health checks.
+
+        Returns:
+            Number of nodes that connected
+        """
+        await asyncio.gather(*(self._check(node) for node in self.nodes))
+        if self.health_check_interval > 0 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop(), name="weaviate-health")
+        return len(self.healthy_nodes)
+
+    def pick(self, exclude: set[str] | None = None) -> WeaviateNode | None:
+        """Return the healthy node that should serve the next read."""
+        candidates = [node for node in self.healthy_nodes if node.url not in (exclude or ())]
+        if not candidates:
+            return None
+        if self.strategy == "least_latency":
+            # Nodes without samples yet are assumed to be as fast as the average
+            sampled = [node.latency for node in candidates if node.latency]
+            default = sum(sampled) / len(sampled) if sampled else 1.0
+            return min(candidates, key=lambda node: node.load(default))
+        return candidates[next(self._rotation) % len(candidates)]
+
+    async def read(self, operation: Callable[[weaviate.WeaviateAsyncClient], Awaitable[T]]) -> T:
+        """
+        Run a read on a balanced node, failing over to other nodes if it is down.
+
+        Args:
+            operation: Coroutine function taking a connected client
+
+        Returns:
+            The operation's result
+
+        Raises:
+            WeaviateConnectionError: If no healthy node could serve the read
+        """
+        tried: set[str] = set()
+        last_error: Exception | None = None
+        while (node := self.pick(exclude=tried)) is not None:
+            tried.add(node.url)
+            node.in_flight += 1
+            started = time.perf_counter()
+            try:
+                result = await operation(node.client)
+            except NODE_ERRORS as exc:
+                self._mark_down(node, exc)
+                last_error = exc
+                continue
+            except WeaviateQueryError as exc:
+                # Query errors also wrap gRPC UNAVAILABLE; only fail over if the node is down
+                if await self._is_ready(node):
+                    raise
+                self._mark_down(node, exc)
+                last_error = exc
+                continue
+            finally:
+                node.in_flight -= 1
+            node.requests += 1
+            node.observe(time.perf_counter() - started)
+            return result
+
+        raise WeaviateConnectionError(f"No healthy Weaviate node available: {last_error}")
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Return health and load counters for every node."""
+        return [
+            {
+                "url": node.url,
+                "healthy": node.healthy,
+                "latency_ms": round(node.latency * 1000, 2),
+                "in_flight": node.in_flight,
+                "requests": node.requests,
+                "failures": node.failures,
+                "last_error": node.last_error,
+            }
+            for node in self.nodes
+        ]
+
+    async def close(self) -> None:
+        """Stop health checks and close every client."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        await asyncio.gather(
+            *(node.client.close() for node in self.nodes), return_exceptions=True
+        )
+        for node in self.nodes:
+            node.healthy = False
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await asyncio.gather(*(self._check(node) for node in self.nodes))
+
+    async def _check(self, node: WeaviateNode) -> None:
+        """Probe one node, (re)connecting it if needed, and update its health."""
+        node.checked_at = time.time()
+        try:
+            if not node.client.is_connected():
+                await node.client.connect()
+            ready = await node.client.is_ready()
+        except WEAVIATE_ERRORS as exc:
+            self._mark_down(node, exc)
+            return
+
+        if not ready:
+            self._mark_down(node, None)
+            return
+        if not node.healthy:
+            self._logger.info("Weaviate node %s is available", node.url)
+        node.healthy = True
+        node.last_error = None
+
+    async def _is_ready(self, node: WeaviateNode) -> bool:
+        try:
+            return bool(await node.client.is_ready())
+        except WEAVIATE_ERRORS:
+            return False
+
+    def _mark_down(self, node: WeaviateNode, exc: Exception | None) -> None:
+        if node.healthy:
+            self._logger.warning("Weaviate node %s is unavailable: %s", node.url, exc)
+        node.healthy = False
+        node.failures += 1
+        node.last_error = str(exc) if exc is not None else "not ready"
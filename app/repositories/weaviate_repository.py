@@ -1,14 +1,281 @@
 from __future__ import annotations
 
-from typing import Any
-
 import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Literal
+from urllib.parse import parse_qs, urlsplit
 
+import numpy as np
 import weaviate
 from httpx import ConnectError as HTTPXConnectError
-from weaviate.classes.query import MetadataQuery
+from weaviate.classes.query import Filter, HybridFusion, MetadataQuery
 from weaviate.exceptions import WeaviateBaseError, WeaviateConnectionError
 
+from app.ai.embeddings import Embedder
+from app.repositories.batch_writer import BatchObject, BatchWriter, BatchWriteReport
+from app.utils.cache import TTLCache, normalize_query
+from app.utils.pdf_parser import iter_batches
+
+EMBED_BATCH_SIZE = 64
+# Weaviate caps objects matched per query/delete at QUERY_MAXIMUM_RESULTS (default 10000)
+DELETE_PAGE_LIMIT = 10_000
+ID_FILTER_BATCH_SIZE = 500
+# Objects per cursor page when streaming a collection export
+EXPORT_PAGE_SIZE = 1000
+# Failures of a Weaviate request, as opposed to bugs in the calling code
+WEAVIATE_ERRORS = (WeaviateBaseError, HTTPXConnectError, OSError)
+FUSION_TYPES = {"ranked": HybridFusion.RANKED, "relative_score": HybridFusion.RELATIVE_SCORE}
+
+FilterValue = str | int | float | bool
+
+
+@dataclass(frozen=True)
+class SearchOptions:
+    """Optional hybrid search tuning; unset fields keep Weaviate's defaults.
+
+    Attributes:
+        return_properties: Properties to return besides ``text`` (None returns all)
+        filters: Property values to match; a list matches any of its values
+        alpha: Weight of vector against keyword search (1 = pure vector)
+        fusion_type: How vector and keyword results are combined,
+            "ranked" or "relative_score"
+        max_vector_distance: Drop vector candidates farther than this distance
+        auto_limit: Cut results after this many jumps in score (autocut)
+        include_vector: Return each result's vector (for re-ranking)
+    """
+
+    return_properties: list[str] | None = None
+    filters: dict[str, FilterValue | list[FilterValue]] | None = None
+    alpha: float | None = None
+    fusion_type: Literal["ranked", "relative_score"] | None = None
+    max_vector_distance: float | None = None
+    auto_limit: int | None = None
+    include_vector: bool = False
+
+    def __post_init__(self) -> None:
+        if self.alpha is not None and not 0.0 <= self.alpha <= 1.0:
+            raise ValueError("alpha must be between 0 and 1")
+        if self.fusion_type is not None and self.fusion_type not in FUSION_TYPES:
+            raise ValueError(f"fusion_type must be one of {sorted(FUSION_TYPES)}")
+        if self.max_vector_distance is not None and self.max_vector_distance < 0:
+            raise ValueError("max_vector_distance must not be negative")
+        if self.auto_limit is not None and self.auto_limit < 1:
+            raise ValueError("auto_limit must be positive")
+
+    def cache_key(self) -> tuple[Any, ...]:
+        """Return a hashable form of the options for cache keys."""
+        return (
+            tuple(sorted(set(self.return_properties))) if self.return_properties is not None else None,
+            tuple(
+                sorted(
+                    (name, tuple(value) if isinstance(value, list) else value)
+                    for name, value in self.filters.items()
+                )
+            )
+            if self.filters
+            else None,
+            self.alpha,
+            self.fusion_type,
+            self.max_vector_distance,
+            self.auto_limit,
+            self.include_vector,
+        )
+
+
+def document_uuid(document: dict[str, Any]) -> str:
+    """
+    Return the deterministic Weaviate UUID for a document with text and metadata.
+
+    Chunk metadata includes ``chunk_index`` and the page span, so the id is
+    positional: an edit that shifts chunk boundaries gives every later chunk a
+    new id, and ingest dedup only skips chunks before the first change. Ids
+    are not keyed on text alone because adjacent-chunk merging and page
+    citations rely on the stored positions being current.
+    """
+    properties = {"text": document.get("text", ""), **document.get("metadata", {})}
+    return str(weaviate.util.generate_uuid5(properties))
+
+
+def connection_params(url: str, grpc_port_override: int | None = None) -> dict[str, Any]:
+    """
+    Return host, port and TLS arguments for ``connect_to_custom`` from a URL.
+
+    The gRPC port is taken from a ``grpc_port`` query parameter
+    (``http://weaviate-2:8080?grpc_port=50051``), then ``grpc_port_override``,
+    then defaults to 50051 for localhost and the HTTP port + 1 elsewhere.
+    """
+    parsed = urlsplit(url if "://" in url else f"http://{url}")
+    is_secure = parsed.scheme == "https"
+    host = parsed.hostname or "localhost"
+    port = str(parsed.port or (443 if is_secure else 8080))
+    url_grpc_port = parse_qs(parsed.query).get("grpc_port", [None])[0]
+    is_local = host in ("localhost", "127.0.0.1") and not is_secure
+
+    if url_grpc_port is not None:
+        grpc_port = url_grpc_port
+    elif grpc_port_override is not None:
+        grpc_port = str(grpc_port_override)
+    elif is_local:
+        grpc_port = "50051"
+    else:
+        grpc_port = str(int(port) + 1) if not is_secure else "50051"
+
+    params: dict[str, Any] = {
+        "http_host": host,
+        "http_port": port,
+        "http_secure": is_secure,
+        "grpc_host": host,
+        "grpc_port": grpc_port,
+        "grpc_secure": is_secure,
+    }
+    if is_local:
+        import weaviate.classes.init as wvc
+
+        params["additional_config"] = wvc.AdditionalConfig(
+            timeout=wvc.Timeout(init=30, query=60, insert=60),
+        )
+    return params
+
+
+def collection_config(
+    collection_name: str,
+    embedder: Embedder | None,
+    openai_api_key: str | None,
+) -> dict[str, Any]:
+    """Return the ``collections.create`` arguments for the Documents collection."""
+    if embedder is not None:
+        # Vectors are computed client-side and sent with each object
+        vectorizer_config = weaviate.classes.config.Configure.Vectorizer.none()
+    elif openai_api_key:
+        # Use OpenAI text-embedding-3-large vectorizer
+        vectorizer_config = weaviate.classes.config.Configure.Vectorizer.text2vec_openai(
+            model="text-embedding-3-large",
+            model_version="",
+            type_="text",
+        )
+    else:
+        # Fallback to none if no OpenAI key
+        vectorizer_config = weaviate.classes.config.Configure.Vectorizer.none()
+
+    # Define properties for the collection
+    properties = [
+        weaviate.classes.config.Property(
+            name="text",
+            data_type=weaviate.classes.config.DataType.TEXT,
+            description="Document text content",
+        ),
+        # Field tokenization: filters on the source name match it whole, so
+        # "report.pdf" does not also match "annual report.pdf"
+        weaviate.classes.config.Property(
+            name="source",
+            data_type=weaviate.classes.config.DataType.TEXT,
+            tokenization=weaviate.classes.config.Tokenization.FIELD,
+            description="Name of the source document",
+        ),
+    ]
+
+    return {
+        "name": collection_name,
+        "vectorizer_config": vectorizer_config,
+        "properties": properties,
+    }
+
+
+def schema_summary(config: Any) -> dict[str, Any]:
+    """Summarize a collection config for the status endpoint."""
+    return {
+        "name": config.name,
+        "description": getattr(config, "description", None),
+        "vectorizer": getattr(config, "vectorizer", None),
+        "module_config": getattr(config, "module_config", None),
+        "properties": [prop.name for prop in getattr(config, "properties", [])],
+    }
+
+
+def search_cache_key(
+    query: str, limit: int, options: SearchOptions | None = None
+) -> tuple[Any, ...]:
+    """Return the retrieval cache key for a query and its search parameters."""
+    return (normalize_query(query), limit, options.cache_key() if options else None)
+
+
+def search_filter(filters: dict[str, FilterValue | list[FilterValue]] | None) -> Any:
+    """Build a Weaviate filter matching all given property values, or None."""
+    if not filters:
+        return None
+    conditions = [
+        Filter.by_property(name).contains_any(value)
+        if isinstance(value, list)
+        else Filter.by_property(name).equal(value)
+        for name, value in filters.items()
+    ]
+    return conditions[0] if len(conditions) == 1 else Filter.all_of(conditions)
+
+
+def hybrid_arguments(options: SearchOptions | None) -> dict[str, Any]:
+    """Return the ``query.hybrid`` keyword arguments for search options."""
+    arguments: dict[str, Any] = {"return_metadata": MetadataQuery(distance=True, score=True)}
+    if options is None:
+        return arguments
+
+    if options.return_properties is not None:
+        arguments["return_properties"] = ["text", *(p for p in options.return_properties if p != "text")]
+    if options.filters:
+        arguments["filters"] = search_filter(options.filters)
+    if options.alpha is not None:
+        arguments["alpha"] = options.alpha
+    if options.fusion_type is not None:
+        arguments["fusion_type"] = FUSION_TYPES[options.fusion_type]
+    if options.max_vector_distance is not None:
+        arguments["max_vector_distance"] = options.max_vector_distance
+    if options.auto_limit is not None:
+        arguments["auto_limit"] = options.auto_limit
+    if options.include_vector:
+        arguments["include_vector"] = True
+    return arguments
+
+
+def search_result(obj: Any) -> dict[str, Any]:
+    """
+    Convert a search hit into a document with text, metadata, distance and score.
+
+    A requested vector is kept as a float32 array: results are held in the
+    search cache, where a list of Python floats costs eight times the memory.
+    """
+    properties = obj.properties
+    result = {
+        "text": properties.get("text", ""),
+        "metadata": {k: v for k, v in properties.items() if k != "text"},
+        "distance": obj.metadata.distance if obj.metadata else None,
+        "score": obj.metadata.score if obj.metadata else None,
+    }
+    if getattr(obj, "vector", None):
+        vector = obj.vector.get("default") or next(iter(obj.vector.values()))
+        result["vector"] = np.asarray(vector, dtype=np.float32)
+    return result
+
+
+def object_entry(obj: Any) -> dict[str, Any]:
+    """Convert a stored object into an inspection entry with id and timestamps."""
+    properties = obj.properties or {}
+    metadata = {k: v for k, v in properties.items() if k != "text"}
+    entry: dict[str, Any] = {
+        "id": str(obj.uuid),
+        "text": properties.get("text", ""),
+        "metadata": metadata,
+    }
+
+    if obj.metadata:
+        entry["distance"] = getattr(obj.metadata, "distance", None)
+        entry["created"] = getattr(obj.metadata, "creation_time", None)
+        entry["updated"] = getattr(obj.metadata, "last_update_time", None)
+    if getattr(obj, "vector", None):
+        # Named vectors, {"default": [...]} for this collection
+        entry["vector"] = dict(obj.vector)
+
+    return entry
+
 
 class WeaviateRepository:
     """Simple Weaviate client wrapper for document storage and retrieval."""
@@ -21,6 +288,9 @@ class WeaviateRepository:
         openai_api_key: str | None = None,
         allow_fallback: bool = False,
         grpc_port: int | None = None,
+        embedder: Embedder | None = None,
+        batch_writer: BatchWriter | None = None,
+        search_cache: TTLCache | None = None,
     ) -> None:
         """
         Initialize Weaviate client.
@@ -30,11 +300,19 @@ class WeaviateRepository:
             api_key: Optional Weaviate API key for authentication
             collection_name: Name of the collection to use
             openai_api_key: OpenAI API key for embeddings (required for vectorizer)
+            embedder: Optional client-side embedder; when set, vectors are computed
+                locally and sent explicitly instead of by a server-side vectorizer
+            batch_writer: Batch writer used for inserts (dynamic batching by default)
+            search_cache: Optional cache of search results, invalidated on every
+                write; may be shared with other repositories on the same collection
         """
         self._logger = logging.getLogger(__name__)
         auth = weaviate.auth.AuthApiKey(api_key=api_key) if api_key else None
         self.openai_api_key = openai_api_key
         self.collection_name = collection_name
+        self.embedder = embedder
+        self.batch_writer = batch_writer or BatchWriter()
+        self.search_cache = search_cache
         self._offline = False
         self.client = None
 
@@ -51,13 +329,24 @@ class WeaviateRepository:
             else:
                 raise
 
-    def search(self, query: str, limit: int = 5) -> list[dict[str, Any]]:
+    @property
+    def is_online(self) -> bool:
+        """Return True if the repository has a live Weaviate client."""
+        return self.client is not None
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        options: SearchOptions | None = None,
+    ) -> list[dict[str, Any]]:
         """
-        Perform hybrid search on documents.
+        Perform hybrid search on documents, served from the search cache when possible.
 
         Args:
             query: Search query string
             limit: Maximum number of results to return
+            options: Optional projection, filters and hybrid tuning
 
         Returns:
             List of documents with text and metadata
@@ -66,58 +355,193 @@ class WeaviateRepository:
             self._logger.debug("Offline Weaviate repo - returning empty search results")
             return []
 
+        if self.search_cache is None:
+            return self._search(query, limit, options)
+
+        key = search_cache_key(query, limit, options)
+        cached = self.search_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        generation = self.search_cache.generation
+        results = self._search(query, limit, options)
+        self.search_cache.put(key, results, generation)
+        return list(results)
+
+    def _search(
+        self,
+        query: str,
+        limit: int,
+        options: SearchOptions | None = None,
+    ) -> list[dict[str, Any]]:
+        """Run a hybrid search against Weaviate."""
         try:
             collection = self.client.collections.get(self.collection_name)
+            vector = self.embedder.embed([query])[0] if self.embedder else None
             response = collection.query.hybrid(
                 query=query,
+                vector=vector,
                 limit=limit,
-                return_metadata=MetadataQuery(distance=True),
+                **hybrid_arguments(options),
             )
 
-            results: list[dict[str, Any]] = []
-            for obj in response.objects:
-                properties = obj.properties
-                results.append(
-                    {
-                        "text": properties.get("text", ""),
-                        "metadata": {k: v for k, v in properties.items() if k != "text"},
-                        "distance": obj.metadata.distance if obj.metadata else None,
-                    }
-                )
-            return results
+            return [search_result(obj) for obj in response.objects]
         except Exception as e:
             # If collection doesn't exist, return empty list
             if "does not exist" in str(e).lower():
                 return []
             raise
 
-    def add_documents(self, documents: list[dict[str, Any]]) -> None:
+    def add_documents(self, documents: list[dict[str, Any]]) -> BatchWriteReport:
         """
         Add documents to the collection.
 
         Args:
             documents: List of documents, each with 'text' and optional 'metadata'
+
+        Returns:
+            Report with written, failed and retried object counts
+        """
+        return self.add_document_stream(documents)
+
+    def add_document_stream(self, documents: Iterable[dict[str, Any]]) -> BatchWriteReport:
+        """
+        Add documents from a (possibly lazy) iterable within one long-lived batch.
+
+        Blocks while the iterable is consumed, so callers streaming from another
+        thread or event loop should run it in a worker thread.
+
+        Args:
+            documents: Iterable of documents, each with 'text' and optional 'metadata'
+
+        Returns:
+            Report with written, failed and retried object counts
         """
         if self.client is None:
             self._logger.debug("Offline Weaviate repo - skipping document add")
-            return
+            return BatchWriteReport(objects=sum(1 for _ in documents))
 
-        try:
-            collection = self.client.collections.get(self.collection_name)
-        except Exception:
-            # Collection doesn't exist, create it
+        if not self.client.collections.exists(self.collection_name):
             self._create_collection()
-            collection = self.client.collections.get(self.collection_name)
+        collection = self.client.collections.get(self.collection_name)
 
-        with collection.batch.dynamic() as batch:
-            for idx, doc in enumerate(documents):
-                text = doc.get("text", "")
+        try:
+            return self.batch_writer.write(collection, self._batch_objects(documents))
+        finally:
+            self._invalidate_search_cache()
+
+    def _batch_objects(self, documents: Iterable[dict[str, Any]]) -> Iterable[BatchObject]:
+        """Turn documents into batch objects, embedding them client-side if configured."""
+        for group in iter_batches(documents, EMBED_BATCH_SIZE):
+            texts = [doc.get("text", "") for doc in group]
+            vectors = self.embedder.embed(texts) if self.embedder else [None] * len(group)
+            for doc, text, vector in zip(group, texts, vectors):
                 metadata = doc.get("metadata", {})
-                properties = {"text": text, **metadata}
-                batch.add_object(
-                    properties=properties,
-                    uuid=weaviate.util.generate_uuid5(properties),
+                yield BatchObject(
+                    properties={"text": text, **metadata},
+                    uuid=document_uuid(doc),
+                    vector=vector,
                 )
+
+    def delete_by_source(self, source: str) -> int:
+        """
+        Delete all chunks of a source.
+
+        Matching objects are looked up and deleted by UUID rather than with a
+        filtered batch delete, so only chunks whose source is exactly ``source``
+        are deleted, also in collections created before ``source`` was declared
+        with field tokenization.
+
+        Args:
+            source: Value of the 'source' property to delete
+
+        Returns:
+            Number of deleted objects
+        """
+        if self.client is None:
+            self._logger.debug("Offline Weaviate repo - skipping delete")
+            return 0
+
+        deleted = 0
+        while True:
+            ids, scanned = self._source_matches(source)
+            if ids:
+                deleted += self.delete_objects(ids)
+            # A full window may hide more matches behind the query limit
+            if scanned < DELETE_PAGE_LIMIT or not ids:
+                return deleted
+
+    def delete_objects(self, ids: Iterable[str]) -> int:
+        """
+        Delete objects by UUID.
+
+        Args:
+            ids: UUIDs of objects to delete
+
+        Returns:
+            Number of deleted objects
+        """
+        if self.client is None:
+            self._logger.debug("Offline Weaviate repo - skipping delete")
+            return 0
+
+        collection = self.client.collections.get(self.collection_name)
+        deleted = 0
+        try:
+            for group in iter_batches(ids, ID_FILTER_BATCH_SIZE):
+                result = collection.data.delete_many(where=Filter.by_id().contains_any(group))
+                deleted += result.successful
+        finally:
+            self._invalidate_search_cache()
+        return deleted
+
+    def source_object_ids(self, source: str, page_size: int = 1000) -> set[str]:
+        """
+        Return UUIDs of all objects stored for a source.
+
+        Pages with offsets, so at most QUERY_MAXIMUM_RESULTS objects per source
+        are visible (10000 by default).
+
+        Args:
+            source: Value of the 'source' property
+            page_size: Objects fetched per request
+
+        Returns:
+            Set of object UUIDs
+        """
+        return self._source_matches(source, page_size)[0]
+
+    def _source_matches(self, source: str, page_size: int = 1000) -> tuple[set[str], int]:
+        """
+        Return UUIDs of objects whose source is exactly ``source``, and the number scanned.
+
+        The filter narrows the candidates, but on a word-tokenized ``source``
+        property it matches every source containing the same words, so each
+        candidate's value is compared before it is returned.
+        """
+        if self.client is None or not self.client.collections.exists(self.collection_name):
+            return set(), 0
+
+        collection = self.client.collections.get(self.collection_name)
+        ids: set[str] = set()
+        scanned = 0
+        while scanned < DELETE_PAGE_LIMIT:
+            response = collection.query.fetch_objects(
+                filters=Filter.by_property("source").equal(source),
+                limit=min(page_size, DELETE_PAGE_LIMIT - scanned),
+                offset=scanned,
+                return_properties=["source"],
+            )
+            scanned += len(response.objects)
+            ids.update(
+                str(obj.uuid)
+                for obj in response.objects
+                if (obj.properties or {}).get("source") == source
+            )
+            if len(response.objects) < page_size:
+                break
+        return ids, scanned
+
     def get_status(self) -> dict[str, Any]:
         """Return basic health info and collection statistics."""
         status: dict[str, Any] = {
@@ -131,68 +555,63 @@ class WeaviateRepository:
 
         try:
             collection = self.client.collections.get(self.collection_name)
-        except Exception as exc:
+        except WEAVIATE_ERRORS as exc:
             status["message"] = f"Unable to access collection: {exc}"
             return status
 
         status["online"] = True
+        if self.search_cache is not None:
+            status["search_cache"] = self.search_cache.stats()
 
         try:
-            config = collection.config.get()
-            status["schema"] = {
-                "name": config.name,
-                "description": getattr(config, "description", None),
-                "vectorizer": getattr(config, "vectorizer", None),
-                "module_config": getattr(config, "module_config", None),
-                "properties": [prop.name for prop in getattr(config, "properties", [])],
-            }
-        except Exception as exc:
+            status["schema"] = schema_summary(collection.config.get())
+        except WEAVIATE_ERRORS as exc:
             status["schema_error"] = str(exc)
 
         try:
             aggregate = collection.aggregate.over_all(total_count=True)
             status["object_count"] = aggregate.total_count or 0
-        except Exception as exc:
+        except WEAVIATE_ERRORS as exc:
             status["aggregation_error"] = str(exc)
 
         return status
 
-    def list_objects(self, limit: int = 20) -> list[dict[str, Any]]:
-        """Return recent objects stored in the collection."""
+    def list_objects(
+        self,
+        limit: int = 20,
+        after: str | None = None,
+        include_vector: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Return a page of objects in UUID order.
+
+        Args:
+            limit: Maximum number of objects to return
+            after: Return objects after this UUID (the last one of the previous page)
+            include_vector: Include each object's vectors
+
+        Returns:
+            Object entries with id, text and metadata
+        """
         if self.client is None:
             self._logger.debug("Offline Weaviate repo - cannot list objects")
             return []
 
         try:
             collection = self.client.collections.get(self.collection_name)
-        except Exception as exc:
+        except WEAVIATE_ERRORS as exc:
             self._logger.error("Unable to read collection %s: %s", self.collection_name, exc)
             return []
 
         try:
-            response = collection.query.fetch_objects(limit=limit)
-        except Exception as exc:
+            response = collection.query.fetch_objects(
+                limit=limit, after=after, include_vector=include_vector
+            )
+        except WEAVIATE_ERRORS as exc:
             self._logger.error("Error fetching objects from Weaviate: %s", exc)
             return []
 
-        items: list[dict[str, Any]] = []
-        for obj in response.objects or []:
-            properties = obj.properties or {}
-            metadata = {k: v for k, v in properties.items() if k != "text"}
-            entry: dict[str, Any] = {
-                "id": str(obj.uuid),
-                "text": properties.get("text", ""),
-                "metadata": metadata,
-            }
-
-            if obj.metadata:
-                entry["distance"] = getattr(obj.metadata, "distance", None)
-                entry["created"] = getattr(obj.metadata, "creation_time", None)
-                entry["updated"] = getattr(obj.metadata, "last_update_time", None)
-
-            items.append(entry)
-
-        return items
+        return [object_entry(obj) for obj in response.objects or []]
 
     def _create_collection(self) -> None:
         """Create the Documents collection if it doesn't exist."""
@@ -200,35 +619,17 @@ class WeaviateRepository:
             self._logger.debug("Offline Weaviate repo - skipping collection creation")
             return
 
-        if self.openai_api_key:
-            # Use OpenAI text-embedding-3-large vectorizer
-            vectorizer_config = weaviate.classes.config.Configure.Vectorizer.text2vec_openai(
-                model="text-embedding-3-large",
-                model_version="",
-                type_="text",
-            )
-        else:
-            # Fallback to none if no OpenAI key
-            vectorizer_config = weaviate.classes.config.Configure.Vectorizer.none()
-
-        # Define properties for the collection
-        properties = [
-            weaviate.classes.Property(
-                name="text",
-                data_type=weaviate.classes.DataType.TEXT,
-                description="Document text content",
-            ),
-        ]
-
         self.client.collections.create(
-            name=self.collection_name,
-            vectorizer_config=vectorizer_config,
-            properties=properties,
-            generative_config=weaviate.classes.config.Configure.Generative.none(),
+            **collection_config(self.collection_name, self.embedder, self.openai_api_key)
         )
 
+    def _invalidate_search_cache(self) -> None:
+        """Drop cached search results after the collection changed."""
+        if self.search_cache is not None:
+            self.search_cache.invalidate()
+
     def close(self) -> None:
-        """Close the Weaviate client connection."""
+        """Close the Weaviate client connection (the embedder is closed by its owner)."""
         if self.client:
             self.client.close()
 
@@ -239,43 +640,8 @@ class WeaviateRepository:
         grpc_port_override: int | None = None,
     ):
         """Create a Weaviate client for the provided URL."""
-        url_clean = url.replace("http://", "").replace("https://", "")
-        is_secure = url.startswith("https://")
-
-        if ":" in url_clean:
-            host, port = url_clean.split(":", 1)
-        else:
-            host = url_clean
-            port = "443" if is_secure else "8080"
-
-        if host in ("localhost", "127.0.0.1") and not is_secure and grpc_port_override is None:
-            import weaviate.classes.init as wvc
-
-            return weaviate.connect_to_custom(
-                http_host=host,
-                http_port="8080",
-                http_secure=False,
-                grpc_host=host,
-                grpc_port="50051",
-                grpc_secure=False,
-                auth_credentials=auth,
-                additional_config=wvc.AdditionalConfig(
-                    timeout=wvc.Timeout(init=30, query=60, insert=60),
-                ),
-            )
-
-        if grpc_port_override is not None:
-            grpc_port = str(grpc_port_override)
-        else:
-            grpc_port = str(int(port) + 1) if port.isdigit() and not is_secure else "50051"
-
         return weaviate.connect_to_custom(
-            http_host=host,
-            http_port=port,
-            http_secure=is_secure,
-            grpc_host=host,
-            grpc_port=grpc_port,
-            grpc_secure=is_secure,
+            **connection_params(url, grpc_port_override),
             auth_credentials=auth,
         )
 
@@ -1,8 +1,28 @@
-from .ingest_schema import IngestResponse
+from .ingest_schema import (
+    BulkIngestFileResult,
+    BulkIngestResponse,
+    DeleteSourceResponse,
+    IngestJobResponse,
+    IngestResponse,
+)
 from .query_schema import QueryRequest, QueryResponse
+from .weaviate_schema import (
+    BatchSearchRequest,
+    BatchSearchResponse,
+    BatchSearchResult,
+    SearchHit,
+)
 
 __all__ = [
     "QueryRequest",
     "QueryResponse",
     "IngestResponse",
+    "IngestJobResponse",
+    "BulkIngestResponse",
+    "BulkIngestFileResult",
+    "DeleteSourceResponse",
+    "BatchSearchRequest",
+    "BatchSearchResponse",
+    "BatchSearchResult",
+    "SearchHit",
 ]
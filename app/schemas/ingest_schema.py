@@ -6,6 +6,92 @@ class IngestResponse(BaseModel):
 
     status: str = Field(..., description="Ingestion status")
     count: int = Field(..., ge=0, description="Number of documents ingested")
+    skipped: int = Field(
+        default=0, ge=0, description="Number of unchanged chunks that were not re-ingested"
+    )
+    failed: int = Field(
+        default=0, ge=0, description="Number of chunks Weaviate rejected after all retries"
+    )
+    retries: int = Field(default=0, ge=0, description="Number of chunk re-sends after failures")
+    deleted: int = Field(
+        default=0, ge=0, description="Number of stale chunks of the previous version deleted"
+    )
+    objects_per_second: float = Field(
+        default=0.0, ge=0, description="Weaviate write throughput in chunks per second"
+    )
 
 
+class IngestJobResponse(BaseModel):
+    """Response schema for asynchronous ingestion jobs."""
 
+    job_id: str = Field(..., description="Ingestion job identifier")
+    status: str = Field(
+        ..., description="Job status: queued, running, succeeded, failed or cancelled"
+    )
+    source: str = Field(..., description="Source name of the ingested file")
+    pages_parsed: int = Field(default=0, ge=0, description="Number of pages extracted so far")
+    chunks_written: int = Field(
+        default=0, ge=0, description="Number of chunks written to Weaviate so far"
+    )
+    chunks_skipped: int = Field(
+        default=0, ge=0, description="Number of unchanged chunks that were not re-ingested"
+    )
+    chunks_deleted: int = Field(
+        default=0, ge=0, description="Number of stale chunks of the previous version deleted"
+    )
+    unchanged: bool = Field(
+        default=False, description="True if the file was already ingested and was skipped"
+    )
+    failures: int = Field(default=0, ge=0, description="Number of chunks that failed to write")
+    retries: int = Field(default=0, ge=0, description="Number of chunk re-sends after failures")
+    pages_per_second: float = Field(default=0.0, ge=0, description="Page extraction throughput")
+    chunks_per_second: float = Field(default=0.0, ge=0, description="Chunk write throughput")
+    error: str | None = Field(default=None, description="Error message if the job failed")
+    created_at: float = Field(..., description="Unix time the job was queued")
+    started_at: float | None = Field(default=None, description="Unix time the job started")
+    finished_at: float | None = Field(default=None, description="Unix time the job finished")
+
+
+class BulkIngestFileResult(BaseModel):
+    """Per-file outcome of a bulk ingestion."""
+
+    source: str = Field(..., description="Source name of the file (archive member path for archives)")
+    status: str = Field(
+        ..., description="Ingestion status: success, partial, unchanged or error"
+    )
+    count: int = Field(default=0, ge=0, description="Number of chunks ingested")
+    skipped: int = Field(
+        default=0, ge=0, description="Number of unchanged chunks that were not re-ingested"
+    )
+    pages: int = Field(default=0, ge=0, description="Number of pages parsed")
+    deleted: int = Field(
+        default=0, ge=0, description="Number of stale chunks of the previous version deleted"
+    )
+    failed: int = Field(
+        default=0, ge=0, description="Number of chunks Weaviate rejected after all retries"
+    )
+    error: str | None = Field(default=None, description="Error message if the file failed")
+
+
+class BulkIngestResponse(BaseModel):
+    """Response schema for bulk ingestion endpoint."""
+
+    status: str = Field(..., description="Overall status: success, partial or error")
+    count: int = Field(..., ge=0, description="Total number of chunks ingested")
+    failed: int = Field(
+        default=0, ge=0, description="Total number of chunks Weaviate rejected after all retries"
+    )
+    objects_per_second: float = Field(
+        default=0.0, ge=0, description="Weaviate write throughput in chunks per second"
+    )
+    files: list[BulkIngestFileResult] = Field(
+        default_factory=list, description="Per-file results"
+    )
+
+
+class DeleteSourceResponse(BaseModel):
+    """Response schema for deleting all chunks of a source."""
+
+    status: str = Field(..., description="Deletion status: deleted or not_found")
+    source: str = Field(..., description="Source name whose chunks were deleted")
+    deleted: int = Field(..., ge=0, description="Number of chunks deleted")
@@ -1,10 +1,17 @@
 from pydantic import BaseModel, Field
 
+from app.repositories.weaviate_repository import SearchOptions
+
 
 class QueryRequest(BaseModel):
     """Request schema for query endpoint."""
 
     query: str = Field(..., min_length=1, description="User query string")
+    search_options: SearchOptions | None = Field(
+        default=None,
+        description="Knowledge base search tuning: returned properties, filters "
+        "(e.g. {\"source\": \"report.pdf\"}), alpha, fusion type, distance cutoff, autocut",
+    )
 
 
 class QueryResponse(BaseModel):
@@ -14,4 +21,14 @@ class QueryResponse(BaseModel):
     sources: list[str] = Field(
         default_factory=list, description="Source URLs or document IDs"
     )
+    context_tokens: int | None = Field(
+        default=None, description="Estimated tokens of context sent to the LLM"
+    )
+    skipped_sources: list[str] = Field(
+        default_factory=list,
+        description="Fan-out sources dropped for missing their deadline or failing",
+    )
+    cached: bool = Field(
+        default=False, description="Whether the answer came from the answer cache"
+    )
 
@@ -0,0 +1,41 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from app.repositories.weaviate_repository import SearchOptions
+
+
+class SearchHit(BaseModel):
+    """One retrieved document."""
+
+    text: str = Field(..., description="Chunk text")
+    metadata: dict[str, Any] = Field(default_factory=dict, description="Chunk metadata")
+    distance: float | None = Field(default=None, description="Vector distance, if available")
+    score: float | None = Field(default=None, description="Hybrid search score, if available")
+    vector: list[float] | None = Field(default=None, description="Vector, if requested")
+
+
+class BatchSearchRequest(BaseModel):
+    """Request schema for batched search."""
+
+    queries: list[str] = Field(..., min_length=1, description="Search query strings")
+    limit: int = Field(default=5, ge=1, le=100, description="Maximum results per query")
+    options: SearchOptions | None = Field(
+        default=None, description="Projection, filters and hybrid tuning for every query"
+    )
+
+
+class BatchSearchResult(BaseModel):
+    """Results of one query in a batched search."""
+
+    query: str = Field(..., description="Search query string")
+    results: list[SearchHit] = Field(default_factory=list, description="Retrieved documents")
+    error: str | None = Field(default=None, description="Error message if the search failed")
+
+
+class BatchSearchResponse(BaseModel):
+    """Response schema for batched search, in request order."""
+
+    count: int = Field(..., ge=0, description="Number of queries")
+    failed: int = Field(default=0, ge=0, description="Number of queries that failed")
+    results: list[BatchSearchResult] = Field(default_factory=list, description="Per-query results")
@@ -1,6 +1,16 @@
+from app.services.ingest_job_queue import IngestJob, IngestJobQueue
+from app.services.ingest_service import IngestProgress, IngestService
 from app.services.query_service import QueryService
+from app.services.status_monitor import StatusMonitor
 
-__all__ = ["QueryService"]
+__all__ = [
+    "IngestJob",
+    "IngestJobQueue",
+    "IngestProgress",
+    "IngestService",
+    "QueryService",
+    "StatusMonitor",
+]
 
 
 
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.services.ingest_service import IngestProgress, IngestService
+
+
+@dataclass
+class IngestJob:
+    """State of one queued PDF ingestion."""
+
+    id: str
+    source: str
+    file_path: Path
+    replace: bool = False
+    status: str = "queued"
+    progress: IngestProgress = field(default_factory=IngestProgress)
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds spent running so far (or in total once finished)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def chunks_per_second(self) -> float:
+        """Chunk write throughput of the job."""
+        elapsed = self.elapsed
+        return self.progress.chunks_written / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        """Page extraction throughput of the job."""
+        elapsed = self.elapsed
+        return self.progress.pages_parsed / elapsed if elapsed > 0 else 0.0
+
+
+class IngestJobQueue:
+    """Bounded in-process queue that runs PDF ingestion jobs in background workers.
+
+    ``submit`` never waits: when the queue is full it raises ``asyncio.QueueFull``
+    so callers can push back on clients instead of accumulating uploads.
+    """
+
+    def __init__(
+        self,
+        ingest_service: IngestService,
+        max_size: int = 8,
+        workers: int = 1,
+        history_size: int = 1000,
+    ) -> None:
+        """
+        Initialize the job queue.
+
+        Args:
+            ingest_service: IngestService used to run each job
+            max_size: Maximum number of jobs waiting to run
+            workers: Number of jobs processed concurrently
+            history_size: Number of jobs kept for status lookups
+        """
+        self._logger = logging.getLogger(__name__)
+        self.ingest_service = ingest_service
+        self.max_size = max_size
+        self.workers = workers
+        self.history_size = history_size
+        self._queue: asyncio.Queue[IngestJob] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        self._jobs: OrderedDict[str, IngestJob] = OrderedDict()
+
+    def start(self) -> None:
+        """Start worker tasks on the running event loop."""
+        if self._tasks:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"ingest-worker-{idx}")
+            for idx in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel workers, discard files of jobs that never ran and refuse new jobs."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        while self._queue is not None and not self._queue.empty():
+            job = self._queue.get_nowait()
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            job.file_path.unlink(missing_ok=True)
+        # Without workers nothing would run new jobs, so stop accepting them
+        self._queue = None
+
+    def full(self) -> bool:
+        """Return True when no further jobs can be accepted."""
+        return self._queue is None or self._queue.full()
+
+    def submit(self, file_path: str | Path, source: str, replace: bool = False) -> IngestJob:
+        """
+        Enqueue a spooled PDF for ingestion.
+
+        The queue takes ownership of the file and deletes it once the job ends.
+
+        Args:
+            file_path: Path to PDF file on disk
+            source: Source name stored in chunk metadata
+            replace: Delete chunks of the previous version of the source afterwards
+
+        Returns:
+            The queued job
+
+        Raises:
+            asyncio.QueueFull: If the queue is full or not running
+        """
+        if self._queue is None:
+            raise asyncio.QueueFull
+
+        job = IngestJob(
+            id=uuid.uuid4().hex, source=source, file_path=Path(file_path), replace=replace
+        )
+        self._queue.put_nowait(job)
+        self._remember(job)
+        return job
+
+    def get(self, job_id: str) -> IngestJob | None:
+        """Return a job by id, if it is still in the history."""
+        return self._jobs.get(job_id)
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: IngestJob) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            await self.ingest_service.ingest_pdf(
+                job.file_path, job.source, progress=job.progress, replace=job.replace
+            )
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            # Worker stopped mid-job (shutdown); the job will not resume
+            job.status = "cancelled"
+            job.error = "Cancelled before completion"
+            raise
+        except Exception as exc:
+            # Any failure ends this job only; the worker moves on to the next one
+            self._logger.exception("Ingestion job %s (%s) failed", job.id, job.source)
+            job.status = "failed"
+            job.error = str(exc)
+        finally:
+            job.finished_at = time.time()
+            job.file_path.unlink(missing_ok=True)
+
+    def _remember(self, job: IngestJob) -> None:
+        self._jobs[job.id] = job
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+
+        # Forget the oldest finished jobs; queued and running ones stay visible
+        finished = [job_id for job_id, old in self._jobs.items() if old.finished_at is not None]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
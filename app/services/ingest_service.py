@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import queue
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.repositories.batch_writer import BatchWriteReport
+from app.repositories.ingest_manifest_repository import (
+    IngestManifestRepository,
+    file_sha256,
+)
+from app.repositories.weaviate_repository import WeaviateRepository, document_uuid
+from app.utils.cache import SemanticCache
+from app.utils.chunking import PageChunker, get_chunking_strategy
+from app.utils.pdf_parser import count_pdf_pages, extract_page_range
+
+
+@dataclass
+class IngestProgress:
+    """Running counters for one ingestion, updated as pages and batches complete."""
+
+    pages_parsed: int = 0
+    chunks_written: int = 0
+    chunks_skipped: int = 0
+    chunks_deleted: int = 0
+    failures: int = 0
+    retries: int = 0
+    write_seconds: float = 0.0
+    unchanged: bool = False
+
+    @property
+    def objects_per_second(self) -> float:
+        """Weaviate write throughput over the time spent writing."""
+        return self.chunks_written / self.write_seconds if self.write_seconds > 0 else 0.0
+
+    def add_report(self, report: BatchWriteReport) -> None:
+        """Fold a batch write report into the counters."""
+        self.chunks_written += report.objects
+        self.failures += report.failed
+        self.retries += report.retries
+        self.write_seconds += report.elapsed
+
+
+ChunkSink = Callable[[list[dict[str, Any]], "IngestProgress"], Awaitable[None]]
+
+
+class IngestService:
+    """Service for parsing PDFs off the event loop and indexing them in Weaviate."""
+
+    def __init__(
+        self,
+        weaviate_repo: WeaviateRepository,
+        batch_size: int = 100,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        chunk_strategy: str = "fixed",
+        workers: int = 0,
+        pages_per_task: int = 16,
+        manifest: IngestManifestRepository | None = None,
+        answer_cache: SemanticCache | None = None,
+    ) -> None:
+        """
+        Initialize ingest service.
+
+        Args:
+            weaviate_repo: WeaviateRepository instance
+            batch_size: Number of chunks sent to Weaviate per write
+            chunk_size: Size of each chunk (characters, or tokens for "tokens")
+            chunk_overlap: Overlap between chunks in the same unit
+            chunk_strategy: Chunking strategy name ("fixed", "sentence" or "tokens")
+            workers: Number of worker processes for text extraction
+                (0 extracts in the default thread pool instead)
+            pages_per_task: Number of pages extracted by one worker task
+            manifest: Optional manifest used to skip unchanged files and chunks
+            answer_cache: Optional answer cache cleared when documents change
+        """
+        if pages_per_task <= 0:
+            raise ValueError("pages_per_task must be positive")
+
+        self.weaviate_repo = weaviate_repo
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.chunk_strategy = chunk_strategy
+        # Validate chunking settings up front rather than on the first upload
+        get_chunking_strategy(chunk_strategy, chunk_size, chunk_overlap)
+        self.workers = workers
+        self.pages_per_task = pages_per_task
+        self.manifest = manifest
+        self.answer_cache = answer_cache
+        self._executor: Executor | None = None
+
+    async def ingest_pdf(
+        self,
+        file_path: str | Path,
+        source: str,
+        progress: IngestProgress | None = None,
+        replace: bool = False,
+    ) -> IngestProgress:
+        """
+        Parse a PDF file and add its chunks to Weaviate in batches.
+
+        With a manifest configured, a file whose content and chunking settings
+        match the last ingestion of the same source is skipped before parsing,
+        and chunks already stored for the source are not sent again. Chunk ids
+        depend on the chunk's position (see ``document_uuid``), so after an
+        edit only the chunks before it are skipped.
+
+        Args:
+            file_path: Path to PDF file on disk
+            source: Source name stored in chunk metadata
+            progress: Optional counters updated while ingestion runs
+            replace: Delete chunks of the previous version of the source that the
+                new version no longer contains, after the new chunks are written,
+                even when the manifest has no record of them (they are looked up
+                in Weaviate). Chunks recorded in the manifest are always replaced.
+
+        Returns:
+            Final ingestion counters
+        """
+        progress = progress or IngestProgress()
+        try:
+            finalize = await self._ingest_file(file_path, source, progress, self._write, replace)
+            # Files with failed chunks keep their old version and are not recorded,
+            # so the next upload retries them
+            if finalize is not None and not progress.failures:
+                progress.chunks_deleted += await asyncio.to_thread(finalize)
+        finally:
+            self._documents_changed(progress)
+        return progress
+
+    async def ingest_many(
+        self,
+        files: list[tuple[str | Path, str]],
+        replace: bool = False,
+    ) -> list[IngestProgress | Exception]:
+        """
+        Parse several PDF files concurrently and write all chunks through one batch.
+
+        Chunks from every file are streamed through a bounded queue into a single
+        long-lived Weaviate batch running in a worker thread, instead of opening
+        a batch per file. A failing file does not stop the others.
+
+        Args:
+            files: (path on disk, source name) pairs
+            replace: Delete stale chunks of previous versions once all writes finish
+
+        Returns:
+            Per-file counters, or the exception that file failed with, in input order
+
+        Raises:
+            ValueError: If two files have the same source name; progress, batch
+                failures and manifest records are tracked per source
+        """
+        duplicates = duplicate_sources(source for _, source in files)
+        if duplicates:
+            raise ValueError(f"Duplicate source names: {', '.join(duplicates)}")
+
+        stream: queue.Queue[list[dict[str, Any]] | None] = queue.Queue(maxsize=4)
+        writer = asyncio.ensure_future(
+            asyncio.to_thread(self.weaviate_repo.add_document_stream, _drain(stream))
+        )
+        file_slots = asyncio.Semaphore(max(self.workers, 1))
+
+        queued: dict[str, int] = {}
+
+        async def enqueue(documents: list[dict[str, Any]], progress: IngestProgress) -> None:
+            await _put(stream, documents, writer)
+            source = documents[0]["metadata"]["source"]
+            queued[source] = queued.get(source, 0) + len(documents)
+
+        async def ingest_one(file_path: str | Path, source: str) -> IngestProgress:
+            async with file_slots:
+                progress = IngestProgress()
+                finalize = await self._ingest_file(file_path, source, progress, enqueue, replace)
+                finalizers[source] = (progress, finalize)
+                return progress
+
+        finalizers: dict[str, tuple[IngestProgress, Callable[[], int] | None]] = {}
+        try:
+            results = await asyncio.gather(
+                *(ingest_one(file_path, source) for file_path, source in files),
+                return_exceptions=True,
+            )
+        finally:
+            if not writer.done():
+                await _put(stream, None, writer)
+        report = await writer
+
+        # Attribute the shared batch outcome to files, and only finalize files
+        # whose chunks were all written
+        for source, (progress, finalize) in finalizers.items():
+            failed = report.failed_by_source.get(source, 0)
+            progress.chunks_written = queued.get(source, 0) - failed
+            progress.failures += failed
+            progress.write_seconds = report.elapsed
+            if finalize is not None and not failed:
+                progress.chunks_deleted += await asyncio.to_thread(finalize)
+            self._documents_changed(progress)
+
+        return [
+            result if isinstance(result, (IngestProgress, Exception)) else Exception(str(result))
+            for result in results
+        ]
+
+    async def _ingest_file(
+        self,
+        file_path: str | Path,
+        source: str,
+        progress: IngestProgress,
+        write: ChunkSink,
+        replace: bool = False,
+    ) -> Callable[[], int] | None:
+        """
+        Parse one PDF file and hand its new chunks to ``write`` in batches.
+
+        Returns:
+            A callable to run once the written chunks are durable: it deletes
+            chunks of the previous version that are no longer produced (those
+            in the manifest, or those in Weaviate when replacing), records the
+            file in the manifest and returns the number of deleted chunks. None
+            if there is nothing left to do.
+        """
+        # Offline writes are dropped, so they must not be recorded as ingested
+        manifest = self.manifest if self.weaviate_repo.is_online else None
+        file_hash = ""
+        known_ids: set[str] = set()
+
+        if manifest is not None:
+            file_hash = await asyncio.to_thread(file_sha256, file_path)
+            if await asyncio.to_thread(manifest.is_unchanged, source, file_hash, self.chunking):
+                progress.unchanged = True
+                return None
+            known_ids = await asyncio.to_thread(manifest.chunk_ids, source)
+
+        chunker = PageChunker(
+            source=source,
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            strategy=self.chunk_strategy,
+        )
+        chunk_ids: list[str] = []
+        batch: list[dict[str, Any]] = []
+
+        def collect(chunks: list[dict[str, Any]]) -> None:
+            for chunk in chunks:
+                chunk_id = document_uuid(chunk)
+                chunk_ids.append(chunk_id)
+                if chunk_id in known_ids:
+                    progress.chunks_skipped += 1
+                else:
+                    batch.append(chunk)
+
+        def chunk_pages(pages: list[tuple[int, str]]) -> None:
+            for page_num, text in pages:
+                collect(chunker.feed(page_num, text))
+
+        async for pages in self.iter_page_batches(file_path):
+            # Chunking and id hashing are CPU-bound too, so they run in a worker thread
+            await asyncio.to_thread(chunk_pages, pages)
+            progress.pages_parsed += len(pages)
+            while len(batch) >= self.batch_size:
+                await write(batch[:self.batch_size], progress)
+                del batch[:self.batch_size]
+
+        await asyncio.to_thread(lambda: collect(chunker.flush()))
+        while batch:
+            await write(batch[:self.batch_size], progress)
+            del batch[:self.batch_size]
+
+        if manifest is None and not replace:
+            return None
+
+        def finalize() -> int:
+            deleted = 0
+            # Chunks recorded for the previous version are always superseded: the
+            # manifest is about to forget them, so keeping them would orphan them.
+            # With replace, sources ingested before the manifest existed are
+            # looked up in Weaviate.
+            previous = known_ids
+            if replace and not previous:
+                previous = self.weaviate_repo.source_object_ids(source)
+            stale = previous - set(chunk_ids)
+            if stale:
+                deleted = self.weaviate_repo.delete_objects(stale)
+            if manifest is not None:
+                manifest.record(source, file_hash, self.chunking, chunk_ids)
+            return deleted
+
+        return finalize
+
+    async def delete_source(self, source: str) -> int:
+        """
+        Delete every chunk of a source from Weaviate and forget it in the manifest.
+
+        Args:
+            source: Source name stored in chunk metadata
+
+        Returns:
+            Number of deleted chunks
+        """
+        deleted = await asyncio.to_thread(self.weaviate_repo.delete_by_source, source)
+        if self.manifest is not None:
+            await asyncio.to_thread(self.manifest.forget, source)
+        if deleted:
+            self._documents_changed()
+        return deleted
+
+    @property
+    def chunking(self) -> str:
+        """Signature of the chunking settings, stored with each manifest entry."""
+        return get_chunking_strategy(
+            self.chunk_strategy, self.chunk_size, self.chunk_overlap
+        ).signature
+
+    async def iter_page_batches(
+        self, file_path: str | Path
+    ) -> AsyncIterator[list[tuple[int, str]]]:
+        """
+        Extract page texts in parallel and yield them in page order, one range at a time.
+
+        Page ranges of ``pages_per_task`` pages are submitted to the executor
+        ahead of consumption, but at most two per worker are in flight so
+        memory stays bounded.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        path = str(file_path)
+
+        page_count = await loop.run_in_executor(executor, count_pdf_pages, path)
+        ranges = iter(range(0, page_count, self.pages_per_task))
+        window = max(self.workers, 1) * 2
+        pending: deque[asyncio.Future[list[tuple[int, str]]]] = deque()
+
+        def submit_next() -> None:
+            start = next(ranges, None)
+            if start is not None:
+                pending.append(
+                    loop.run_in_executor(
+                        executor, extract_page_range, path, start, start + self.pages_per_task
+                    )
+                )
+
+        for _ in range(window):
+            submit_next()
+
+        try:
+            while pending:
+                pages = await pending.popleft()
+                submit_next()
+                if pages:
+                    yield pages
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Shut down the extraction worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _documents_changed(self, progress: IngestProgress | None = None) -> None:
+        """Clear cached answers once documents were written or deleted."""
+        if self.answer_cache is None:
+            return
+        if progress is None or progress.chunks_written or progress.chunks_deleted:
+            self.answer_cache.invalidate()
+
+    async def _write(self, documents: list[dict[str, Any]], progress: IngestProgress) -> None:
+        """Add a batch of documents to Weaviate without blocking the event loop."""
+        try:
+            report = await asyncio.to_thread(self.weaviate_repo.add_documents, documents)
+        except Exception:
+            progress.failures += len(documents)
+            raise
+
+        progress.add_report(report)
+
+    def _get_executor(self) -> Executor | None:
+        """Return the process pool, creating it on first use."""
+        if self.workers <= 0:
+            return None
+
+        if self._executor is None:
+            # Spawn rather than fork: the parent holds gRPC and event loop threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+
+def duplicate_sources(sources: Iterable[str]) -> list[str]:
+    """Return source names occurring more than once, in first-occurrence order."""
+    counts = Counter(sources)
+    return [source for source, count in counts.items() if count > 1]
+
+
+def _drain(stream: queue.Queue[list[dict[str, Any]] | None]) -> Iterator[dict[str, Any]]:
+    """Yield documents from queued batches until the ``None`` sentinel arrives."""
+    while (documents := stream.get()) is not None:
+        yield from documents
+
+
+async def _put(
+    stream: queue.Queue[list[dict[str, Any]] | None],
+    item: list[dict[str, Any]] | None,
+    writer: asyncio.Future[BatchWriteReport],
+) -> None:
+    """Put an item on the writer queue, failing fast if the writer has stopped."""
+    while True:
+        if writer.done():
+            writer.result()
+            raise RuntimeError("Batch writer stopped before all documents were written")
+        try:
+            await asyncio.to_thread(stream.put, item, True, 0.5)
+            return
+        except queue.Full:
+            continue
@@ -1,6 +1,19 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.ai.embeddings import Embedder
 from app.graphs.query_agent_graph import QueryAgentGraph
-from app.repositories.weaviate_repository import WeaviateRepository
+from app.repositories.async_weaviate_repository import AsyncWeaviateRepository
 from app.schemas.query_schema import QueryRequest, QueryResponse
+from app.utils.cache import SemanticCache, normalize_query
+from app.utils.singleflight import SingleFlight
+
+NO_ANSWER = "I couldn't generate a response."
 
 
 class QueryService:
@@ -9,17 +22,30 @@ class QueryService:
     def __init__(
         self,
         agent_graph: QueryAgentGraph,
-        weaviate_repo: WeaviateRepository,
+        weaviate_repo: AsyncWeaviateRepository,
+        answer_cache: SemanticCache | None = None,
+        embedder: Embedder | None = None,
+        coalesce: bool = True,
     ) -> None:
         """
         Initialize query service.
 
         Args:
             agent_graph: QueryAgentGraph instance
-            weaviate_repo: WeaviateRepository instance
+            weaviate_repo: AsyncWeaviateRepository instance
+            answer_cache: Optional cache of responses keyed on query embeddings
+            embedder: Embedder for answer cache keys (required with answer_cache)
+            coalesce: Share one execution between identical queries in flight
         """
+        if answer_cache is not None and embedder is None:
+            raise ValueError("An embedder is required for the answer cache")
+
+        self._logger = logging.getLogger(__name__)
         self.agent_graph = agent_graph
         self.weaviate_repo = weaviate_repo
+        self.answer_cache = answer_cache
+        self.embedder = embedder
+        self.inflight = SingleFlight() if coalesce else None
 
     async def query(self, payload: QueryRequest) -> QueryResponse:
         """
@@ -31,11 +57,108 @@ class QueryService:
         Returns:
             QueryResponse with answer and sources
         """
-        result = await self.agent_graph.run(payload.query)
+        if self.inflight is None:
+            return await self._query(payload)
+
+        # Concurrent identical queries wait for the first one and share its answer
+        options = payload.search_options
+        key = (normalize_query(payload.query), options.cache_key() if options is not None else None)
+        response = await self.inflight.do(key, lambda: self._query(payload))
+        return response.model_copy()
+
+    async def _query(self, payload: QueryRequest) -> QueryResponse:
+        """Answer a query from the answer cache or by running the agent graph."""
+        vector, cached, generation = await self._lookup(payload)
+        if cached is not None:
+            return cached
 
-        answer = result.get("response", "I couldn't generate a response.")
+        result = await self.agent_graph.run(payload.query, payload.search_options)
+
+        answer = result.get("response", NO_ANSWER)
         sources = result.get("sources", [])
 
-        return QueryResponse(answer=answer, sources=sources)
+        response = QueryResponse(
+            answer=answer,
+            sources=sources,
+            context_tokens=result.get("context_tokens"),
+            skipped_sources=result.get("skipped_sources", []),
+        )
+        self._store(vector, response, generation)
+        return response
+
+    async def stream(self, payload: QueryRequest) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """
+        Process a query, streaming events as the answer is generated.
+
+        A cached answer is sent as one "token" event.
+
+        Args:
+            payload: QueryRequest with user query
+
+        Yields:
+            (event, data) pairs: "sources", then "token" per text chunk, then "done"
+        """
+        vector, cached, generation = await self._lookup(payload)
+        if cached is not None:
+            yield "sources", {"sources": cached.sources, "context_tokens": cached.context_tokens}
+            yield "token", {"text": cached.answer}
+            yield "done", {
+                "sources": cached.sources,
+                "context_tokens": cached.context_tokens,
+                "answer_chars": len(cached.answer),
+                "cached": True,
+            }
+            return
+
+        parts: list[str] = []
+        async for event, data in self.agent_graph.stream(payload.query, payload.search_options):
+            if event == "token":
+                parts.append(data["text"])
+            elif event == "done":
+                self._store(
+                    vector,
+                    QueryResponse(
+                        answer="".join(parts),
+                        sources=data["sources"],
+                        context_tokens=data["context_tokens"],
+                        skipped_sources=data.get("skipped_sources", []),
+                    ),
+                    generation,
+                )
+            yield event, data
+
+    async def _lookup(
+        self, payload: QueryRequest
+    ) -> tuple[list[float] | None, QueryResponse | None, int]:
+        """
+        Look the query up in the answer cache.
+
+        Returns:
+            Query vector (None when not cacheable), cached response or None,
+            and the cache generation to pass to ``_store``
+        """
+        if self.answer_cache is None or self.embedder is None or payload.search_options is not None:
+            return None, None, 0
+
+        generation = self.answer_cache.generation
+        try:
+            vectors = await asyncio.to_thread(self.embedder.embed, [normalize_query(payload.query)])
+        except (httpx.HTTPError, SQLAlchemyError) as exc:
+            # The cache is an optimization; answer without it (the API or embedding cache failed)
+            self._logger.warning("Unable to embed query for the answer cache: %s", exc)
+            return None, None, generation
 
+        vector = vectors[0]
+        cached = self.answer_cache.get(vector)
+        if cached is None:
+            return vector, None, generation
+        self._logger.debug("Answer cache hit for %r", payload.query)
+        return vector, cached.model_copy(update={"cached": True}), generation
 
+    def _store(self, vector: list[float] | None, response: QueryResponse, generation: int) -> None:
+        """Cache a generated response unless it is empty, a fallback answer or missing a source."""
+        if self.answer_cache is None or vector is None:
+            return
+        if not response.answer.strip() or response.answer == NO_ANSWER or response.skipped_sources:
+            return
+        self.answer_cache.put(vector, response, generation)
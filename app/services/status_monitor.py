@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from app.repositories.async_weaviate_repository import AsyncWeaviateRepository
+from app.repositories.weaviate_repository import WEAVIATE_ERRORS
+
+
+class StatusMonitor:
+    """Collection status refreshed in the background and served from memory.
+
+    ``get_status`` on the repository reads the collection config and runs a
+    full count aggregation; polling it from dashboards and load balancer
+    probes puts that load on Weaviate for every request. The monitor runs it
+    every ``interval`` seconds instead and answers from the last snapshot,
+    reporting when it was taken. The ``online`` flag is always live, since it
+    comes from the repository's own health checks.
+    """
+
+    def __init__(self, repo: AsyncWeaviateRepository, interval: float = 30.0) -> None:
+        """
+        Initialize the monitor.
+
+        Args:
+            repo: Repository whose status is collected
+            interval: Seconds between refreshes (0 refreshes on every request)
+        """
+        self._logger = logging.getLogger(__name__)
+        self.repo = repo
+        self.interval = interval
+        self._snapshot: dict[str, Any] | None = None
+        self._refreshed_at: float | None = None
+        self._refresh_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the refresh task on the running event loop."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._refresh_loop(), name="weaviate-status")
+
+    async def stop(self) -> None:
+        """Cancel the refresh task."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def get(self, fresh: bool = False) -> dict[str, Any]:
+        """
+        Return the latest status snapshot.
+
+        Args:
+            fresh: Collect a new snapshot first instead of serving the cached one
+
+        Returns:
+            Status with ``refreshed_at`` (ISO timestamp) and ``age_seconds``
+        """
+        if fresh or self._snapshot is None or self.interval <= 0:
+            await self.refresh()
+
+        assert self._snapshot is not None and self._refreshed_at is not None
+        return {
+            **self._snapshot,
+            "online": self.repo.is_online,
+            "refreshed_at": datetime.fromtimestamp(self._refreshed_at, timezone.utc).isoformat(),
+            "age_seconds": round(time.time() - self._refreshed_at, 3),
+        }
+
+    async def refresh(self) -> None:
+        """Collect a new snapshot; concurrent callers share one collection."""
+        started = time.time()
+        async with self._refresh_lock:
+            if self._refreshed_at is not None and self._refreshed_at >= started:
+                # Another caller refreshed while this one waited for the lock
+                return
+            try:
+                snapshot = await self.repo.get_status()
+            except WEAVIATE_ERRORS as exc:
+                self._logger.warning("Unable to refresh Weaviate status: %s", exc)
+                snapshot = {**(self._snapshot or {}), "refresh_error": str(exc)}
+            self._snapshot = snapshot
+            self._refreshed_at = time.time()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
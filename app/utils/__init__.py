@@ -1,8 +1,51 @@
 """Utility functions for document processing."""
 
-from app.utils.pdf_parser import parse_pdf
+from app.utils.cache import SemanticCache, TTLCache, normalize_query
+from app.utils.chunking import (
+    ChunkingStrategy,
+    FixedSizeStrategy,
+    PageChunker,
+    SentenceStrategy,
+    TokenStrategy,
+    estimate_tokens,
+    get_chunking_strategy,
+    truncate_tokens,
+)
+from app.utils.context import PackedContext, pack_context
+from app.utils.diversity import diversify, merge_adjacent_chunks, mmr_select
+from app.utils.pdf_parser import (
+    count_pdf_pages,
+    extract_page_range,
+    iter_batches,
+    iter_pdf_chunks,
+    parse_pdf,
+)
+from app.utils.singleflight import SingleFlight
 
-__all__ = ["parse_pdf"]
+__all__ = [
+    "ChunkingStrategy",
+    "FixedSizeStrategy",
+    "PackedContext",
+    "PageChunker",
+    "SemanticCache",
+    "SentenceStrategy",
+    "SingleFlight",
+    "TTLCache",
+    "TokenStrategy",
+    "count_pdf_pages",
+    "diversify",
+    "estimate_tokens",
+    "extract_page_range",
+    "get_chunking_strategy",
+    "iter_batches",
+    "iter_pdf_chunks",
+    "merge_adjacent_chunks",
+    "mmr_select",
+    "normalize_query",
+    "pack_context",
+    "parse_pdf",
+    "truncate_tokens",
+]
 
 
 
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import numpy as np
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Normalize query text for cache keys: case-folded with collapsed whitespace."""
+    return _WHITESPACE_RE.sub(" ", text).strip().casefold()
+
+
+class TTLCache:
+    """Thread-safe in-memory cache with a size bound, per-entry TTL and LRU eviction.
+
+    ``invalidate`` drops every entry and bumps ``generation``. Callers that
+    compute a value outside the cache read the generation first and pass it to
+    ``put``, so a result computed before an invalidation is never stored after it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries before evicting the least recently used
+            ttl: Seconds an entry stays valid (0 disables expiry)
+            clock: Monotonic time source
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for a key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and entry[0] <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        """
+        Store a value, evicting the least recently used entries beyond the limit.
+
+        Args:
+            key: Cache key
+            value: Value to store (shared with callers, not copied)
+            generation: Generation read before computing the value; the value
+                is dropped if the cache was invalidated since
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Drop all entries and start a new generation."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        """Return size, generation and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SemanticCache:
+    """Cache of values keyed by embedding vectors, matched by cosine similarity.
+
+    Vectors are kept normalized in one preallocated float32 matrix, so a lookup
+    is a single matrix-vector product over all entries. A lookup hits when the
+    most similar live entry reaches ``threshold``. Entries expire after ``ttl``
+    seconds; when full, the least recently used entry is replaced.
+    ``invalidate`` and ``generation`` work as in ``TTLCache``.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.98,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum number of entries before evicting the least recently used
+            ttl: Seconds an entry stays valid (0 disables expiry)
+            clock: Monotonic time source
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if not -1.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be between -1 and 1")
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._vectors: np.ndarray | None = None
+        self._values: list[Any] = []
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._used = np.zeros(max_entries, dtype=np.float64)
+        self._lock = threading.Lock()
+
+    def get(self, vector: Any) -> Any | None:
+        """Return the value of the most similar live entry, or None below the threshold."""
+        query = self._normalize(vector)
+        with self._lock:
+            count = len(self._values)
+            if self._vectors is None or not count or query.shape[0] != self._vectors.shape[1]:
+                self.misses += 1
+                return None
+
+            now = self._clock()
+            similarity = self._vectors[:count] @ query
+            if self.ttl:
+                similarity[self._expires[:count] <= now] = -np.inf
+            best = int(np.argmax(similarity))
+            if similarity[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            self._used[best] = now
+            self.hits += 1
+            return self._values[best]
+
+    def put(self, vector: Any, value: Any, generation: int | None = None) -> None:
+        """
+        Store a value under a vector, replacing the least recently used entry when full.
+
+        Args:
+            vector: Embedding of the key
+            value: Value to store (shared with callers, not copied)
+            generation: Generation read before computing the value; the value
+                is dropped if the cache was invalidated since
+        """
+        entry = self._normalize(vector)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if self._vectors is None or self._vectors.shape[1] != entry.shape[0]:
+                self._vectors = np.zeros((self.max_entries, entry.shape[0]), dtype=np.float32)
+                self._values = []
+
+            now = self._clock()
+            count = len(self._values)
+            if count < self.max_entries:
+                row = count
+                self._values.append(value)
+            else:
+                # Expired entries have the oldest use time after this adjustment
+                used = np.where(self._expires <= now, -np.inf, self._used) if self.ttl else self._used
+                row = int(np.argmin(used))
+                self._values[row] = value
+                self.evictions += 1
+            self._vectors[row] = entry
+            self._expires[row] = now + self.ttl
+            self._used[row] = now
+
+    def invalidate(self) -> None:
+        """Drop all entries and start a new generation."""
+        with self._lock:
+            self._values = []
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def stats(self) -> dict[str, Any]:
+        """Return size, generation and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._values),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "ttl_seconds": self.ttl,
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    @staticmethod
+    def _normalize(vector: Any) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections import deque
+from typing import Any
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]?\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheaply estimate the number of LLM tokens in a text.
+
+    Counts words and punctuation marks, which tracks BPE token counts closely
+    enough for budgeting without loading a tokenizer.
+    """
+    return sum(1 for _ in _TOKEN_RE.finditer(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut a text after its first ``max_tokens`` tokens, as counted by ``estimate_tokens``."""
+    if max_tokens <= 0:
+        return ""
+    for count, match in enumerate(_TOKEN_RE.finditer(text), start=1):
+        if count == max_tokens:
+            return text[: match.end()]
+    return text
+
+
+class ChunkingStrategy(ABC):
+    """Decides where a chunk ends and where the next one starts.
+
+    Subclasses implement ``split``; the chunker hands them ``window`` characters
+    of text starting at the current chunk start (fewer only at the end of the
+    document) and they return ``(end, next_start)`` offsets into that text.
+    """
+
+    name = "base"
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200) -> None:
+        """
+        Initialize the strategy.
+
+        Args:
+            chunk_size: Maximum size of each chunk in the strategy's unit
+            chunk_overlap: Overlap between chunks in the strategy's unit
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be between 0 and chunk_size")
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    @property
+    def window(self) -> int:
+        """Number of characters the strategy needs to see to place one chunk."""
+        return self.chunk_size
+
+    @property
+    def signature(self) -> str:
+        """Identifier of the strategy and its settings."""
+        return f"{self.name}:{self.chunk_size}:{self.chunk_overlap}"
+
+    @abstractmethod
+    def split(self, text: str) -> tuple[int, int]:
+        """Return the (end, next start) offsets of the first chunk of ``text``."""
+
+
+class FixedSizeStrategy(ChunkingStrategy):
+    """Fixed-size character windows with a fixed character overlap."""
+
+    name = "fixed"
+
+    def split(self, text: str) -> tuple[int, int]:
+        end = min(self.chunk_size, len(text))
+        return end, max(end - self.chunk_overlap, 1)
+
+
+class SentenceStrategy(ChunkingStrategy):
+    """Character-bounded chunks that end on a paragraph or sentence boundary.
+
+    Falls back to the last whitespace, then to a hard cut, when no boundary
+    exists in the second half of the window. The overlap starts at a sentence
+    boundary where possible.
+    """
+
+    name = "sentence"
+
+    def split(self, text: str) -> tuple[int, int]:
+        end = min(self.chunk_size, len(text))
+        if end == len(text) and len(text) < self.chunk_size:
+            return end, end
+
+        floor = self.chunk_size // 2
+        paragraph = text.rfind("\n\n", floor, end)
+        if paragraph != -1:
+            end = paragraph + 2
+        else:
+            sentence_end = None
+            for match in _SENTENCE_END_RE.finditer(text, floor, end):
+                sentence_end = match.end()
+            if sentence_end is not None:
+                end = sentence_end
+            else:
+                space = max(text.rfind(" ", floor, end), text.rfind("\n", floor, end))
+                if space != -1:
+                    end = space + 1
+
+        next_start = max(end - self.chunk_overlap, 1)
+        match = _SENTENCE_END_RE.search(text, next_start, end)
+        if match is not None and match.end() < end:
+            next_start = match.end()
+        return end, next_start
+
+
+class TokenStrategy(ChunkingStrategy):
+    """Chunks bounded by estimated token count instead of characters.
+
+    ``chunk_size`` and ``chunk_overlap`` are measured in tokens as counted by
+    ``estimate_tokens``.
+    """
+
+    name = "tokens"
+    max_chars_per_token = 16
+
+    @property
+    def window(self) -> int:
+        return self.chunk_size * self.max_chars_per_token
+
+    def split(self, text: str) -> tuple[int, int]:
+        starts: list[int] = []
+        for match in _TOKEN_RE.finditer(text):
+            starts.append(match.start())
+            if len(starts) > self.chunk_size:
+                break
+
+        if len(starts) <= self.chunk_size:
+            # Fewer tokens than the budget: either the end of the document or
+            # a window of very long tokens, which is cut as-is
+            end = len(text)
+            keep = self.chunk_overlap if len(text) >= self.window else 0
+            next_start = starts[len(starts) - keep] if 0 < keep <= len(starts) else end
+            return end, max(next_start, 1)
+
+        end = starts[self.chunk_size]
+        return end, max(starts[self.chunk_size - self.chunk_overlap], 1)
+
+
+CHUNKING_STRATEGIES: dict[str, type[ChunkingStrategy]] = {
+    FixedSizeStrategy.name: FixedSizeStrategy,
+    SentenceStrategy.name: SentenceStrategy,
+    TokenStrategy.name: TokenStrategy,
+}
+
+
+def get_chunking_strategy(
+    name: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+) -> ChunkingStrategy:
+    """
+    Build a chunking strategy by name.
+
+    Args:
+        name: One of "fixed", "sentence" or "tokens"
+        chunk_size: Maximum size of each chunk in the strategy's unit
+        chunk_overlap: Overlap between chunks in the strategy's unit
+
+    Returns:
+        Configured chunking strategy
+    """
+    try:
+        strategy_cls = CHUNKING_STRATEGIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown chunking strategy {name!r}; expected one of {sorted(CHUNKING_STRATEGIES)}"
+        ) from None
+    return strategy_cls(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+class PageChunker:
+    """Incrementally split page texts into overlapping chunks with real page spans.
+
+    Pages are fed one at a time and kept as separate segments; chunks are cut
+    by the strategy as soon as enough text is buffered, and segments are dropped
+    once no future chunk can reach them, so memory stays bounded by a few pages.
+    A page-offset table maps each chunk's character span to the pages it covers
+    by binary search.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        strategy: str | ChunkingStrategy = "fixed",
+    ) -> None:
+        """
+        Initialize the chunker.
+
+        Args:
+            source: Source name stored in chunk metadata
+            chunk_size: Size of each chunk (ignored if a strategy instance is given)
+            chunk_overlap: Overlap between chunks (ignored if a strategy instance is given)
+            strategy: Strategy name or instance deciding chunk boundaries
+        """
+        if isinstance(strategy, str):
+            strategy = get_chunking_strategy(strategy, chunk_size, chunk_overlap)
+
+        self.source = source
+        self.strategy = strategy
+        self._segments: deque[tuple[int, str]] = deque()
+        self._page_offsets: list[int] = []
+        self._page_numbers: list[int] = []
+        self._start = 0
+        self._end = 0
+        self._chunk_index = 0
+
+    def feed(self, page_num: int, text: str) -> list[dict[str, Any]]:
+        """Add one page of text and return the chunks it completes."""
+        if text and text.strip():
+            segment = f"\n\n--- Page {page_num} ---\n\n{text}"
+            self._page_offsets.append(self._end)
+            self._page_numbers.append(page_num)
+            self._segments.append((self._end, segment))
+            self._end += len(segment)
+
+        chunks: list[dict[str, Any]] = []
+        window = self.strategy.window
+        while self._end - self._start > window:
+            self._emit(self._window(self._start, self._start + window), chunks)
+        return chunks
+
+    def flush(self) -> list[dict[str, Any]]:
+        """Return the chunks for whatever text remains after the last page."""
+        chunks: list[dict[str, Any]] = []
+        window = self.strategy.window
+        while self._start < self._end:
+            text_end = min(self._start + window, self._end)
+            text = self._window(self._start, text_end)
+            if self._emit(text, chunks) >= len(text) and text_end == self._end:
+                break
+
+        self._start = self._end
+        self._segments.clear()
+        return chunks
+
+    def page_span(self, start: int, end: int) -> tuple[int, int]:
+        """Return the first and last page covered by the character span [start, end)."""
+        first = bisect_right(self._page_offsets, start) - 1
+        last = bisect_right(self._page_offsets, max(end - 1, start)) - 1
+        return self._page_numbers[max(first, 0)], self._page_numbers[max(last, 0)]
+
+    def _emit(self, text: str, chunks: list[dict[str, Any]]) -> int:
+        """Cut one chunk from ``text`` (which starts at ``_start``) and advance."""
+        end, next_start = self.strategy.split(text)
+        raw = text[:end]
+        chunk_text = raw.strip()
+
+        if chunk_text:
+            span_start = self._start + len(raw) - len(raw.lstrip())
+            span_end = self._start + len(raw.rstrip())
+            page_start, page_end = self.page_span(span_start, span_end)
+            chunks.append({
+                "text": chunk_text,
+                "metadata": {
+                    "source": self.source,
+                    "chunk_index": str(self._chunk_index),
+                    "page_start": str(page_start),
+                    "page_end": str(page_end),
+                },
+            })
+            self._chunk_index += 1
+
+        self._start += next_start
+        while self._segments and self._segments[0][0] + len(self._segments[0][1]) <= self._start:
+            self._segments.popleft()
+        return end
+
+    def _window(self, start: int, end: int) -> str:
+        """Return buffered text for the global span [start, end)."""
+        parts: list[str] = []
+        for offset, segment in self._segments:
+            if offset >= end:
+                break
+            seg_end = offset + len(segment)
+            if seg_end <= start:
+                continue
+            parts.append(segment[max(start - offset, 0):min(end - offset, len(segment))])
+        return "".join(parts)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from app.utils.chunking import estimate_tokens, truncate_tokens
+
+CONTEXT_SEPARATOR = "\n\n"
+TRUNCATION_MARKER = " [...]"
+
+
+@dataclass
+class PackedContext:
+    """Context parts selected to fit a token budget."""
+
+    parts: list[str] = field(default_factory=list)
+    tokens: int = 0
+    dropped: int = 0
+    truncated: bool = False
+
+    @property
+    def text(self) -> str:
+        return CONTEXT_SEPARATOR.join(self.parts)
+
+
+def pack_context(
+    parts: Sequence[str],
+    max_tokens: int,
+    scores: Sequence[float | None] | None = None,
+    min_part_tokens: int = 32,
+) -> PackedContext:
+    """
+    Select context parts in relevance order until the token budget is spent.
+
+    Parts are taken whole while they fit. The first part that does not fit is
+    truncated to the remaining budget if at least ``min_part_tokens`` are
+    left; it and everything after it are otherwise dropped. Tokens are counted
+    with ``estimate_tokens``, so packing costs one regex pass per part.
+
+    Args:
+        parts: Context strings, in relevance order unless ``scores`` is given
+        max_tokens: Token budget for the packed context (0 or less disables the limit)
+        scores: Optional relevance score per part, higher first (None sorts last)
+        min_part_tokens: Smallest useful truncated part
+
+    Returns:
+        Packed parts with the number of tokens used and of parts dropped
+    """
+    order = list(range(len(parts)))
+    if scores is not None:
+        order.sort(key=lambda i: (scores[i] is None, -(scores[i] or 0.0)))
+
+    packed = PackedContext()
+    for position, index in enumerate(order):
+        part = parts[index]
+        tokens = estimate_tokens(part)
+        if max_tokens <= 0 or packed.tokens + tokens <= max_tokens:
+            packed.parts.append(part)
+            packed.tokens += tokens
+            continue
+
+        remaining = max_tokens - packed.tokens
+        if remaining >= min_part_tokens:
+            kept = truncate_tokens(part, remaining - estimate_tokens(TRUNCATION_MARKER))
+            packed.parts.append(kept + TRUNCATION_MARKER)
+            packed.tokens += estimate_tokens(packed.parts[-1])
+            packed.truncated = True
+            position += 1
+        packed.dropped = len(order) - position
+        break
+    return packed
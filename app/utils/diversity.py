@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+# Shorter shared text between consecutive chunks is taken as coincidence, not overlap
+MIN_MERGE_OVERLAP = 8
+
+
+def mmr_select(
+    relevance: np.ndarray,
+    vectors: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5,
+) -> list[int]:
+    """
+    Pick ``k`` candidates by maximal marginal relevance.
+
+    Each step takes the candidate maximizing
+    ``lambda_mult * relevance - (1 - lambda_mult) * max_similarity_to_selected``,
+    keeping the running maximum similarity as one vector so every step is a
+    single NumPy pass over the candidates.
+
+    Args:
+        relevance: Relevance of each candidate to the query, higher is better
+        vectors: Candidate embeddings, one row per candidate
+        k: Number of candidates to select
+        lambda_mult: 1 ranks by relevance only, 0 by diversity only
+
+    Returns:
+        Indices of the selected candidates in selection order
+    """
+    count = min(k, len(relevance))
+    if count <= 0:
+        return []
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    unit = vectors / np.where(norms > 0, norms, 1.0)
+    similarity = unit @ unit.T
+
+    relevance = np.asarray(relevance, dtype=np.float32)
+    first = int(np.argmax(relevance))
+    selected = [first]
+    chosen = np.zeros(len(relevance), dtype=bool)
+    chosen[first] = True
+    max_similarity = similarity[first].copy()
+    while len(selected) < count:
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[chosen] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        chosen[best] = True
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
+
+
+def merge_text(first: str, second: str) -> str:
+    """Join two consecutive chunks, dropping the text ``second`` repeats from ``first``'s end."""
+    for size in range(min(len(first), len(second)), MIN_MERGE_OVERLAP - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return f"{first}\n{second}"
+
+
+def merge_adjacent_chunks(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Merge results that are consecutive chunks of the same source into one span.
+
+    Runs of chunks with consecutive ``chunk_index`` values are joined with their
+    overlap removed and placed at the rank of their best member; the merged
+    metadata covers the whole span (``chunk_index`` to ``chunk_end``, first to
+    last page). Results without a source or chunk index are kept as they are.
+
+    Args:
+        results: Search results in ranking order
+
+    Returns:
+        Results with adjacent chunks merged, in ranking order
+    """
+    runs: dict[tuple[str, int], list[int]] = {}
+    positions: dict[tuple[str, int], int] = {}
+    for position, result in enumerate(results):
+        metadata = result.get("metadata", {})
+        try:
+            key = (str(metadata["source"]), int(metadata["chunk_index"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+        positions.setdefault(key, position)
+
+    # Group positions into runs of consecutive chunk indices per source
+    for source, index in sorted(positions):
+        previous = (source, index - 1)
+        if previous in runs:
+            runs[(source, index)] = runs.pop(previous) + [positions[(source, index)]]
+        else:
+            runs[(source, index)] = [positions[(source, index)]]
+
+    merged_into: dict[int, list[int]] = {}
+    for members in runs.values():
+        if len(members) > 1:
+            merged_into[min(members)] = members
+    absorbed = {position for members in merged_into.values() for position in members}
+
+    merged: list[dict[str, Any]] = []
+    for position, result in enumerate(results):
+        if position not in absorbed:
+            merged.append(result)
+        elif position in merged_into:
+            merged.append(_merge_run([results[member] for member in merged_into[position]]))
+    return merged
+
+
+def diversify(
+    results: list[dict[str, Any]],
+    k: int,
+    lambda_mult: float = 0.5,
+    merge_adjacent: bool = True,
+) -> list[dict[str, Any]]:
+    """
+    Reduce over-fetched search results to ``k`` diverse ones for the prompt.
+
+    Relevance is the min-max scaled search ``score`` (rank order when scores
+    are missing). Without vectors on every result, the top ``k`` are kept as
+    ranked. Vectors are dropped from the returned results.
+
+    Args:
+        results: Search results in ranking order, ideally with "vector" and "score"
+        k: Number of results to keep before merging
+        lambda_mult: Relevance/diversity trade-off for MMR
+        merge_adjacent: Merge consecutive chunks of the same source
+
+    Returns:
+        Selected results in ranking order
+    """
+    if len(results) > k and all(result.get("vector") is not None for result in results):
+        scores = [result.get("score") for result in results]
+        if all(score is not None for score in scores):
+            relevance = np.asarray(scores, dtype=np.float32)
+            spread = relevance.max() - relevance.min()
+            relevance = (relevance - relevance.min()) / spread if spread > 0 else np.ones_like(relevance)
+        else:
+            relevance = 1.0 - np.arange(len(results), dtype=np.float32) / len(results)
+        vectors = np.asarray([result["vector"] for result in results], dtype=np.float32)
+        results = [results[i] for i in sorted(mmr_select(relevance, vectors, k, lambda_mult))]
+    else:
+        results = results[:k]
+
+    results = [{key: value for key, value in result.items() if key != "vector"} for result in results]
+    return merge_adjacent_chunks(results) if merge_adjacent else results
+
+
+def _merge_run(run: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge results of consecutive chunks given in chunk order."""
+    run = sorted(run, key=lambda result: int(result["metadata"]["chunk_index"]))
+    text = run[0].get("text", "")
+    for result in run[1:]:
+        text = merge_text(text, result.get("text", ""))
+
+    metadata = dict(run[0]["metadata"])
+    metadata["chunk_end"] = run[-1]["metadata"]["chunk_index"]
+    if "page_end" in run[-1]["metadata"]:
+        metadata["page_end"] = run[-1]["metadata"]["page_end"]
+
+    merged = {**run[0], "text": text, "metadata": metadata}
+    scores = [result["score"] for result in run if result.get("score") is not None]
+    if scores:
+        merged["score"] = max(scores)
+    distances = [result["distance"] for result in run if result.get("distance") is not None]
+    if distances:
+        merged["distance"] = min(distances)
+    return merged
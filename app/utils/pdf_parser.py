@@ -1,67 +1,128 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 from pypdf import PdfReader
 
+from app.utils.chunking import ChunkingStrategy, PageChunker
 
-def parse_pdf(
+T = TypeVar("T")
+
+
+def iter_pdf_chunks(
     file_path: str | Path,
     chunk_size: int = 1000,
     chunk_overlap: int = 200,
-) -> list[dict[str, Any]]:
+    source: str | None = None,
+    strategy: str | ChunkingStrategy = "fixed",
+) -> Iterator[dict[str, Any]]:
     """
-    Parse PDF file and split into chunks.
+    Lazily parse a PDF file page by page and yield chunks as they complete.
 
     Args:
         file_path: Path to PDF file
         chunk_size: Size of each chunk in characters
         chunk_overlap: Overlap between chunks in characters
+        source: Source name for chunk metadata (defaults to the file name)
+        strategy: Chunking strategy name or instance
 
-    Returns:
-        List of document chunks with text and metadata
+    Yields:
+        Document chunks with text and metadata
     """
     reader = PdfReader(str(file_path))
-    chunks: list[dict[str, Any]] = []
+    chunker = PageChunker(
+        source=source or Path(file_path).name,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        strategy=strategy,
+    )
 
-    # Extract text from all pages
-    full_text = ""
     for page_num, page in enumerate(reader.pages, start=1):
-        text = page.extract_text()
-        if text.strip():
-            full_text += f"\n\n--- Page {page_num} ---\n\n{text}"
+        yield from chunker.feed(page_num, page.extract_text())
+
+    yield from chunker.flush()
+
+
+def count_pdf_pages(file_path: str | Path) -> int:
+    """Return the number of pages in a PDF file."""
+    return len(PdfReader(str(file_path)).pages)
 
-    if not full_text.strip():
-        return []
 
-    # Split into chunks with overlap
-    start = 0
-    chunk_index = 0
-    while start < len(full_text):
-        end = start + chunk_size
-        chunk_text = full_text[start:end].strip()
+def extract_page_range(
+    file_path: str | Path,
+    start: int,
+    stop: int,
+) -> list[tuple[int, str]]:
+    """
+    Extract text for a range of pages of a PDF file.
+
+    Kept at module level so it can be shipped to worker processes.
+
+    Args:
+        file_path: Path to PDF file
+        start: Zero-based index of the first page to extract
+        stop: Zero-based index one past the last page to extract
+
+    Returns:
+        List of (1-based page number, page text) tuples in page order
+    """
+    reader = PdfReader(str(file_path))
+    return [
+        (page_num, reader.pages[page_num - 1].extract_text())
+        for page_num in range(start + 1, min(stop, len(reader.pages)) + 1)
+    ]
+
 
-        if chunk_text:
-            # Estimate page number from position
-            estimated_page = (start // chunk_size) + 1
+def parse_pdf(
+    file_path: str | Path,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    strategy: str | ChunkingStrategy = "fixed",
+) -> list[dict[str, Any]]:
+    """
+    Parse PDF file and split into chunks.
 
-            chunks.append({
-                "text": chunk_text,
-                "metadata": {
-                    "source": Path(file_path).name,
-                    "chunk_index": str(chunk_index),
-                    "estimated_page": str(estimated_page),
-                },
-            })
-            chunk_index += 1
+    Args:
+        file_path: Path to PDF file
+        chunk_size: Size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+        strategy: Chunking strategy name or instance
 
-        # Move start position with overlap
-        start = end - chunk_overlap
-        if start >= len(full_text):
-            break
+    Returns:
+        List of document chunks with text and metadata
+    """
+    return list(
+        iter_pdf_chunks(
+            file_path,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            strategy=strategy,
+        )
+    )
 
-    return chunks
 
+def iter_batches(items: Iterable[T], batch_size: int) -> Iterator[list[T]]:
+    """
+    Group an iterable into lists of at most ``batch_size`` items.
 
+    Args:
+        items: Items to group
+        batch_size: Maximum number of items per batch
 
+    Yields:
+        Consecutive batches of items
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    batch: list[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
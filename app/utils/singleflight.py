@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call(Generic[T]):
+    task: asyncio.Task[T]
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task and get its result or exception. A
+    caller that is cancelled only stops waiting, and the work is cancelled
+    once no caller is left. Nothing is kept after the task finishes, so
+    this never serves stale results; pair it with a cache for that.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call[Any]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` unless a call with the same key is in flight, and return its result.
+
+        Args:
+            key: Identity of the call
+            fn: Coroutine function doing the work
+
+        Returns:
+            Result of the single execution shared by all concurrent callers
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                call.task.cancel()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict[str, int]:
+        """Return executions, coalesced calls and calls in flight."""
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+    def _forget(self, key: Hashable, call: _Call[Any]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -0,0 +1,49 @@
+"""Measure chunking throughput across document sizes and strategies.
+
+Run with ``python -m benchmarks.bench_chunking``. Time per MB should stay
+roughly constant as the document grows, i.e. chunking is linear in size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.utils.chunking import CHUNKING_STRATEGIES, PageChunker
+from benchmarks.synthetic import synthetic_pages
+
+
+def bench(pages: list[str], strategy: str, chunk_size: int, chunk_overlap: int) -> tuple[int, float]:
+    """Chunk the pages once and return (chunk count, seconds)."""
+    started = time.perf_counter()
+    chunker = PageChunker("bench.pdf", chunk_size, chunk_overlap, strategy=strategy)
+    count = 0
+    for page_num, text in enumerate(pages, start=1):
+        count += len(chunker.feed(page_num, text))
+    count += len(chunker.flush())
+    return count, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 400, 1600, 6400])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'strategy':<10}{'pages':>8}{'MB':>8}{'chunks':>9}{'seconds':>10}{'s/MB':>9}")
+    for strategy in CHUNKING_STRATEGIES:
+        size = args.chunk_size // 4 if strategy == "tokens" else args.chunk_size
+        overlap = args.chunk_overlap // 4 if strategy == "tokens" else args.chunk_overlap
+        for page_count in args.pages:
+            pages = synthetic_pages(page_count)
+            megabytes = sum(len(page) for page in pages) / 1_000_000
+            count, seconds = bench(pages, strategy, size, overlap)
+            print(
+                f"{strategy:<10}{page_count:>8}{megabytes:>8.2f}{count:>9}"
+                f"{seconds:>10.3f}{seconds / megabytes:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Measure PDF ingestion throughput, memory and event-loop blocking.
+
+Run with ``python -m benchmarks.bench_ingest``. Synthetic PDFs of several page
+counts and text densities go through ``parse_pdf`` and through the
+``/ingest/pdf`` route backed by an in-memory repository, so no Weaviate or
+network access is needed.
+
+For CI, save a baseline with ``--json baseline.json`` and later compare with
+``--baseline baseline.json``: the run exits with status 1 when throughput drops
+or peak memory grows by more than ``--tolerance``, or when the event loop is
+blocked longer than ``--max-blocked-ms`` during one upload.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.dependencies import get_app_settings, get_ingest_service
+from app.api.routes import ingest_routes
+from app.core.config import Settings
+from app.services.ingest_service import IngestService
+from app.utils.pdf_parser import parse_pdf
+from benchmarks.fakes import InMemoryWeaviateRepository
+from benchmarks.metrics import LoopMonitor, PeakRSS
+from benchmarks.synthetic import DENSITIES, synthetic_pdf
+
+MB = 1024 * 1024
+
+
+@dataclass
+class Result:
+    """Measurements of one benchmark case."""
+
+    stage: str
+    pages: int
+    density: str
+    chunks: int
+    seconds: float
+    peak_rss_mb: float
+    blocked_ms: float = 0.0
+    worst_stall_ms: float = 0.0
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}/{self.pages}/{self.density}"
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds > 0 else 0.0
+
+
+def bench_parse(path: Path, pages: int, density: str, settings: Settings) -> Result:
+    """Parse a PDF in-process with ``parse_pdf``."""
+    with PeakRSS() as rss:
+        started = time.perf_counter()
+        chunks = parse_pdf(
+            path,
+            chunk_size=settings.ingest_chunk_size,
+            chunk_overlap=settings.ingest_chunk_overlap,
+            strategy=settings.ingest_chunk_strategy,
+        )
+        seconds = time.perf_counter() - started
+    return Result("parse_pdf", pages, density, len(chunks), seconds, rss.growth / MB)
+
+
+async def bench_route(
+    client: httpx.AsyncClient,
+    repo: InMemoryWeaviateRepository,
+    path: Path,
+    pages: int,
+    density: str,
+) -> Result:
+    """Upload a PDF to ``/ingest/pdf`` while watching the event loop."""
+    repo.objects.clear()
+    with PeakRSS() as rss:
+        async with LoopMonitor() as monitor:
+            started = time.perf_counter()
+            with path.open("rb") as handle:
+                response = await client.post(
+                    "/ingest/pdf", files={"file": (path.name, handle, "application/pdf")}
+                )
+            seconds = time.perf_counter() - started
+    response.raise_for_status()
+    return Result(
+        "route",
+        pages,
+        density,
+        response.json()["count"],
+        seconds,
+        rss.growth / MB,
+        blocked_ms=monitor.result.total * 1000,
+        worst_stall_ms=monitor.result.worst * 1000,
+    )
+
+
+def build_app(service: IngestService, settings: Settings) -> FastAPI:
+    """Mount only the ingest routes, with the container dependencies overridden."""
+    app = FastAPI()
+    app.include_router(ingest_routes.router)
+    app.dependency_overrides[get_ingest_service] = lambda: service
+    app.dependency_overrides[get_app_settings] = lambda: settings
+    return app
+
+
+async def run(args: argparse.Namespace) -> list[Result]:
+    settings = Settings(ingest_workers=args.workers)
+    repo = InMemoryWeaviateRepository(write_latency=args.write_latency)
+    service = IngestService(
+        repo,  # type: ignore[arg-type]
+        batch_size=settings.ingest_batch_size,
+        chunk_size=settings.ingest_chunk_size,
+        chunk_overlap=settings.ingest_chunk_overlap,
+        chunk_strategy=settings.ingest_chunk_strategy,
+        workers=settings.ingest_workers,
+        pages_per_task=settings.ingest_pages_per_task,
+    )
+    transport = httpx.ASGITransport(app=build_app(service, settings))
+    results: list[Result] = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            warmup = Path(tmp_dir) / "warmup.pdf"
+            warmup.write_bytes(synthetic_pdf(2))
+            # Starts the worker processes so the first case does not pay for it
+            await bench_route(client, repo, warmup, 2, "normal")
+
+            for density in args.densities:
+                for pages in args.pages:
+                    path = Path(tmp_dir) / f"bench-{pages}-{density}.pdf"
+                    path.write_bytes(synthetic_pdf(pages, density))
+                    results.append(bench_parse(path, pages, density, settings))
+                    results.append(await bench_route(client, repo, path, pages, density))
+                    path.unlink()
+
+    service.close()
+    return results
+
+
+def find_regressions(
+    results: list[Result],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+    max_blocked_ms: float | None,
+) -> list[str]:
+    """Compare results with a baseline and absolute limits and describe failures."""
+    problems = []
+    for result in results:
+        if max_blocked_ms is not None and result.blocked_ms > max_blocked_ms:
+            problems.append(
+                f"{result.key}: event loop blocked {result.blocked_ms:.1f} ms"
+                f" (limit {max_blocked_ms:.1f} ms)"
+            )
+        base = baseline.get(result.key)
+        if base is None:
+            continue
+        if result.pages_per_second < base["pages_per_second"] * (1 - tolerance):
+            problems.append(
+                f"{result.key}: {result.pages_per_second:.1f} pages/s"
+                f" vs baseline {base['pages_per_second']:.1f}"
+            )
+        # Small absolute growth is noise from the allocator and GC timing
+        if result.peak_rss_mb > max(base["peak_rss_mb"] * (1 + tolerance), base["peak_rss_mb"] + 5):
+            problems.append(
+                f"{result.key}: peak RSS +{result.peak_rss_mb:.1f} MB"
+                f" vs baseline +{base['peak_rss_mb']:.1f} MB"
+            )
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--densities", nargs="+", choices=list(DENSITIES), default=list(DENSITIES))
+    parser.add_argument("--workers", type=int, default=2, help="Extraction worker processes")
+    parser.add_argument(
+        "--write-latency", type=float, default=0.0, help="Simulated seconds per Weaviate batch"
+    )
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--max-blocked-ms", type=float)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print(
+        f"{'stage':<11}{'pages':>7}{'density':>9}{'chunks':>8}{'seconds':>9}"
+        f"{'pages/s':>10}{'chunks/s':>10}{'RSS MB':>8}{'blocked ms':>12}{'stall ms':>10}"
+    )
+    for r in results:
+        print(
+            f"{r.stage:<11}{r.pages:>7}{r.density:>9}{r.chunks:>8}{r.seconds:>9.3f}"
+            f"{r.pages_per_second:>10.1f}{r.chunks_per_second:>10.1f}{r.peak_rss_mb:>8.1f}"
+            f"{r.blocked_ms:>12.1f}{r.worst_stall_ms:>10.1f}"
+        )
+
+    serialized = {
+        r.key: {
+            **asdict(r),
+            "pages_per_second": r.pages_per_second,
+            "chunks_per_second": r.chunks_per_second,
+        }
+        for r in results
+    }
+    if args.json:
+        args.json.write_text(json.dumps(serialized, indent=2))
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else {}
+    problems = find_regressions(results, baseline, args.tolerance, args.max_blocked_ms)
+    for problem in problems:
+        print(f"REGRESSION {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
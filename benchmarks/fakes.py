@@ -0,0 +1,97 @@
+"""In-memory stand-ins for external services used by offline benchmarks."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from app.repositories.batch_writer import BatchWriteReport
+from app.repositories.weaviate_repository import document_uuid
+
+
+class InMemoryWeaviateRepository:
+    """Dict-backed replacement for ``WeaviateRepository``.
+
+    Stores objects under the same deterministic ids and exposes the methods
+    the services call, so ingestion and retrieval can be measured without a
+    Weaviate server. ``write_latency`` adds a simulated round trip per
+    ``add_documents`` call.
+    """
+
+    is_online = True
+
+    def __init__(self, collection_name: str = "Documents", write_latency: float = 0.0) -> None:
+        self.collection_name = collection_name
+        self.write_latency = write_latency
+        self.objects: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add_documents(self, documents: list[dict[str, Any]]) -> BatchWriteReport:
+        return self.add_document_stream(documents)
+
+    def add_document_stream(self, documents: Iterable[dict[str, Any]]) -> BatchWriteReport:
+        started = time.perf_counter()
+        count = 0
+        for document in documents:
+            properties = {"text": document.get("text", ""), **document.get("metadata", {})}
+            with self._lock:
+                self.objects[document_uuid(document)] = properties
+            count += 1
+        if self.write_latency:
+            time.sleep(self.write_latency)
+        return BatchWriteReport(objects=count, elapsed=time.perf_counter() - started)
+
+    def search(self, query: str, limit: int = 5) -> list[dict[str, Any]]:
+        """Rank objects by the number of query terms they contain."""
+        terms = set(query.lower().split())
+        with self._lock:
+            items = list(self.objects.values())
+        scored = []
+        for properties in items:
+            score = len(terms & set(properties.get("text", "").lower().split()))
+            if score:
+                scored.append((score, properties))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [
+            {
+                "text": properties["text"],
+                "metadata": {k: v for k, v in properties.items() if k != "text"},
+                "distance": 1.0 / (1 + score),
+            }
+            for score, properties in scored[:limit]
+        ]
+
+    def source_object_ids(self, source: str) -> set[str]:
+        with self._lock:
+            return {key for key, props in self.objects.items() if props.get("source") == source}
+
+    def delete_objects(self, ids: Iterable[str]) -> int:
+        with self._lock:
+            return sum(self.objects.pop(key, None) is not None for key in list(ids))
+
+    def delete_by_source(self, source: str) -> int:
+        return self.delete_objects(self.source_object_ids(source))
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "collection": self.collection_name,
+            "online": True,
+            "object_count": len(self.objects),
+        }
+
+    def list_objects(self, limit: int = 20) -> list[dict[str, Any]]:
+        with self._lock:
+            items = list(self.objects.items())[:limit]
+        return [
+            {
+                "id": key,
+                "text": properties["text"],
+                "metadata": {k: v for k, v in properties.items() if k != "text"},
+            }
+            for key, properties in items
+        ]
+
+    def close(self) -> None:
+        pass
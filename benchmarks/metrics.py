@@ -0,0 +1,112 @@
+"""Resource probes shared by the benchmarks: peak RSS and event-loop blocking."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import resource
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> int:
+    """Return the resident set size of this process in bytes.
+
+    Reads /proc on Linux; elsewhere falls back to the lifetime peak from getrusage.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakRSS:
+    """Context manager sampling RSS in a background thread and keeping the peak.
+
+    ``getrusage`` only reports the peak over the whole process lifetime, so
+    per-case peaks are sampled instead; ``peak - baseline`` is the growth
+    caused by the measured code.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> PeakRSS:
+        self.baseline = self.peak = current_rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+    @property
+    def growth(self) -> int:
+        """Peak RSS above the baseline, in bytes."""
+        return self.peak - self.baseline
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+
+@dataclass
+class LoopBlocking:
+    """Event-loop lag observed by a heartbeat task."""
+
+    total: float = 0.0
+    worst: float = 0.0
+    stalls: int = 0
+
+
+class LoopMonitor:
+    """Async context manager measuring how long the event loop was blocked.
+
+    A heartbeat task sleeps for ``interval`` in a loop; any extra delay before
+    it wakes up is time the loop spent running something that did not yield.
+    Lags below ``threshold`` are timer jitter and are ignored; longer ones are
+    counted as stalls and summed into ``total``.
+    """
+
+    def __init__(self, interval: float = 0.001, threshold: float = 0.002) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.result = LoopBlocking()
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> LoopMonitor:
+        self.result = LoopBlocking()
+        self._task = asyncio.create_task(self._beat())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        assert self._task is not None
+        # Let the heartbeat wake up once more, or a stall just before exit goes unseen
+        await asyncio.sleep(self.interval)
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _beat(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - started - self.interval
+            self.result.worst = max(self.result.worst, lag)
+            if lag > self.threshold:
+                self.result.total += lag
+                self.result.stalls += 1
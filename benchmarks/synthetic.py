@@ -0,0 +1,98 @@
+"""Synthetic documents for offline benchmarks."""
+
+from __future__ import annotations
+
+import random
+import textwrap
+
+WORDS = (
+    "the system stores vectors in a collection and retrieves chunks by hybrid "
+    "search while the agent routes questions between internal documents and the web"
+).split()
+
+# Approximate words per page for each text density
+DENSITIES = {"sparse": 80, "normal": 350, "dense": 900}
+
+
+def synthetic_pages(page_count: int, seed: int = 0) -> list[str]:
+    """Return pages of random prose with varying lengths and paragraph breaks."""
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(page_count):
+        sentences = []
+        for _ in range(rng.randint(10, 60)):
+            sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 25)))
+            sentences.append(sentence.capitalize() + rng.choice([". ", ". ", "? ", ".\n\n"]))
+        pages.append("".join(sentences))
+    return pages
+
+
+def synthetic_page_text(words_per_page: int, rng: random.Random) -> str:
+    """Return one page of random sentences with roughly ``words_per_page`` words."""
+    words: list[str] = []
+    while len(words) < words_per_page:
+        sentence = [rng.choice(WORDS) for _ in range(rng.randint(5, 25))]
+        sentence[0] = sentence[0].capitalize()
+        sentence[-1] += "."
+        words.extend(sentence)
+    return " ".join(words)
+
+
+def synthetic_pdf(page_count: int, density: str = "normal", seed: int = 0) -> bytes:
+    """
+    Build a text PDF with Helvetica pages of random prose.
+
+    Written by hand so benchmarks need no PDF authoring library; pypdf
+    extracts the text back line by line.
+
+    Args:
+        page_count: Number of pages
+        density: Key of ``DENSITIES`` selecting words per page
+        seed: Random seed, so runs are reproducible
+
+    Returns:
+        PDF file contents
+    """
+    rng = random.Random(seed)
+    words_per_page = DENSITIES[density]
+    font_ref = 3 + 2 * page_count
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        (
+            f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(page_count))}]"
+            f" /Count {page_count} >>"
+        ).encode(),
+    ]
+    for idx in range(page_count):
+        lines = textwrap.wrap(synthetic_page_text(words_per_page, rng), 110)
+        shown = " ".join(f"({_escape(line)}) '" for line in lines)
+        content = f"BT /F1 7 Tf 8 TL 36 770 Td {shown} ET".encode()
+        objects.append(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792]"
+                f" /Resources << /Font << /F1 {font_ref} 0 R >> >> /Contents {4 + 2 * idx} 0 R >>"
+            ).encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
@@ -0,0 +1,84 @@
+import json
+
+import httpx
+import pytest
+
+from app.ai.web_search import TavilySearchClient
+from app.utils.cache import TTLCache
+from tests.fakes import FakeTavilyAPI
+
+RESULTS = [
+    {
+        "title": "Hybrid search",
+        "url": "https://example.com/a",
+        "content": "BM25 and vectors",
+        "score": 0.9,
+    },
+    {"title": None, "url": "https://example.com/b", "content": "Second", "score": "0.4"},
+    {"url": "https://example.com/c", "content": "Third"},
+]
+
+
+@pytest.fixture
+def api() -> FakeTavilyAPI:
+    return FakeTavilyAPI(RESULTS)
+
+
+@pytest.fixture
+async def client(api):
+    client = TavilySearchClient(
+        api_key="tvly-test", max_results=2, cache=TTLCache(ttl=60), transport=api.transport()
+    )
+    yield client
+    await client.aclose()
+
+
+async def test_search_posts_the_query_and_parses_results(client, api):
+    results = await client.search("Hybrid search")
+
+    request = api.requests[0]
+    assert request.url == "https://api.tavily.com/search"
+    assert request.headers["Authorization"] == "Bearer tvly-test"
+    assert json.loads(request.content) == {"query": "Hybrid search", "max_results": 2}
+    assert [(result.title, result.score) for result in results] == [
+        ("Hybrid search", 0.9),
+        ("No title", 0.4),
+    ]
+    assert results[0].text.startswith("Title: Hybrid search\nURL: https://example.com/a\n")
+
+
+async def test_results_are_cached_per_normalized_query_and_count(client, api):
+    first = await client.search("Hybrid search")
+    again = await client.search("  hybrid   SEARCH ")
+    more = await client.search("hybrid search", max_results=3)
+
+    assert again == first
+    assert len(more) == 3
+    assert len(api.requests) == 2
+
+
+async def test_failed_requests_raise_and_are_not_cached(client, api):
+    api.status_code = 502
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.search("hybrid search")
+
+    api.status_code = 200
+    assert len(await client.search("hybrid search")) == 2
+    assert len(api.requests) == 2
+
+
+async def test_timeouts_surface_as_http_errors(client, api):
+    api.error = httpx.ReadTimeout("timed out")
+
+    with pytest.raises(httpx.HTTPError):
+        await client.search("hybrid search")
+
+
+async def test_without_a_cache_every_search_is_sent(api):
+    client = TavilySearchClient(api_key="tvly-test", transport=api.transport())
+
+    await client.search("hybrid search")
+    await client.search("hybrid search")
+    await client.aclose()
+
+    assert len(api.requests) == 2
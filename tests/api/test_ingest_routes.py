@@ -0,0 +1,272 @@
+import asyncio
+import io
+import tempfile
+import zipfile
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from weaviate.exceptions import WeaviateConnectionError
+
+from app.api.dependencies import get_app_settings, get_ingest_jobs, get_ingest_service
+from app.api.routes import ingest_routes
+from app.core.config import Settings
+from app.services.ingest_job_queue import IngestJobQueue
+from app.services.ingest_service import IngestProgress
+
+
+class RecordingIngestService:
+    """Ingest service stand-in recording which uploads it was given."""
+
+    def __init__(self) -> None:
+        self.ingested: list[tuple[bytes, str]] = []
+        self.rejected = False
+        self.stored: dict[str, int] = {}
+        self.delete_error: Exception | None = None
+
+    async def ingest_pdf(self, file_path, source, progress=None, replace=False):
+        with open(file_path, "rb") as spooled:
+            self.ingested.append((spooled.read(), source))
+        progress = progress or IngestProgress()
+        progress.pages_parsed += 1
+        if self.rejected:
+            # Every chunk rejected by Weaviate after two retries each
+            progress.failures += 3
+            progress.retries += 6
+        else:
+            progress.chunks_written += 3
+            self.stored[source] = 3
+        return progress
+
+    async def ingest_many(self, files, replace=False):
+        return [await self.ingest_pdf(file_path, source) for file_path, source in files]
+
+    async def delete_source(self, source):
+        if self.delete_error is not None:
+            raise self.delete_error
+        return self.stored.pop(source, 0)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def service() -> RecordingIngestService:
+    return RecordingIngestService()
+
+
+@pytest.fixture
+def settings() -> Settings:
+    return Settings(_env_file=None, ingest_bulk_max_files=3, ingest_bulk_max_bytes=200_000)
+
+
+@pytest.fixture
+async def jobs(service):
+    jobs = IngestJobQueue(service, max_size=1)
+    jobs.start()
+    yield jobs
+    await jobs.stop()
+
+
+@pytest.fixture
+async def client(service, jobs, settings):
+    app = FastAPI()
+    app.include_router(ingest_routes.router)
+    app.dependency_overrides[get_ingest_service] = lambda: service
+    app.dependency_overrides[get_ingest_jobs] = lambda: jobs
+    app.dependency_overrides[get_app_settings] = lambda: settings
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def spool_dir(tmp_path, monkeypatch):
+    """Directory receiving the routes' temporary files."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+def pdf(name: str, data: bytes = b"%PDF-1.4 guide", field: str = "file") -> tuple:
+    return (field, (name, data, "application/pdf"))
+
+
+def archive(name: str, members: dict[str, bytes]) -> tuple:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zipped:
+        for member, data in members.items():
+            zipped.writestr(member, data)
+    return ("files", (name, buffer.getvalue(), "application/zip"))
+
+
+async def test_ingest_pdf_passes_the_spooled_upload(client, service, spool_dir):
+    response = await client.post("/ingest/pdf", files=[pdf("docs/guide.pdf")])
+
+    body = response.json()
+    assert (body["status"], body["count"], body["skipped"]) == ("success", 3, 0)
+    assert service.ingested == [(b"%PDF-1.4 guide", "guide.pdf")]
+    assert not list(spool_dir.iterdir())
+
+
+async def test_ingest_pdf_reports_failures_when_every_chunk_fails(client, service):
+    service.rejected = True
+
+    body = (await client.post("/ingest/pdf", files=[pdf("guide.pdf")])).json()
+
+    assert body["status"] == "error"
+    assert (body["count"], body["failed"], body["retries"]) == (0, 3, 6)
+
+
+async def test_ingest_pdf_rejects_other_file_types(client):
+    response = await client.post("/ingest/pdf", files=[("file", ("notes.txt", b"text", "text/plain"))])
+
+    assert response.status_code == 400
+
+
+async def test_bulk_ingests_pdfs_and_archive_members(client, service, spool_dir):
+    files = [
+        pdf("a.pdf", field="files"),
+        archive("more.zip", {"docs/b.pdf": b"%PDF-1.4 b", "notes.txt": b"skipped"}),
+    ]
+    response = await client.post("/ingest/bulk", files=files)
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["status"] == "success"
+    assert [result["source"] for result in body["files"]] == ["a.pdf", "docs/b.pdf"]
+    assert service.ingested == [(b"%PDF-1.4 guide", "a.pdf"), (b"%PDF-1.4 b", "docs/b.pdf")]
+    assert not list(spool_dir.iterdir())
+
+
+async def test_bulk_rejects_too_many_files(client, spool_dir):
+    files = [pdf(f"{i}.pdf", field="files") for i in range(4)]
+    response = await client.post("/ingest/bulk", files=files)
+
+    assert response.status_code == 400
+    assert not list(spool_dir.iterdir())
+
+
+async def test_bulk_rejects_too_many_archive_members(client, spool_dir):
+    members = {f"{i}.pdf": b"%PDF-1.4" for i in range(4)}
+    response = await client.post("/ingest/bulk", files=[archive("many.zip", members)])
+
+    assert response.status_code == 400
+    assert not list(spool_dir.iterdir())
+
+
+async def test_bulk_rejects_an_oversized_upload_while_spooling(client, spool_dir):
+    big = b"%PDF-1.4 " + b"0" * 300_000
+    response = await client.post("/ingest/bulk", files=[pdf("big.pdf", big, field="files")])
+
+    assert response.status_code == 413
+    assert not list(spool_dir.iterdir())
+
+
+async def test_bulk_rejects_an_archive_expanding_past_the_limit(client, spool_dir):
+    # Compresses to a few kilobytes but expands past the 200 kB limit
+    members = {"bomb.pdf": b"%PDF-1.4 " + b"0" * 300_000}
+    response = await client.post("/ingest/bulk", files=[archive("bomb.zip", members)])
+
+    assert response.status_code == 413
+    assert not list(spool_dir.iterdir())
+
+
+async def test_bulk_reports_files_whose_chunks_all_failed(client, service, spool_dir):
+    service.rejected = True
+
+    body = (await client.post("/ingest/bulk", files=[pdf("a.pdf", field="files")])).json()
+
+    assert body["status"] == "error"
+    assert body["files"][0]["failed"] == 3
+    assert body["files"][0]["error"] == "All 3 chunks failed to write"
+
+
+async def test_bulk_rejects_duplicate_source_names(client, service, spool_dir):
+    files = [pdf("a.pdf", field="files"), archive("more.zip", {"a.pdf": b"%PDF-1.4"})]
+    response = await client.post("/ingest/bulk", files=files)
+
+    assert response.status_code == 400
+    assert "a.pdf" in response.json()["detail"]
+    assert service.ingested == []
+    assert not list(spool_dir.iterdir())
+
+
+async def test_ingest_job_runs_in_the_background(client, service, spool_dir):
+    response = await client.post("/ingest/jobs", files=[pdf("guide.pdf")])
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(200):
+        body = (await client.get(f"/ingest/jobs/{job_id}")).json()
+        if body["status"] not in ("queued", "running"):
+            break
+        await asyncio.sleep(0.01)
+
+    assert body["status"] == "succeeded"
+    assert body["chunks_written"] == 3
+    assert service.ingested == [(b"%PDF-1.4 guide", "guide.pdf")]
+    assert not list(spool_dir.iterdir())
+
+
+async def test_ingest_job_is_rejected_when_the_queue_is_full(client, jobs, spool_dir):
+    await jobs.stop()
+
+    response = await client.post("/ingest/jobs", files=[pdf("guide.pdf")])
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "5"
+    assert not list(spool_dir.iterdir())
+
+
+async def test_unknown_ingest_job_is_not_found(client):
+    response = await client.get("/ingest/jobs/missing")
+
+    assert response.status_code == 404
+
+
+async def test_delete_source_reports_deleted_chunks(client, service):
+    await client.post("/ingest/pdf", files=[pdf("guide.pdf")])
+
+    deleted = (await client.delete("/ingest/sources/guide.pdf")).json()
+    again = (await client.delete("/ingest/sources/guide.pdf")).json()
+
+    assert deleted == {"status": "deleted", "source": "guide.pdf", "deleted": 3}
+    assert again == {"status": "not_found", "source": "guide.pdf", "deleted": 0}
+
+
+async def test_delete_source_fails_on_weaviate_errors(client, service):
+    service.delete_error = WeaviateConnectionError("connection refused")
+
+    response = await client.delete("/ingest/sources/guide.pdf")
+
+    assert response.status_code == 500
+    assert "connection refused" in response.json()["detail"]
+
+
+class BrokenUpload:
+    filename = "broken.pdf"
+
+    def __init__(self) -> None:
+        self.reads = 0
+
+    async def read(self, size: int) -> bytes:
+        self.reads += 1
+        if self.reads > 1:
+            raise OSError("connection reset")
+        return b"%PDF-1.4"
+
+
+async def test_spool_upload_removes_the_partial_file(spool_dir):
+    with pytest.raises(OSError):
+        await ingest_routes._spool_upload(BrokenUpload(), chunk_bytes=8)
+
+    assert not list(spool_dir.iterdir())
+
+
+async def test_spool_upload_stops_reading_at_the_limit(spool_dir):
+    upload = BrokenUpload()
+    with pytest.raises(ingest_routes.ArchiveLimitError):
+        await ingest_routes._spool_upload(upload, chunk_bytes=8, max_bytes=4)
+
+    assert upload.reads == 1
+    assert not list(spool_dir.iterdir())
@@ -0,0 +1,101 @@
+import httpx
+import orjson
+import pytest
+from fastapi import FastAPI
+
+from app.api.dependencies import get_query_service
+from app.api.routes import query_routes
+from app.graphs.query_agent_graph import QueryAgentGraph
+from app.services.query_service import QueryService
+from tests.fakes import (
+    FakeAsyncWeaviateClient,
+    FakeChatModel,
+    FakeCollections,
+    fake_async_repository,
+)
+
+
+@pytest.fixture
+async def repo():
+    collections = FakeCollections()
+    collections.collection().add(
+        "00000000-0000-0000-0000-000000000000",
+        text="Hybrid search combines BM25 and vectors.",
+        source="guide.pdf",
+        chunk_index="0",
+    )
+    repo = fake_async_repository(FakeAsyncWeaviateClient("a", collections=collections))
+    await repo.connect()
+    yield repo
+    await repo.close()
+
+
+@pytest.fixture
+def graph(repo) -> QueryAgentGraph:
+    graph = QueryAgentGraph(
+        anthropic_api_key="test", tavily_api_key=None, weaviate_repo=repo, mmr_candidates=None
+    )
+    # Content-block and empty chunks are streamed by Anthropic models too
+    graph.llm = FakeChatModel(
+        ["Hybrid search ", [{"type": "text", "text": "mixes"}], "", " both."]
+    )
+    return graph
+
+
+@pytest.fixture
+async def client(graph, repo):
+    service = QueryService(graph, repo)
+    app = FastAPI()
+    app.include_router(query_routes.router)
+    app.dependency_overrides[get_query_service] = lambda: service
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+def sse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), orjson.loads(data.removeprefix("data: "))))
+    return events
+
+
+async def test_stream_sends_sources_tokens_and_a_summary(client):
+    response = await client.post("/query/stream", json={"query": "What is hybrid search?"})
+
+    events = sse_events(response.text)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    name, sources = events[0]
+    assert name == "sources"
+    assert sources["sources"] == ["guide.pdf"] and sources["context_tokens"] > 0
+    assert [data["text"] for event, data in events if event == "token"] == [
+        "Hybrid search ",
+        "mixes",
+        " both.",
+    ]
+    name, summary = events[-1]
+    assert name == "done"
+    assert summary["answer_chars"] == len("Hybrid search mixes both.")
+    assert summary["sources"] == ["guide.pdf"]
+    assert summary["first_token_ms"] is not None
+
+
+async def test_stream_ends_with_an_error_event_when_generation_fails(client, graph):
+    graph.llm = FakeChatModel(["Hybrid "], error=RuntimeError("model overloaded"))
+
+    events = sse_events((await client.post("/query/stream", json={"query": "hybrid?"})).text)
+
+    assert [event for event, _ in events] == ["sources", "token", "error"]
+    assert events[-1][1] == {"detail": "model overloaded"}
+
+
+async def test_query_answers_in_one_response(client, graph):
+    graph.llm = FakeChatModel(["Hybrid search mixes both."])
+
+    body = (await client.post("/query", json={"query": "What is hybrid search?"})).json()
+
+    assert body["answer"] == "Hybrid search mixes both."
+    assert body["sources"] == ["guide.pdf"]
+    assert "Hybrid search combines BM25 and vectors." in graph.llm.prompts[0]
@@ -0,0 +1,142 @@
+import httpx
+import orjson
+import pytest
+from fastapi import FastAPI
+
+from app.api.dependencies import get_app_settings, get_async_weaviate_repository
+from app.api.routes import weaviate_routes
+from app.core.config import Settings
+from tests.fakes import FakeAsyncWeaviateClient, FakeCollections, fake_async_repository
+
+IDS = [f"00000000-0000-0000-0000-00000000000{idx}" for idx in range(5)]
+
+
+@pytest.fixture
+def cluster() -> FakeCollections:
+    collections = FakeCollections()
+    documents = collections.collection()
+    for idx, object_id in enumerate(IDS):
+        source = "guide.pdf" if idx % 2 == 0 else "notes.pdf"
+        documents.add(object_id, text=f"hybrid search chunk {idx}", source=source)
+    return collections
+
+
+@pytest.fixture
+def nodes(cluster) -> list[FakeAsyncWeaviateClient]:
+    return [FakeAsyncWeaviateClient(name, collections=cluster) for name in ("a", "b")]
+
+
+@pytest.fixture
+async def repo(nodes):
+    repo = fake_async_repository(*nodes, allow_fallback=True)
+    await repo.connect()
+    yield repo
+    await repo.close()
+
+
+@pytest.fixture
+async def client(repo):
+    app = FastAPI()
+    app.include_router(weaviate_routes.router)
+    app.dependency_overrides[get_async_weaviate_repository] = lambda: repo
+    app.dependency_overrides[get_app_settings] = lambda: Settings(_env_file=None)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+def ndjson_ids(body: bytes) -> list[str]:
+    return [orjson.loads(line)["id"] for line in body.splitlines()]
+
+
+async def test_export_streams_every_object_page_by_page(client, cluster):
+    response = await client.get("/weaviate/objects/export", params={"page_size": 2})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert ndjson_ids(response.content) == IDS
+    assert cluster.collection().fetches == 3
+
+
+async def test_export_fails_over_between_pages(nodes):
+    repo = fake_async_repository(*nodes, read_strategy="least_latency")
+    await repo.connect()
+    # Node a serves reads until it goes away
+    repo.pool.nodes[0].latency, repo.pool.nodes[1].latency = 0.001, 1.0
+    pages = repo.iter_object_pages(page_size=2)
+    first = await anext(pages)
+    nodes[0].reachable = False
+
+    rest = [entry["id"] async for page in pages for entry in page]
+
+    assert [entry["id"] for entry in first] + rest == IDS
+    assert not repo.pool.nodes[0].healthy
+    assert repo.pool.nodes[1].requests == 2
+    await repo.close()
+
+
+async def test_export_is_unavailable_while_offline(nodes):
+    for node in nodes:
+        node.reachable = False
+    repo = fake_async_repository(*nodes, allow_fallback=True)
+    await repo.connect()
+    app = FastAPI()
+    app.include_router(weaviate_routes.router)
+    app.dependency_overrides[get_async_weaviate_repository] = lambda: repo
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/weaviate/objects/export")
+
+    assert response.status_code == 503
+
+
+async def test_list_objects_follows_the_cursor(client):
+    first = (await client.get("/weaviate/objects", params={"limit": 3})).json()
+    second = (
+        await client.get("/weaviate/objects", params={"limit": 3, "after": first["next_after"]})
+    ).json()
+
+    assert [item["id"] for item in first["items"] + second["items"]] == IDS
+    assert first["next_after"] == IDS[2]
+    assert second["next_after"] is None
+
+
+async def test_batch_search_reports_failed_queries_separately(client, cluster):
+    cluster.collection().broken_queries.add("broken")
+
+    body = (
+        await client.post(
+            "/weaviate/search/batch", json={"queries": ["chunk 3", "broken", "chunk 3"]}
+        )
+    ).json()
+
+    assert body["count"] == 3 and body["failed"] == 1
+    assert body["results"][0] == body["results"][2]
+    assert body["results"][0]["results"][0]["text"] == "hybrid search chunk 3"
+    assert "broken" in body["results"][1]["error"]
+    # The repeated query is sent once
+    assert [search["query"] for search in cluster.collection().searches].count("chunk 3") == 1
+
+
+async def test_batch_search_applies_projection_and_filters(client, cluster):
+    options = {"return_properties": ["source"], "filters": {"source": "notes.pdf"}, "alpha": 0.3}
+
+    body = (
+        await client.post(
+            "/weaviate/search/batch", json={"queries": ["hybrid chunk"], "options": options}
+        )
+    ).json()
+
+    hits = body["results"][0]["results"]
+    search = cluster.collection().searches[0]
+    assert {hit["metadata"]["source"] for hit in hits} == {"notes.pdf"}
+    assert search["return_properties"] == ["text", "source"]
+    assert search["alpha"] == 0.3
+
+
+async def test_batch_search_rejects_invalid_options(client):
+    response = await client.post(
+        "/weaviate/search/batch", json={"queries": ["chunk"], "options": {"alpha": 2}}
+    )
+
+    assert response.status_code == 422
@@ -0,0 +1,81 @@
+import argparse
+import time
+
+from app.utils.pdf_parser import count_pdf_pages, extract_page_range
+from benchmarks.bench_ingest import Result, find_regressions, run
+from benchmarks.fakes import InMemoryWeaviateRepository
+from benchmarks.metrics import LoopMonitor
+from benchmarks.synthetic import synthetic_pdf
+
+
+def result(**overrides) -> Result:
+    values = {
+        "stage": "route",
+        "pages": 10,
+        "density": "normal",
+        "chunks": 40,
+        "seconds": 1.0,
+        "peak_rss_mb": 20.0,
+        "blocked_ms": 5.0,
+    }
+    return Result(**{**values, **overrides})
+
+
+BASELINE = {"route/10/normal": {"pages_per_second": 10.0, "peak_rss_mb": 20.0}}
+
+
+def test_synthetic_pdf_round_trips_through_the_parser(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(synthetic_pdf(3, density="sparse", seed=1))
+
+    pages = extract_page_range(str(path), 0, 3)
+
+    assert count_pdf_pages(str(path)) == 3
+    assert [page for page, _ in pages] == [1, 2, 3]
+    assert all(len(text.split()) >= 80 for _, text in pages)
+    assert synthetic_pdf(3, density="sparse", seed=1) == path.read_bytes()
+
+
+async def test_loop_monitor_measures_blocking_calls():
+    async with LoopMonitor() as monitor:
+        time.sleep(0.05)
+
+    assert monitor.result.stalls >= 1
+    assert monitor.result.total >= 0.04
+
+
+def test_results_within_tolerance_pass():
+    assert find_regressions([result(seconds=1.1, peak_rss_mb=22.0)], BASELINE, 0.25, 10.0) == []
+
+
+def test_regressions_are_described():
+    problems = find_regressions(
+        [result(seconds=2.0, peak_rss_mb=40.0, blocked_ms=50.0)], BASELINE, 0.25, 10.0
+    )
+
+    assert len(problems) == 3
+    assert problems[0].startswith("route/10/normal: event loop blocked 50.0 ms")
+
+
+def test_in_memory_repository_replaces_and_deletes_by_source():
+    repo = InMemoryWeaviateRepository()
+    documents = [
+        {"text": f"chunk {idx}", "metadata": {"source": source, "chunk_index": str(idx)}}
+        for idx, source in enumerate(["a.pdf", "a.pdf", "b.pdf"])
+    ]
+
+    report = repo.add_documents(documents)
+    repo.add_documents(documents[:1])
+
+    assert report.objects == 3 and len(repo.objects) == 3
+    assert repo.delete_by_source("a.pdf") == 2
+    assert [obj["metadata"]["source"] for obj in repo.list_objects()] == ["b.pdf"]
+
+
+async def test_benchmark_runs_every_case():
+    args = argparse.Namespace(pages=[2], densities=["sparse"], workers=0, write_latency=0.0)
+
+    results = await run(args)
+
+    assert [r.key for r in results] == ["parse_pdf/2/sparse", "route/2/sparse"]
+    assert results[0].chunks == results[1].chunks > 0
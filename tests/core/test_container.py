@@ -0,0 +1,53 @@
+import pytest
+
+from app.core.config import Settings
+from app.core.container import AppContainer
+
+
+def make_settings(tmp_path, **overrides) -> Settings:
+    return Settings(
+        _env_file=None,
+        anthropic_api_key="test-key",
+        vector_store_backend="embedded",
+        vector_store_path=str(tmp_path / "store"),
+        ingest_manifest_path=str(tmp_path / "manifest.db"),
+        embedding_cache_path=str(tmp_path / "embeddings.db"),
+        **overrides,
+    )
+
+
+def test_embedded_backend_owns_one_hashing_embedder(tmp_path):
+    container = AppContainer(make_settings(tmp_path))
+
+    assert container.embedder is None
+    assert container.embedders == [container.embedded_store.embedder]
+
+
+def test_answer_cache_reuses_the_client_side_embedder(tmp_path):
+    settings = make_settings(
+        tmp_path, embedding_backend="openai", openai_api_key="sk-test", answer_cache_enabled=True
+    )
+    container = AppContainer(settings)
+
+    assert container.embedders == [container.embedder]
+    assert container.query_service.embedder is container.embedder
+    assert container.embedded_store.embedder is container.embedder
+
+
+def test_answer_cache_refuses_the_hashing_embedder(tmp_path):
+    settings = make_settings(tmp_path, embedding_backend="hashing", answer_cache_enabled=True)
+
+    with pytest.raises(ValueError, match="semantic embedder"):
+        AppContainer(settings)
+
+
+def test_shared_embedder_is_not_closed_by_its_users(tmp_path):
+    settings = make_settings(tmp_path, embedding_backend="hashing")
+    container = AppContainer(settings)
+    closed = []
+    container.embedder.close = lambda: closed.append(True)
+
+    container.weaviate_repo.close()
+    container.ingest_service.close()
+
+    assert closed == []
@@ -0,0 +1,18 @@
+from fastapi import FastAPI
+
+from app.core.container import AppContainer
+from app.core.events import lifespan
+from tests.core.test_container import make_settings
+
+
+async def test_lifespan_closes_each_shared_embedder_once(tmp_path):
+    container = AppContainer(make_settings(tmp_path, embedding_backend="hashing"))
+    closed = []
+    container.embedder.close = lambda: closed.append(True)
+    app = FastAPI()
+    app.state.container = container
+
+    async with lifespan(app):
+        pass
+
+    assert closed == [True]
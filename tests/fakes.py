@@ -0,0 +1,367 @@
+"""In-memory stand-ins for Weaviate, Tavily and the chat model used by the tests."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+from weaviate.exceptions import WeaviateConnectionError, WeaviateQueryError
+
+from app.repositories.async_weaviate_repository import AsyncWeaviateRepository
+from app.repositories.weaviate_repository import WeaviateRepository
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def word_tokens(value: Any) -> set[str]:
+    """Tokens Weaviate's default ``word`` tokenization produces for a text value."""
+    return set(_WORD_RE.findall(str(value).lower()))
+
+
+def matches(
+    properties: dict[str, Any], object_id: str, where: Any, field_tokenized: set[str]
+) -> bool:
+    """Evaluate a single Weaviate filter the way the server does for these tests."""
+    if where is None:
+        return True
+    operator = where.operator.value
+    if where.target == "_id":
+        return object_id in {str(value) for value in where.value}
+    value = properties.get(where.target)
+    if operator == "Equal":
+        if where.target in field_tokenized or not isinstance(value, str):
+            return value == where.value
+        # Word-tokenized text matches when it contains every token of the filter value
+        return word_tokens(where.value) <= word_tokens(value)
+    if operator == "ContainsAny":
+        return value in where.value
+    raise NotImplementedError(operator)
+
+
+@dataclass
+class FakeObject:
+    uuid: str
+    properties: dict[str, Any]
+    vector: dict[str, list[float]] | None = None
+    metadata: Any = None
+
+
+@dataclass
+class FakeBatchError:
+    message: str
+    object_: Any
+
+
+class FakeBatch:
+    """Collects ``add_object`` calls; ``fail`` decides which objects the server rejects."""
+
+    def __init__(self, collection: FakeCollection) -> None:
+        self.collection = collection
+        self.failed_objects: list[FakeBatchError] = []
+        self.opened: list[str] = []
+
+    def dynamic(self) -> FakeBatch:
+        self.opened.append("dynamic")
+        return self
+
+    def fixed_size(self, batch_size: int, concurrent_requests: int) -> FakeBatch:
+        self.opened.append("fixed_size")
+        return self
+
+    def rate_limit(self, requests_per_minute: int) -> FakeBatch:
+        self.opened.append("rate_limit")
+        return self
+
+    def __enter__(self) -> FakeBatch:
+        self.failed_objects = []
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def add_object(self, properties: dict[str, Any], uuid: str, vector: Any = None) -> None:
+        if self.collection.fail(properties):
+            obj = SimpleNamespace(properties=properties, uuid=uuid, vector=vector)
+            self.failed_objects.append(FakeBatchError("rejected", obj))
+            return
+        self.collection.objects[uuid] = FakeObject(uuid, dict(properties))
+
+
+class FakeQuery:
+    def __init__(self, collection: FakeCollection) -> None:
+        self.collection = collection
+
+    def fetch_objects(
+        self,
+        limit: int = 20,
+        offset: int | None = None,
+        after: str | None = None,
+        filters: Any = None,
+        return_properties: list[str] | None = None,
+        include_vector: bool = False,
+    ) -> Any:
+        self.collection.fetches += 1
+        found = [
+            obj
+            for object_id, obj in sorted(self.collection.objects.items())
+            if matches(obj.properties, object_id, filters, self.collection.field_tokenized)
+            and (after is None or object_id > after)
+        ]
+        start = offset or 0
+        return SimpleNamespace(objects=found[start : start + limit])
+
+    def hybrid(
+        self,
+        query: str,
+        vector: Any = None,
+        limit: int = 10,
+        filters: Any = None,
+        return_properties: list[str] | None = None,
+        **arguments: Any,
+    ) -> Any:
+        """Rank objects sharing words with the query; records the call's arguments."""
+        self.collection.searches.append(
+            {
+                "query": query,
+                "filters": filters,
+                "return_properties": return_properties,
+                **arguments,
+            }
+        )
+        if query in self.collection.broken_queries:
+            raise WeaviateQueryError(f"search for {query!r} failed", "GRPC")
+        terms = word_tokens(query)
+        scored = sorted(
+            (
+                (len(terms & word_tokens(obj.properties.get("text", ""))), object_id, obj)
+                for object_id, obj in self.collection.objects.items()
+                if matches(obj.properties, object_id, filters, self.collection.field_tokenized)
+            ),
+            key=lambda item: (-item[0], item[1]),
+        )
+        return SimpleNamespace(
+            objects=[
+                FakeObject(
+                    object_id,
+                    {
+                        name: value
+                        for name, value in obj.properties.items()
+                        if return_properties is None or name in return_properties
+                    },
+                    metadata=SimpleNamespace(distance=1.0 / (1 + score), score=float(score)),
+                )
+                for score, object_id, obj in scored[:limit]
+                if score
+            ]
+        )
+
+
+class FakeData:
+    def __init__(self, collection: FakeCollection) -> None:
+        self.collection = collection
+
+    def delete_many(self, where: Any) -> Any:
+        doomed = [
+            object_id
+            for object_id, obj in self.collection.objects.items()
+            if matches(obj.properties, object_id, where, self.collection.field_tokenized)
+        ]
+        for object_id in doomed:
+            del self.collection.objects[object_id]
+        return SimpleNamespace(matches=len(doomed), successful=len(doomed), failed=0)
+
+
+class FakeCollection:
+    """One collection's objects, keyed by UUID."""
+
+    def __init__(self, name: str, field_tokenized: set[str] | None = None) -> None:
+        self.name = name
+        self.objects: dict[str, FakeObject] = {}
+        self.field_tokenized = field_tokenized or set()
+        self.fail: Callable[[dict[str, Any]], bool] = lambda properties: False
+        self.broken_queries: set[str] = set()
+        self.searches: list[dict[str, Any]] = []
+        self.fetches = 0
+        self.batch = FakeBatch(self)
+        self.query = FakeQuery(self)
+        self.data = FakeData(self)
+
+    def add(self, object_id: str, **properties: Any) -> None:
+        self.objects[object_id] = FakeObject(object_id, properties)
+
+
+@dataclass
+class FakeCollections:
+    existing: dict[str, FakeCollection] = field(default_factory=dict)
+    created: list[dict[str, Any]] = field(default_factory=list)
+
+    def exists(self, name: str) -> bool:
+        return name in self.existing
+
+    def get(self, name: str) -> FakeCollection:
+        return self.existing[name]
+
+    def collection(self, name: str = "Documents") -> FakeCollection:
+        """Return a collection, creating it as the repository would if missing."""
+        if name not in self.existing:
+            self.existing[name] = FakeCollection(name, {"source"})
+        return self.existing[name]
+
+    def create(self, **config: Any) -> None:
+        self.created.append(config)
+        field_tokenized = {
+            prop.name
+            for prop in config.get("properties", [])
+            if getattr(prop.tokenization, "value", None) == "field"
+        }
+        self.existing[config["name"]] = FakeCollection(config["name"], field_tokenized)
+
+
+class FakeWeaviateClient:
+    """Synchronous client exposing the ``collections`` API the repository uses."""
+
+    def __init__(self) -> None:
+        self.collections = FakeCollections()
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeWeaviateRepository(WeaviateRepository):
+    """``WeaviateRepository`` connected to a ``FakeWeaviateClient``."""
+
+    def _connect(self, url: str, auth: Any, grpc_port_override: int | None = None) -> Any:
+        return FakeWeaviateClient()
+
+
+class AsyncView:
+    """Awaitable mirror of a synchronous fake, failing while its node is unreachable."""
+
+    def __init__(self, target: Any, client: FakeAsyncWeaviateClient) -> None:
+        self._target = target
+        self._client = client
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if not callable(value):
+            return AsyncView(value, self._client)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            if not self._client.reachable:
+                raise WeaviateConnectionError(f"{self._client.name} is unreachable")
+            return value(*args, **kwargs)
+
+        return call
+
+
+class FakeAsyncCollections:
+    def __init__(self, collections: FakeCollections, client: FakeAsyncWeaviateClient) -> None:
+        self._collections = collections
+        self._client = client
+
+    def get(self, name: str) -> AsyncView:
+        return AsyncView(self._collections.collection(name), self._client)
+
+
+class FakeAsyncWeaviateClient:
+    """Async client of one pool node; ``reachable`` and ``ready`` simulate its health.
+
+    Nodes given the same ``collections`` serve the same data, like replicas.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        reachable: bool = True,
+        ready: bool = True,
+        collections: FakeCollections | None = None,
+    ) -> None:
+        self.name = name
+        self.reachable = reachable
+        self.ready = ready
+        self.connected = False
+        self.closed = False
+        self.collections = FakeAsyncCollections(collections or FakeCollections(), self)
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def connect(self) -> None:
+        if not self.reachable:
+            raise WeaviateConnectionError(f"{self.name} is unreachable")
+        self.connected = True
+
+    async def is_ready(self) -> bool:
+        if not self.reachable:
+            raise WeaviateConnectionError(f"{self.name} is unreachable")
+        return self.ready
+
+    async def close(self) -> None:
+        self.closed = True
+        self.connected = False
+
+
+def fake_async_repository(
+    *clients: FakeAsyncWeaviateClient, **options: Any
+) -> AsyncWeaviateRepository:
+    """``AsyncWeaviateRepository`` whose pool nodes are the given clients, not yet connected."""
+    repo = AsyncWeaviateRepository(
+        url=f"http://{clients[0].name}:8080",
+        replica_urls=[f"http://{client.name}:8080" for client in clients[1:]],
+        health_check_interval=0,
+        **options,
+    )
+    for node, client in zip(repo.pool.nodes, clients):
+        node.client = client
+    return repo
+
+
+class FakeTavilyAPI:
+    """``httpx.MockTransport`` handler answering Tavily ``/search`` requests.
+
+    Set ``status_code`` to fail requests or ``error`` to raise a transport error.
+    """
+
+    def __init__(self, results: list[dict[str, Any]] | None = None) -> None:
+        self.results = results or []
+        self.status_code = 200
+        self.error: httpx.HTTPError | None = None
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.error is not None:
+            raise self.error
+        body = json.loads(request.content)
+        return httpx.Response(
+            self.status_code, json={"results": self.results[: body["max_results"]]}
+        )
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self)
+
+
+class FakeChatModel:
+    """Chat model answering every prompt with ``chunks``, optionally failing mid-stream."""
+
+    def __init__(self, chunks: list[Any], error: Exception | None = None) -> None:
+        self.chunks = chunks
+        self.error = error
+        self.prompts: list[str] = []
+
+    async def ainvoke(self, prompt: str) -> Any:
+        self.prompts.append(prompt)
+        return SimpleNamespace(content="".join(str(chunk) for chunk in self.chunks))
+
+    async def astream(self, prompt: str) -> AsyncIterator[Any]:
+        self.prompts.append(prompt)
+        for chunk in self.chunks:
+            yield SimpleNamespace(content=chunk)
+        if self.error is not None:
+            raise self.error
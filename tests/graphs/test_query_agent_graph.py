@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+import pytest
+from weaviate.exceptions import WeaviateConnectionError
+
+from app.ai.web_search import TavilySearchClient
+from app.graphs.query_agent_graph import QueryAgentGraph
+from tests.fakes import FakeAsyncWeaviateClient, FakeTavilyAPI, fake_async_repository
+
+
+def make_graph(**options) -> QueryAgentGraph:
+    options.setdefault("tavily_api_key", "tvly-test")
+    return QueryAgentGraph(
+        anthropic_api_key="test",
+        weaviate_repo=fake_async_repository(FakeAsyncWeaviateClient("a")),
+        mmr_candidates=None,
+        fanout=True,
+        **options,
+    )
+
+
+def branch(*sources: str, delay: float = 0.0, error: Exception | None = None):
+    """Stand-in for a retrieval node returning one context part per source."""
+
+    async def node(state):
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        context = [f"from {source}" for source in sources]
+        return {**state, "context": context, "sources": list(sources)}
+
+    return node
+
+
+async def test_fanout_interleaves_knowledge_base_and_web_results():
+    graph = make_graph()
+    graph.retrieve_node = branch("guide.pdf", "notes.pdf", "faq.pdf")
+    graph.search_node = branch("https://example.com/0", "guide.pdf")
+
+    state = await graph.fanout_node({"query": "hybrid search"})
+
+    assert state["context"] == [
+        "from guide.pdf",
+        "from https://example.com/0",
+        "from notes.pdf",
+        "from guide.pdf",
+        "from faq.pdf",
+    ]
+    assert state["sources"] == ["guide.pdf", "notes.pdf", "faq.pdf", "https://example.com/0"]
+    assert state["context_scores"] is None
+    assert state["skipped_sources"] == []
+
+
+async def test_fanout_drops_a_branch_that_misses_its_deadline():
+    graph = make_graph(weaviate_timeout=0.05, tavily_timeout=1.0)
+    graph.retrieve_node = branch("guide.pdf", delay=10)
+    graph.search_node = branch("https://example.com/0")
+
+    started = time.perf_counter()
+    state = await graph.fanout_node({"query": "hybrid search"})
+
+    assert time.perf_counter() - started < 1
+    assert state["skipped_sources"] == ["weaviate"]
+    assert state["sources"] == ["https://example.com/0"]
+
+
+async def test_fanout_drops_a_stalled_web_search():
+    graph = make_graph(tavily_timeout=0.05)
+    graph.retrieve_node = branch("guide.pdf")
+    graph.search_node = branch("https://example.com/0", delay=10)
+
+    state = await graph.fanout_node({"query": "hybrid search"})
+
+    assert state["skipped_sources"] == ["tavily"]
+    assert state["sources"] == ["guide.pdf"]
+
+
+async def test_fanout_drops_a_failing_branch():
+    graph = make_graph()
+    graph.retrieve_node = branch(error=WeaviateConnectionError("no healthy node"))
+    graph.search_node = branch("https://example.com/0")
+
+    state = await graph.fanout_node({"query": "hybrid search"})
+
+    assert state["skipped_sources"] == ["weaviate"]
+    assert state["context"] == ["from https://example.com/0"]
+
+
+async def test_fanout_does_not_hide_programming_errors():
+    graph = make_graph()
+    graph.retrieve_node = branch(error=TypeError("bad argument"))
+    graph.search_node = branch("https://example.com/0")
+
+    with pytest.raises(TypeError):
+        await graph.fanout_node({"query": "hybrid search"})
+
+
+async def test_fanout_needs_web_search():
+    graph = make_graph(tavily_api_key=None)
+
+    assert not graph.fanout
+    assert graph.route_decision(graph.router_node({"query": "hybrid search"})) == "weaviate"
+
+
+@pytest.fixture
+def api() -> FakeTavilyAPI:
+    return FakeTavilyAPI(
+        [
+            {"title": "Web 0", "url": "https://example.com/0", "content": "first", "score": 0.8},
+            {"title": "Web 1", "url": "", "content": "second", "score": 0.3},
+        ]
+    )
+
+
+@pytest.fixture
+async def web_search(api):
+    client = TavilySearchClient(api_key="tvly-test", transport=api.transport())
+    yield client
+    await client.aclose()
+
+
+async def test_search_node_uses_the_shared_web_search_client(web_search):
+    graph = make_graph(tavily_api_key=None, web_search=web_search)
+
+    state = await graph.search_node({"query": "hybrid search"})
+
+    assert graph.fanout
+    assert state["context"][0] == "Title: Web 0\nURL: https://example.com/0\nContent: first\n"
+    assert state["context_scores"] == [0.8, 0.3]
+    assert state["sources"] == ["https://example.com/0"]
+
+
+async def test_search_node_skips_tavily_when_the_request_fails(web_search, api):
+    api.status_code = 502
+    graph = make_graph(web_search=web_search)
+
+    state = await graph.search_node({"query": "hybrid search"})
+
+    assert state["context"] == []
+    assert state["skipped_sources"] == ["tavily"]
@@ -0,0 +1,89 @@
+import pytest
+
+from app.repositories.batch_writer import (
+    MAX_REPORTED_ERRORS,
+    BatchObject,
+    BatchWriter,
+    BatchWriteReport,
+)
+from tests.fakes import FakeCollection
+
+
+def objects(count: int, source: str = "a.pdf") -> list[BatchObject]:
+    return [
+        BatchObject(properties={"text": f"chunk {idx}", "source": source}, uuid=f"{source}-{idx}")
+        for idx in range(count)
+    ]
+
+
+def fail_once(texts: set[str]):
+    """Reject each of the given texts on its first write only."""
+    seen: set[str] = set()
+
+    def fail(properties: dict) -> bool:
+        if properties["text"] in texts and properties["text"] not in seen:
+            seen.add(properties["text"])
+            return True
+        return False
+
+    return fail
+
+
+def test_transient_failures_are_retried():
+    collection = FakeCollection("Documents")
+    collection.fail = fail_once({"chunk 1", "chunk 3"})
+
+    report = BatchWriter(max_retries=2, retry_backoff=0.0).write(collection, objects(5))
+
+    assert (report.objects, report.failed, report.retries) == (5, 0, 2)
+    assert len(collection.objects) == 5
+
+
+def test_permanent_failures_are_reported_per_source():
+    collection = FakeCollection("Documents")
+    collection.fail = lambda properties: properties["source"] == "b.pdf"
+
+    report = BatchWriter(max_retries=3, retry_backoff=0.0).write(
+        collection, objects(4, "a.pdf") + objects(2, "b.pdf")
+    )
+
+    assert (report.objects, report.failed, report.retries) == (4, 2, 6)
+    assert report.errors == ["rejected", "rejected"]
+    assert report.failed_by_source == {"b.pdf": 2}
+
+
+def test_without_retries_failures_are_not_resent():
+    collection = FakeCollection("Documents")
+    collection.fail = fail_once({"chunk 0"})
+
+    report = BatchWriter(max_retries=0).write(collection, objects(3))
+
+    assert (report.objects, report.failed, report.retries) == (2, 1, 0)
+
+
+@pytest.mark.parametrize("mode", ["dynamic", "fixed_size", "rate_limit"])
+def test_mode_selects_the_batch_context(mode):
+    collection = FakeCollection("Documents")
+
+    BatchWriter(mode=mode).write(collection, objects(1))
+
+    assert collection.batch.opened == [mode]
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unknown batch mode"):
+        BatchWriter(mode="eager")
+
+
+def test_merge_adds_counters_and_caps_errors():
+    total = BatchWriteReport()
+    for _ in range(3):
+        part = BatchWriteReport(objects=2, failed=5, retries=1, elapsed=0.5)
+        part.errors = ["rejected"] * 5
+        part.failed_by_source.update({"a.pdf": 5})
+        total.merge(part)
+
+    assert (total.objects, total.failed, total.retries, total.elapsed) == (6, 15, 3, 1.5)
+    assert len(total.errors) == MAX_REPORTED_ERRORS
+    assert total.failed_by_source == {"a.pdf": 15}
+    assert total.objects_per_second == 4.0
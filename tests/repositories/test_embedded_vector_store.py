@@ -0,0 +1,173 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.ai.embeddings import HashingEmbedder
+from app.repositories.embedded_vector_store import EmbeddedVectorStore, autocut
+from app.repositories.weaviate_repository import SearchOptions
+from app.utils.cache import TTLCache
+
+
+def make_store(texts: list[str], **kwargs) -> EmbeddedVectorStore:
+    store = EmbeddedVectorStore(None, HashingEmbedder(dimensions=64), **kwargs)
+    store.add_documents(
+        [{"text": text, "metadata": {"source": f"doc{i}.pdf"}} for i, text in enumerate(texts)]
+    )
+    return store
+
+
+def test_autocut_cuts_at_the_first_jump():
+    scores = np.array([1.0, 0.95, 0.9, 0.3, 0.25, 0.2])
+
+    assert autocut(scores, 1) == 3
+
+
+def test_autocut_counts_several_jumps():
+    scores = np.array([1.0, 0.98, 0.6, 0.58, 0.2, 0.18])
+
+    assert autocut(scores, 1) == 2
+    assert autocut(scores, 2) == 4
+
+
+def test_autocut_keeps_everything_without_jumps():
+    assert autocut(np.array([1.0, 0.9, 0.7, 0.3]), 1) == 4
+    assert autocut(np.array([0.5, 0.5, 0.5]), 1) == 3
+    assert autocut(np.array([0.7]), 1) == 1
+    assert autocut(np.array([]), 1) == 0
+
+
+def test_bm25_scores_only_documents_containing_the_terms():
+    store = make_store(["apples and pears", "bananas", "apples apples apples"])
+    scores = store._bm25("apples", len(store))
+
+    assert scores[1] == 0
+    assert scores[2] > scores[0] > 0
+
+
+def test_bm25_weights_rare_terms_higher():
+    store = make_store(["common rare", "common", "common", "common"])
+    scores = store._bm25("rare", len(store))
+    common = store._bm25("common", len(store))
+
+    assert scores[0] > common[0]
+
+
+def test_bm25_forgets_deleted_documents():
+    store = make_store(["zebra stripes", "lion mane"])
+    store.delete_by_source("doc0.pdf")
+
+    assert "zebra" not in store._postings
+    assert not store._bm25("zebra", len(store._ids)).any()
+    assert store.search("zebra", options=SearchOptions(alpha=0.0))[0]["text"] == "lion mane"
+
+
+def test_keyword_search_ranks_the_matching_document_first():
+    store = make_store(["the quick brown fox", "a lazy dog sleeps", "weaviate hybrid search"])
+    results = store.search("hybrid", limit=3, options=SearchOptions(alpha=0.0))
+
+    assert results[0]["text"] == "weaviate hybrid search"
+    assert results[0]["metadata"] == {"source": "doc2.pdf"}
+
+
+def test_search_applies_filters_and_auto_limit():
+    store = make_store(["alpha beta", "alpha gamma", "delta", "epsilon", "zeta"])
+    options = SearchOptions(filters={"source": ["doc1.pdf", "doc2.pdf"]})
+    filtered = store.search("alpha", limit=5, options=options)
+
+    assert {result["metadata"]["source"] for result in filtered} <= {"doc1.pdf", "doc2.pdf"}
+
+    cut = store.search("alpha", limit=5, options=SearchOptions(alpha=0.0, auto_limit=1))
+    assert [result["text"] for result in cut] == ["alpha beta", "alpha gamma"]
+
+
+def test_readding_a_document_replaces_it():
+    store = make_store(["same text"])
+    store.add_documents([{"text": "same text", "metadata": {"source": "doc0.pdf"}}])
+
+    assert len(store) == 1
+    assert len(store.search("same text", limit=5)) == 1
+
+
+def test_writes_invalidate_the_search_cache():
+    cache = TTLCache()
+    store = make_store(["first document"], search_cache=cache)
+    assert len(store.search("document")) == 1
+
+    store.add_documents([{"text": "second document", "metadata": {"source": "x.pdf"}}])
+
+    assert len(store.search("document")) == 2
+
+
+def test_include_vector_returns_a_float32_copy():
+    store = make_store(["vector text"])
+    vector = store.search("vector", options=SearchOptions(include_vector=True))[0]["vector"]
+
+    assert vector.dtype == np.float32
+    vector[:] = 0
+    assert store._vectors[0].any()
+
+
+def test_alpha_must_be_in_range():
+    with pytest.raises(ValueError):
+        EmbeddedVectorStore(None, HashingEmbedder(), alpha=1.5)
+
+
+def test_replacing_a_document_reuses_its_row():
+    store = make_store(["same text"])
+    for _ in range(3):
+        store.add_documents([{"text": "same text", "metadata": {"source": "doc0.pdf"}}])
+
+    assert len(store._ids) == 1
+
+
+def test_deleted_rows_are_compacted_away(monkeypatch):
+    monkeypatch.setattr("app.repositories.embedded_vector_store.COMPACT_MIN_DEAD_ROWS", 4)
+    store = make_store([f"version one chunk {i}" for i in range(6)])
+    store.delete_by_source("doc0.pdf")
+    for i in range(1, 6):
+        store.delete_by_source(f"doc{i}.pdf")
+        store.add_documents([{"text": f"version two chunk {i}", "metadata": {"source": f"doc{i}"}}])
+
+    assert len(store) == 5
+    best = store.search("two chunk 3", options=SearchOptions(alpha=0.0))[0]
+    assert best["text"] == "version two chunk 3"
+    assert "one" not in store._postings
+    assert len(store._ids) - len(store) <= 4
+
+
+def test_list_objects_pages_through_every_object_in_id_order():
+    store = make_store([f"document {i}" for i in range(25)])
+    ids, after = [], None
+    while page := store.list_objects(limit=10, after=after):
+        ids.extend(entry["id"] for entry in page)
+        after = page[-1]["id"]
+
+    assert ids == sorted(store._rows)
+
+
+def test_list_objects_sees_writes_between_pages():
+    store = make_store(["first"])
+    store.list_objects()
+    store.add_documents([{"text": "second", "metadata": {"source": "x.pdf"}}])
+    store.delete_by_source("doc0.pdf")
+
+    assert [entry["text"] for entry in store.list_objects()] == ["second"]
+
+
+def test_concurrent_writers_leave_a_consistent_store(tmp_path):
+    store = EmbeddedVectorStore(tmp_path, HashingEmbedder(dimensions=16), flush_interval=0)
+
+    def write(worker: int) -> None:
+        for i in range(20):
+            store.add_documents([{"text": f"worker {worker} doc {i}", "metadata": {"source": "s"}}])
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reloaded = EmbeddedVectorStore(tmp_path, HashingEmbedder(dimensions=16))
+    assert len(reloaded) == 80
+    assert not list(tmp_path.glob("*.tmp.*"))
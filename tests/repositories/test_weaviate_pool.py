@@ -0,0 +1,118 @@
+import pytest
+from weaviate.exceptions import WeaviateConnectionError, WeaviateQueryError
+
+from app.repositories.weaviate_pool import WeaviatePool
+from tests.fakes import FakeAsyncWeaviateClient
+
+
+def make_pool(*clients: FakeAsyncWeaviateClient, strategy: str = "round_robin") -> WeaviatePool:
+    pool = WeaviatePool(
+        [f"http://{client.name}:8080" for client in clients],
+        strategy=strategy,
+        health_check_interval=0,
+    )
+    for node, client in zip(pool.nodes, clients):
+        node.client = client
+    return pool
+
+
+async def serving_node(client: FakeAsyncWeaviateClient) -> str:
+    if not client.reachable:
+        raise WeaviateConnectionError(f"{client.name} went away")
+    return client.name
+
+
+async def test_connect_marks_unreachable_nodes_down():
+    pool = make_pool(FakeAsyncWeaviateClient("a", reachable=False), FakeAsyncWeaviateClient("b"))
+
+    assert await pool.connect() == 1
+    assert [node.healthy for node in pool.nodes] == [False, True]
+    assert pool.primary is pool.nodes[1]
+    assert "unreachable" in pool.stats()[0]["last_error"]
+
+
+async def test_round_robin_alternates_between_healthy_nodes():
+    pool = make_pool(FakeAsyncWeaviateClient("a"), FakeAsyncWeaviateClient("b"))
+    await pool.connect()
+
+    served = [await pool.read(serving_node) for _ in range(4)]
+
+    assert sorted(served) == ["a", "a", "b", "b"]
+    assert served[0] != served[1]
+
+
+async def test_read_fails_over_to_the_next_node():
+    a, b = FakeAsyncWeaviateClient("a"), FakeAsyncWeaviateClient("b")
+    pool = make_pool(a, b)
+    await pool.connect()
+    a.reachable = False
+
+    served = [await pool.read(serving_node) for _ in range(3)]
+
+    assert served == ["b", "b", "b"]
+    assert not pool.nodes[0].healthy
+    assert pool.nodes[0].failures == 1
+
+
+async def test_read_without_healthy_nodes_raises():
+    a = FakeAsyncWeaviateClient("a")
+    pool = make_pool(a)
+    await pool.connect()
+    a.reachable = False
+
+    with pytest.raises(WeaviateConnectionError, match="No healthy Weaviate node"):
+        await pool.read(serving_node)
+
+
+async def test_query_errors_from_a_ready_node_are_not_retried():
+    pool = make_pool(FakeAsyncWeaviateClient("a"), FakeAsyncWeaviateClient("b"))
+    await pool.connect()
+    calls = []
+
+    async def bad_query(client):
+        calls.append(client.name)
+        raise WeaviateQueryError("no such property", "GRPC")
+
+    with pytest.raises(WeaviateQueryError):
+        await pool.read(bad_query)
+
+    assert len(calls) == 1
+    assert all(node.healthy for node in pool.nodes)
+
+
+async def test_least_latency_prefers_the_faster_node():
+    pool = make_pool(
+        FakeAsyncWeaviateClient("a"), FakeAsyncWeaviateClient("b"), strategy="least_latency"
+    )
+    await pool.connect()
+    pool.nodes[0].latency, pool.nodes[1].latency = 0.2, 0.05
+
+    assert {await pool.read(serving_node) for _ in range(3)} == {"b"}
+
+
+async def test_recovered_node_returns_after_a_health_check():
+    a = FakeAsyncWeaviateClient("a", reachable=False)
+    pool = make_pool(a)
+    await pool.connect()
+    a.reachable = True
+
+    await pool._check(pool.nodes[0])
+
+    assert pool.nodes[0].healthy
+    assert await pool.read(serving_node) == "a"
+
+
+async def test_close_disconnects_every_node():
+    clients = FakeAsyncWeaviateClient("a"), FakeAsyncWeaviateClient("b")
+    pool = make_pool(*clients)
+    await pool.connect()
+
+    await pool.close()
+
+    assert all(client.closed for client in clients)
+    assert pool.healthy_nodes == []
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError, match="Unknown read strategy"):
+        WeaviatePool(["http://a:8080"], strategy="random")
@@ -0,0 +1,66 @@
+import pytest
+
+from app.repositories.batch_writer import BatchWriter
+from app.repositories.weaviate_repository import WeaviateRepository, document_uuid
+from tests.fakes import FakeCollection, FakeWeaviateRepository
+
+
+def make_repo() -> WeaviateRepository:
+    return FakeWeaviateRepository(
+        url="http://weaviate:8080", batch_writer=BatchWriter(max_retries=1, retry_backoff=0.0)
+    )
+
+
+def chunk(source: str, text: str) -> dict:
+    return {"text": text, "metadata": {"source": source}}
+
+
+@pytest.fixture
+def legacy_repo() -> tuple[WeaviateRepository, FakeCollection]:
+    """A repository on a collection created before ``source`` had field tokenization."""
+    repo = make_repo()
+    collection = FakeCollection("Documents")
+    repo.client.collections.existing["Documents"] = collection
+    for index, source in enumerate(["report.pdf", "annual report.pdf", "q1-report.pdf", "other.pdf"]):
+        collection.add(f"00000000-0000-0000-0000-00000000000{index}", source=source, text=source)
+    return repo, collection
+
+
+def test_new_collections_declare_source_with_field_tokenization():
+    repo = make_repo()
+    repo.add_documents([chunk("report.pdf", "text")])
+
+    (config,) = repo.client.collections.created
+    source = next(prop for prop in config["properties"] if prop.name == "source")
+    assert source.tokenization.value == "field"
+
+
+def test_source_object_ids_ignores_sources_sharing_words(legacy_repo):
+    repo, _ = legacy_repo
+
+    assert repo.source_object_ids("report.pdf") == {"00000000-0000-0000-0000-000000000000"}
+
+
+def test_delete_by_source_keeps_sources_sharing_words(legacy_repo):
+    repo, collection = legacy_repo
+
+    assert repo.delete_by_source("report.pdf") == 1
+    assert sorted(obj.properties["source"] for obj in collection.objects.values()) == [
+        "annual report.pdf",
+        "other.pdf",
+        "q1-report.pdf",
+    ]
+
+
+def test_delete_by_source_on_a_field_tokenized_collection():
+    repo = make_repo()
+    repo.add_documents(
+        [chunk("report.pdf", "one"), chunk("report.pdf", "two"), chunk("annual report.pdf", "x")]
+    )
+
+    assert repo.delete_by_source("report.pdf") == 2
+    assert repo.source_object_ids("annual report.pdf") == {document_uuid(chunk("annual report.pdf", "x"))}
+
+
+def test_delete_by_source_of_a_missing_collection_deletes_nothing():
+    assert make_repo().delete_by_source("report.pdf") == 0
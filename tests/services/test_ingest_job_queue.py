@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from app.services.ingest_job_queue import IngestJobQueue
+
+
+class GatedIngestService:
+    """Ingest service stand-in whose jobs wait for ``release`` before finishing."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.started: list[str] = []
+        self.failing: set[str] = set()
+
+    async def ingest_pdf(self, file_path, source, progress=None, replace=False):
+        self.started.append(source)
+        await self.release.wait()
+        if source in self.failing:
+            raise ValueError(f"{source} is not a PDF")
+        progress.pages_parsed += 1
+        progress.chunks_written += 3
+        return progress
+
+
+@pytest.fixture
+def service() -> GatedIngestService:
+    return GatedIngestService()
+
+
+@pytest.fixture
+async def jobs(service):
+    queue = IngestJobQueue(service, max_size=1, workers=1)
+    queue.start()
+    yield queue
+    await queue.stop()
+
+
+def spooled(tmp_path, name: str):
+    path = tmp_path / name
+    path.write_bytes(b"%PDF-1.4")
+    return path
+
+
+async def wait_for(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("condition not reached")
+
+
+async def test_submit_before_start_is_rejected(service, tmp_path):
+    queue = IngestJobQueue(service)
+
+    with pytest.raises(asyncio.QueueFull):
+        queue.submit(spooled(tmp_path, "a.pdf"), "a.pdf")
+
+
+async def test_full_queue_rejects_new_jobs(jobs, service, tmp_path):
+    running = jobs.submit(spooled(tmp_path, "a.pdf"), "a.pdf")
+    await wait_for(lambda: running.status == "running")
+    queued = jobs.submit(spooled(tmp_path, "b.pdf"), "b.pdf")
+
+    assert jobs.full()
+    with pytest.raises(asyncio.QueueFull):
+        jobs.submit(spooled(tmp_path, "c.pdf"), "c.pdf")
+    assert queued.status == "queued"
+
+
+async def test_finished_jobs_report_progress_and_remove_their_file(jobs, service, tmp_path):
+    path = spooled(tmp_path, "a.pdf")
+    job = jobs.submit(path, "a.pdf")
+    service.release.set()
+
+    await wait_for(lambda: job.finished_at is not None)
+
+    assert job.status == "succeeded"
+    assert job.progress.chunks_written == 3
+    assert jobs.get(job.id) is job
+    assert not path.exists()
+
+
+async def test_failed_job_records_the_error_and_the_worker_continues(jobs, service, tmp_path):
+    service.failing.add("bad.pdf")
+    service.release.set()
+
+    bad = jobs.submit(spooled(tmp_path, "bad.pdf"), "bad.pdf")
+    await wait_for(lambda: bad.finished_at is not None)
+    good = jobs.submit(spooled(tmp_path, "good.pdf"), "good.pdf")
+    await wait_for(lambda: good.finished_at is not None)
+
+    assert (bad.status, bad.error) == ("failed", "bad.pdf is not a PDF")
+    assert good.status == "succeeded"
+
+
+async def test_stop_cancels_running_and_queued_jobs(service, tmp_path):
+    jobs = IngestJobQueue(service, max_size=1, workers=1)
+    jobs.start()
+    running = jobs.submit(spooled(tmp_path, "a.pdf"), "a.pdf")
+    await wait_for(lambda: running.status == "running")
+    queued_path = spooled(tmp_path, "b.pdf")
+    queued = jobs.submit(queued_path, "b.pdf")
+
+    await jobs.stop()
+
+    assert running.status == "cancelled"
+    assert queued.status == "cancelled"
+    assert service.started == ["a.pdf"]
+    assert not list(tmp_path.iterdir())
+    assert not queued_path.exists()
+
+
+async def test_history_forgets_the_oldest_finished_jobs(service, tmp_path):
+    jobs = IngestJobQueue(service, max_size=4, workers=1, history_size=2)
+    jobs.start()
+    service.release.set()
+    first = jobs.submit(spooled(tmp_path, "a.pdf"), "a.pdf")
+    await wait_for(lambda: first.finished_at is not None)
+
+    later = [jobs.submit(spooled(tmp_path, f"{name}.pdf"), name) for name in "bc"]
+    await wait_for(lambda: all(job.finished_at is not None for job in later))
+    await jobs.stop()
+
+    assert jobs.get(first.id) is None
+    assert all(jobs.get(job.id) is job for job in later)
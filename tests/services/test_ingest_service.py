@@ -0,0 +1,151 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from app.repositories.batch_writer import BatchWriter
+from app.repositories.ingest_manifest_repository import (
+    IngestManifestRepository,
+    file_sha256,
+)
+from app.services.ingest_service import IngestService
+from tests.fakes import FakeWeaviateRepository
+
+STALE_ID = "00000000-0000-0000-0000-000000000000"
+WORDS = "the agent stores chunks of documents and retrieves them by hybrid search".split()
+
+
+class TextIngestService(IngestService):
+    """IngestService reading form-feed separated text files instead of PDFs."""
+
+    async def iter_page_batches(self, file_path):
+        pages = Path(file_path).read_text().split("\f")
+        yield list(enumerate(pages, start=1))
+
+
+@pytest.fixture
+def repo() -> FakeWeaviateRepository:
+    return FakeWeaviateRepository(
+        url="http://weaviate:8080", batch_writer=BatchWriter(max_retries=0, retry_backoff=0.0)
+    )
+
+
+@pytest.fixture
+def manifest(tmp_path) -> IngestManifestRepository:
+    return IngestManifestRepository(tmp_path / "manifest.db")
+
+
+@pytest.fixture
+def service(repo, manifest):
+    service = TextIngestService(
+        repo, batch_size=20, chunk_size=500, chunk_overlap=50, manifest=manifest
+    )
+    yield service
+    service.close()
+
+
+def write_pages(tmp_path, name: str, pages: int, seed: int = 0) -> Path:
+    """Write a document whose page ``n`` depends only on ``seed`` and ``n``."""
+    texts = []
+    for page in range(pages):
+        rng = random.Random(f"{seed}-{page}")
+        texts.append(" ".join(rng.choice(WORDS) for _ in range(150)) + ".")
+    path = tmp_path / name
+    path.write_text("\f".join(texts))
+    return path
+
+
+def stored(repo: FakeWeaviateRepository, source: str) -> set[str]:
+    objects = repo.client.collections.collection().objects
+    return {key for key, obj in objects.items() if obj.properties["source"] == source}
+
+
+async def test_unchanged_file_is_skipped(service, tmp_path):
+    path = write_pages(tmp_path, "guide.pdf", pages=2)
+    first = await service.ingest_pdf(path, "guide.pdf")
+
+    second = await service.ingest_pdf(path, "guide.pdf")
+
+    assert first.chunks_written > 0
+    assert second.unchanged
+    assert second.pages_parsed == second.chunks_written == 0
+
+
+async def test_changed_chunking_settings_invalidate_the_manifest(service, manifest, tmp_path):
+    path = write_pages(tmp_path, "guide.pdf", pages=1)
+    manifest.record("guide.pdf", file_sha256(path), "fixed:800:100", [STALE_ID])
+
+    result = await service.ingest_pdf(path, "guide.pdf")
+
+    assert not result.unchanged
+    assert result.chunks_written > 0
+    assert STALE_ID not in manifest.chunk_ids("guide.pdf")
+    assert manifest.is_unchanged("guide.pdf", file_sha256(path), service.chunking)
+
+
+async def test_new_version_skips_known_chunks_and_deletes_stale_ones(service, repo, tmp_path):
+    await service.ingest_pdf(write_pages(tmp_path, "v1.pdf", pages=3), "guide.pdf")
+    before = stored(repo, "guide.pdf")
+
+    # Same first page, the other two removed
+    result = await service.ingest_pdf(write_pages(tmp_path, "v2.pdf", pages=1), "guide.pdf")
+
+    after = stored(repo, "guide.pdf")
+    assert result.chunks_skipped > 0
+    assert result.chunks_deleted == len(before - after) > 0
+    assert len(after) == result.chunks_skipped + result.chunks_written < len(before)
+    assert service.manifest.chunk_ids("guide.pdf") == after
+
+
+async def test_replace_without_manifest_looks_up_previous_chunks(repo, tmp_path):
+    service = TextIngestService(repo, batch_size=20, chunk_size=500, chunk_overlap=50)
+    await service.ingest_pdf(write_pages(tmp_path, "v1.pdf", pages=3), "guide.pdf")
+    await service.ingest_pdf(write_pages(tmp_path, "other.pdf", pages=1, seed=5), "other.pdf")
+    other = stored(repo, "other.pdf")
+
+    result = await service.ingest_pdf(
+        write_pages(tmp_path, "v2.pdf", pages=1, seed=9), "guide.pdf", replace=True
+    )
+
+    assert result.chunks_deleted > 0
+    assert len(stored(repo, "guide.pdf")) == result.chunks_written
+    assert stored(repo, "other.pdf") == other
+
+
+async def test_failed_file_is_not_recorded(service, repo, tmp_path):
+    path = write_pages(tmp_path, "guide.pdf", pages=2)
+    repo.client.collections.collection().fail = lambda properties: True
+
+    failed = await service.ingest_pdf(path, "guide.pdf")
+    repo.client.collections.collection().fail = lambda properties: False
+    retried = await service.ingest_pdf(path, "guide.pdf")
+
+    assert failed.failures > 0
+    assert not retried.unchanged
+    assert retried.chunks_written == failed.failures
+
+
+async def test_delete_source_forgets_the_manifest_entry(service, repo, manifest, tmp_path):
+    path = write_pages(tmp_path, "guide.pdf", pages=2)
+    written = (await service.ingest_pdf(path, "guide.pdf")).chunks_written
+
+    deleted = await service.delete_source("guide.pdf")
+
+    assert deleted == written
+    assert stored(repo, "guide.pdf") == set()
+    assert manifest.chunk_ids("guide.pdf") == set()
+    assert not (await service.ingest_pdf(path, "guide.pdf")).unchanged
+
+
+async def test_ingest_many_attributes_batch_failures_to_files(service, repo, tmp_path):
+    files = [
+        (write_pages(tmp_path, "a.pdf", pages=1), "a.pdf"),
+        (write_pages(tmp_path, "b.pdf", pages=1, seed=3), "b.pdf"),
+    ]
+    repo.client.collections.collection().fail = lambda properties: properties["source"] == "b.pdf"
+
+    good, bad = await service.ingest_many(files)
+
+    assert good.failures == 0 and good.chunks_written == len(stored(repo, "a.pdf")) > 0
+    assert bad.failures > 0 and bad.chunks_written == 0
+    assert service.manifest.chunk_ids("a.pdf") and not service.manifest.chunk_ids("b.pdf")
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from weaviate.exceptions import WeaviateConnectionError
+
+from app.services.status_monitor import StatusMonitor
+
+
+class CountingRepository:
+    """Repository stand-in counting ``get_status`` calls."""
+
+    def __init__(self) -> None:
+        self.is_online = True
+        self.calls = 0
+        self.delay = 0.0
+        self.error: Exception | None = None
+
+    async def get_status(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"collection": "Documents", "online": True, "object_count": self.calls}
+
+
+@pytest.fixture
+def repo() -> CountingRepository:
+    return CountingRepository()
+
+
+async def test_status_is_served_from_the_snapshot(repo):
+    monitor = StatusMonitor(repo, interval=60)
+
+    first = await monitor.get()
+    second = await monitor.get()
+
+    assert repo.calls == 1
+    assert first["object_count"] == second["object_count"] == 1
+    assert second["age_seconds"] >= 0
+    assert "T" in second["refreshed_at"]
+
+
+async def test_fresh_status_queries_the_repository(repo):
+    monitor = StatusMonitor(repo, interval=60)
+    await monitor.get()
+
+    status = await monitor.get(fresh=True)
+
+    assert repo.calls == 2
+    assert status["object_count"] == 2
+
+
+async def test_zero_interval_refreshes_on_every_request(repo):
+    monitor = StatusMonitor(repo, interval=0)
+
+    await monitor.get()
+    await monitor.get()
+
+    assert repo.calls == 2
+
+
+async def test_concurrent_refreshes_share_one_collection(repo):
+    repo.delay = 0.05
+    monitor = StatusMonitor(repo, interval=60)
+
+    await asyncio.gather(*(monitor.get(fresh=True) for _ in range(5)))
+
+    assert repo.calls == 1
+
+
+async def test_failed_refresh_keeps_the_last_snapshot(repo):
+    monitor = StatusMonitor(repo, interval=60)
+    await monitor.get()
+    repo.error = WeaviateConnectionError("node down")
+
+    status = await monitor.get(fresh=True)
+
+    assert status["object_count"] == 1
+    assert "node down" in status["refresh_error"]
+
+
+async def test_online_flag_is_always_current(repo):
+    monitor = StatusMonitor(repo, interval=60)
+    await monitor.get()
+    repo.is_online = False
+
+    assert (await monitor.get())["online"] is False
+    assert repo.calls == 1
+
+
+async def test_background_task_refreshes_until_stopped(repo):
+    monitor = StatusMonitor(repo, interval=0.01)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    calls = repo.calls
+    await asyncio.sleep(0.03)
+
+    assert calls >= 2
+    assert repo.calls == calls
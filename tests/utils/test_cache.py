@@ -0,0 +1,187 @@
+import numpy as np
+import pytest
+
+from app.utils.cache import SemanticCache, TTLCache, normalize_query
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_normalize_query_folds_case_and_whitespace():
+    assert normalize_query("  What IS\tRAG?\n") == "what is rag?"
+
+
+def test_get_returns_stored_value_and_counts_hits():
+    cache = TTLCache()
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10.0, clock=clock)
+    cache.put("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_zero_ttl_never_expires():
+    clock = FakeClock()
+    cache = TTLCache(ttl=0, clock=clock)
+    cache.put("a", 1)
+
+    clock.now = 1e9
+    assert cache.get("a") == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_put_refreshes_an_existing_key_without_eviction():
+    cache = TTLCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+
+    assert len(cache) == 2
+    assert cache.get("a") == 10
+    assert cache.evictions == 0
+
+
+def test_invalidate_clears_entries_and_bumps_generation():
+    cache = TTLCache()
+    cache.put("a", 1)
+    cache.invalidate()
+
+    assert cache.get("a") is None
+    assert cache.generation == 1
+
+
+def test_value_computed_before_invalidation_is_dropped():
+    cache = TTLCache()
+    generation = cache.generation
+    cache.invalidate()
+    cache.put("a", 1, generation)
+
+    assert cache.get("a") is None
+
+    cache.put("a", 2, cache.generation)
+    assert cache.get("a") == 2
+
+
+def test_max_entries_must_be_positive():
+    with pytest.raises(ValueError):
+        TTLCache(max_entries=0)
+
+
+def unit(*components: float) -> np.ndarray:
+    return np.array(components, dtype=np.float32)
+
+
+def test_semantic_cache_hits_similar_vectors_only():
+    cache = SemanticCache(threshold=0.98)
+    cache.put(unit(1.0, 0.0, 0.0), "answer")
+
+    assert cache.get(unit(2.0, 0.05, 0.0)) == "answer"
+    assert cache.get(unit(1.0, 1.0, 0.0)) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_semantic_cache_returns_the_most_similar_entry():
+    cache = SemanticCache(threshold=0.9)
+    cache.put(unit(1.0, 0.2), "near")
+    cache.put(unit(1.0, 0.0), "exact")
+
+    assert cache.get(unit(1.0, 0.0)) == "exact"
+
+
+def test_semantic_cache_misses_on_empty_cache_and_other_dimensions():
+    cache = SemanticCache()
+    assert cache.get(unit(1.0, 0.0)) is None
+
+    cache.put(unit(1.0, 0.0), "answer")
+    assert cache.get(unit(1.0, 0.0, 0.0)) is None
+
+
+def test_semantic_cache_entries_expire():
+    clock = FakeClock()
+    cache = SemanticCache(ttl=10.0, clock=clock)
+    cache.put(unit(1.0, 0.0), "answer")
+
+    clock.now = 10.0
+    assert cache.get(unit(1.0, 0.0)) is None
+
+
+def test_semantic_cache_replaces_the_least_recently_used_entry():
+    clock = FakeClock()
+    cache = SemanticCache(max_entries=2, clock=clock)
+    cache.put(unit(1.0, 0.0, 0.0), "x")
+    clock.now = 1.0
+    cache.put(unit(0.0, 1.0, 0.0), "y")
+    clock.now = 2.0
+    cache.get(unit(1.0, 0.0, 0.0))
+    clock.now = 3.0
+    cache.put(unit(0.0, 0.0, 1.0), "z")
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get(unit(0.0, 1.0, 0.0)) is None
+    assert cache.get(unit(1.0, 0.0, 0.0)) == "x"
+    assert cache.get(unit(0.0, 0.0, 1.0)) == "z"
+
+
+def test_semantic_cache_replaces_expired_entries_first():
+    clock = FakeClock()
+    cache = SemanticCache(max_entries=2, ttl=10.0, clock=clock)
+    cache.put(unit(1.0, 0.0, 0.0), "old")
+    clock.now = 5.0
+    cache.put(unit(0.0, 1.0, 0.0), "recent")
+    clock.now = 9.0
+    # Used after "recent", but expires first
+    cache.get(unit(1.0, 0.0, 0.0))
+    clock.now = 12.0
+    cache.put(unit(0.0, 0.0, 1.0), "new")
+
+    assert cache.get(unit(0.0, 1.0, 0.0)) == "recent"
+    assert cache.get(unit(0.0, 0.0, 1.0)) == "new"
+
+
+def test_semantic_cache_drops_values_computed_before_invalidation():
+    cache = SemanticCache()
+    cache.put(unit(1.0, 0.0), "answer")
+    generation = cache.generation
+    cache.invalidate()
+    cache.put(unit(0.0, 1.0), "stale", generation)
+
+    assert len(cache) == 0
+    assert cache.get(unit(1.0, 0.0)) is None
+    assert cache.get(unit(0.0, 1.0)) is None
+
+
+def test_semantic_cache_rejects_invalid_threshold():
+    with pytest.raises(ValueError):
+        SemanticCache(threshold=1.5)
@@ -0,0 +1,112 @@
+from itertools import pairwise
+
+import pytest
+
+from app.utils.chunking import (
+    ChunkingStrategy,
+    PageChunker,
+    estimate_tokens,
+    get_chunking_strategy,
+)
+
+
+def chunk_pages(chunker: PageChunker, pages: list[str]) -> list[dict]:
+    chunks = []
+    for page_num, text in enumerate(pages, start=1):
+        chunks.extend(chunker.feed(page_num, text))
+    chunks.extend(chunker.flush())
+    return chunks
+
+
+def pages_of(chunk: dict) -> tuple[int, int]:
+    metadata = chunk["metadata"]
+    return int(metadata["page_start"]), int(metadata["page_end"])
+
+
+def test_short_document_is_one_chunk_on_its_page():
+    chunks = chunk_pages(PageChunker("doc.pdf", chunk_size=1000, chunk_overlap=100), ["Hello world."])
+
+    assert len(chunks) == 1
+    assert "Hello world." in chunks[0]["text"]
+    assert chunks[0]["metadata"]["source"] == "doc.pdf"
+    assert chunks[0]["metadata"]["chunk_index"] == "0"
+    assert pages_of(chunks[0]) == (1, 1)
+
+
+def test_chunk_crossing_a_page_break_spans_both_pages():
+    chunker = PageChunker("doc.pdf", chunk_size=120, chunk_overlap=20)
+    chunks = chunk_pages(chunker, ["a" * 100, "b" * 100])
+
+    spans = [pages_of(chunk) for chunk in chunks]
+    assert (1, 2) in spans
+    # Chunks entirely inside a page report only that page
+    for chunk, span in zip(chunks, spans):
+        if "a" not in chunk["text"]:
+            assert span == (2, 2)
+        if "b" not in chunk["text"]:
+            assert span == (1, 1)
+
+
+def test_blank_pages_are_skipped_and_keep_page_numbers():
+    chunks = chunk_pages(PageChunker("doc.pdf", chunk_size=1000), ["first", "   ", "third"])
+
+    assert len(chunks) == 1
+    assert "--- Page 2 ---" not in chunks[0]["text"]
+    assert pages_of(chunks[0]) == (1, 3)
+
+
+def test_fixed_chunks_overlap_and_are_numbered_in_order():
+    text = "".join(chr(ord("a") + i % 26) for i in range(1000))
+    chunks = chunk_pages(PageChunker("doc.pdf", chunk_size=200, chunk_overlap=50), [text])
+
+    assert [chunk["metadata"]["chunk_index"] for chunk in chunks] == [str(i) for i in range(len(chunks))]
+    assert all(len(chunk["text"]) <= 200 for chunk in chunks)
+    for previous, current in pairwise(chunks):
+        assert previous["text"][-50:] == current["text"][:50]
+
+
+def test_buffered_segments_stay_bounded():
+    chunker = PageChunker("doc.pdf", chunk_size=100, chunk_overlap=10)
+    for page_num in range(1, 200):
+        chunker.feed(page_num, "x" * 500)
+        assert len(chunker._segments) <= 2
+
+
+def test_page_span_uses_page_offsets():
+    chunker = PageChunker("doc.pdf", chunk_size=10_000)
+    chunker.feed(3, "abc")
+    chunker.feed(7, "def")
+    second_page = chunker._page_offsets[1]
+
+    assert chunker.page_span(0, second_page) == (3, 3)
+    assert chunker.page_span(0, second_page + 1) == (3, 7)
+    assert chunker.page_span(second_page, second_page + 5) == (7, 7)
+
+
+def test_sentence_strategy_ends_chunks_at_sentence_boundaries():
+    text = " ".join(f"Sentence number {i} ends here." for i in range(40))
+    chunks = chunk_pages(PageChunker("doc.pdf", chunk_size=200, chunk_overlap=0, strategy="sentence"), [text])
+
+    assert len(chunks) > 1
+    assert all(chunk["text"].endswith(".") for chunk in chunks)
+
+
+def test_token_strategy_respects_the_token_budget():
+    text = " ".join(f"word{i}" for i in range(2000))
+    chunks = chunk_pages(PageChunker("doc.pdf", chunk_size=100, chunk_overlap=10, strategy="tokens"), [text])
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk["text"]) <= 100 for chunk in chunks)
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError, match="Unknown chunking strategy"):
+        get_chunking_strategy("paragraph")
+
+
+def test_strategy_without_split_cannot_be_created():
+    class Incomplete(ChunkingStrategy):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete(chunk_size=100, chunk_overlap=10)
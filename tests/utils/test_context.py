@@ -0,0 +1,61 @@
+from app.utils.chunking import estimate_tokens, truncate_tokens
+from app.utils.context import TRUNCATION_MARKER, pack_context
+
+
+def words(count: int, word: str = "word") -> str:
+    return " ".join([word] * count)
+
+
+def test_truncate_tokens_keeps_the_first_tokens():
+    assert truncate_tokens("one two, three", 3) == "one two,"
+    assert truncate_tokens("one two", 10) == "one two"
+    assert truncate_tokens("one two", 0) == ""
+
+
+def test_parts_that_fit_are_kept_whole():
+    packed = pack_context(["a b c", "d e"], max_tokens=10)
+
+    assert packed.parts == ["a b c", "d e"]
+    assert packed.tokens == 5
+    assert packed.dropped == 0
+    assert not packed.truncated
+    assert packed.text == "a b c\n\nd e"
+
+
+def test_zero_budget_disables_the_limit():
+    packed = pack_context([words(500), words(500)], max_tokens=0)
+
+    assert len(packed.parts) == 2
+    assert packed.dropped == 0
+
+
+def test_overflowing_part_is_truncated_within_the_budget():
+    packed = pack_context([words(40), words(100, "more"), words(10, "last")], max_tokens=100)
+
+    assert packed.truncated
+    assert packed.parts[1].endswith(TRUNCATION_MARKER)
+    assert packed.parts[1].startswith("more")
+    assert packed.tokens <= 100
+    assert packed.tokens == sum(estimate_tokens(part) for part in packed.parts)
+    assert packed.dropped == 1
+
+
+def test_overflowing_part_is_dropped_when_too_little_budget_is_left():
+    packed = pack_context([words(90), words(50), words(5)], max_tokens=100, min_part_tokens=32)
+
+    assert packed.parts == [words(90)]
+    assert packed.dropped == 2
+    assert not packed.truncated
+
+
+def test_scores_order_parts_with_missing_scores_last():
+    packed = pack_context(["low", "none", "high"], max_tokens=100, scores=[0.1, None, 0.9])
+
+    assert packed.parts == ["high", "low", "none"]
+
+
+def test_parts_after_the_first_overflow_are_dropped_even_if_they_fit():
+    packed = pack_context([words(60), words(60), "tiny"], max_tokens=80, min_part_tokens=32)
+
+    assert "tiny" not in packed.parts
+    assert packed.dropped == 2
@@ -0,0 +1,91 @@
+import numpy as np
+
+from app.utils.diversity import diversify, merge_adjacent_chunks, merge_text, mmr_select
+
+
+def chunk(source: str, index: int, text: str, score: float | None = None, **extra) -> dict:
+    result = {"text": text, "metadata": {"source": source, "chunk_index": str(index), **extra}}
+    if score is not None:
+        result["score"] = score
+    return result
+
+
+def test_mmr_with_lambda_one_ranks_by_relevance():
+    relevance = np.array([0.2, 0.9, 0.5])
+    vectors = np.eye(3)
+
+    assert mmr_select(relevance, vectors, 3, lambda_mult=1.0) == [1, 2, 0]
+
+
+def test_mmr_skips_near_duplicates():
+    relevance = np.array([1.0, 0.99, 0.6])
+    vectors = np.array([[1.0, 0.0], [1.0, 0.01], [0.0, 1.0]])
+
+    assert mmr_select(relevance, vectors, 2) == [0, 2]
+
+
+def test_mmr_handles_k_beyond_candidates_and_zero_vectors():
+    relevance = np.array([0.5, 0.4])
+    vectors = np.zeros((2, 3))
+
+    assert mmr_select(relevance, vectors, 5) == [0, 1]
+    assert mmr_select(relevance, vectors, 0) == []
+
+
+def test_merge_text_removes_the_overlap():
+    assert merge_text("the quick brown", "quick brown fox") == "the quick brown fox"
+    assert merge_text("abc", "xyz") == "abc\nxyz"
+
+
+def test_merge_text_ignores_short_coincidental_matches():
+    assert merge_text("zero", "one") == "zero\none"
+
+
+def test_adjacent_chunks_merge_at_the_best_rank():
+    results = [
+        chunk("a.pdf", 2, "second part third part", score=0.9, page_start="1", page_end="1"),
+        chunk("b.pdf", 0, "other", score=0.8),
+        chunk("a.pdf", 1, "first part second part", score=0.7, page_start="1", page_end="1"),
+        chunk("a.pdf", 3, "third part fourth part", score=0.6, page_start="1", page_end="2"),
+    ]
+    merged = merge_adjacent_chunks(results)
+
+    assert [result["metadata"]["source"] for result in merged] == ["a.pdf", "b.pdf"]
+    span = merged[0]
+    assert span["text"] == "first part second part third part fourth part"
+    assert span["metadata"]["chunk_index"] == "1"
+    assert span["metadata"]["chunk_end"] == "3"
+    assert span["metadata"]["page_end"] == "2"
+    assert span["score"] == 0.9
+
+
+def test_chunks_with_gaps_or_other_sources_stay_separate():
+    results = [chunk("a.pdf", 1, "one"), chunk("a.pdf", 3, "three"), chunk("b.pdf", 2, "two")]
+
+    assert merge_adjacent_chunks(results) == results
+
+
+def test_results_without_chunk_metadata_are_kept():
+    results = [{"text": "web", "metadata": {}}, chunk("a.pdf", 0, "zero"), chunk("a.pdf", 1, "one")]
+    merged = merge_adjacent_chunks(results)
+
+    assert merged[0] == results[0]
+    assert merged[1]["text"] == "zero\none"
+
+
+def test_diversify_without_vectors_keeps_the_top_k():
+    results = [chunk("a.pdf", i * 2, f"text {i}", score=1.0 - i / 10) for i in range(5)]
+
+    assert diversify(results, 3) == results[:3]
+
+
+def test_diversify_selects_by_mmr_keeps_rank_order_and_drops_vectors():
+    results = [
+        {**chunk("a.pdf", 0, "first", score=1.0), "vector": [1.0, 0.0]},
+        {**chunk("a.pdf", 5, "duplicate", score=0.99), "vector": [1.0, 0.01]},
+        {**chunk("b.pdf", 0, "different", score=0.5), "vector": [0.0, 1.0]},
+    ]
+    selected = diversify(results, 2)
+
+    assert [result["text"] for result in selected] == ["first", "different"]
+    assert all("vector" not in result for result in selected)
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+class Work:
+    def __init__(self) -> None:
+        self.started = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> str:
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "result"
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    work = Work()
+    callers = [asyncio.create_task(flight.do("key", work)) for _ in range(10)]
+    await asyncio.sleep(0)
+    work.release.set()
+
+    assert await asyncio.gather(*callers) == ["result"] * 10
+    assert work.started == 1
+    assert flight.stats() == {"calls": 1, "coalesced": 9, "in_flight": 0}
+
+
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+    work = Work()
+    work.release.set()
+
+    await asyncio.gather(flight.do("a", work), flight.do("b", work))
+
+    assert work.started == 2
+
+
+async def test_finished_calls_are_not_reused():
+    flight = SingleFlight()
+    work = Work()
+    work.release.set()
+
+    await flight.do("key", work)
+    await flight.do("key", work)
+
+    assert work.started == 2
+    assert len(flight) == 0
+
+
+async def test_exceptions_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def fail() -> None:
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.calls == 1
+
+
+async def test_cancelled_first_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+    work = Work()
+    first = asyncio.create_task(flight.do("key", work))
+    second = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    work.release.set()
+
+    assert await second == "result"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert not work.cancelled
+
+
+async def test_work_is_cancelled_when_every_caller_is_cancelled():
+    flight = SingleFlight()
+    work = Work()
+    callers = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert work.cancelled
+    assert len(flight) == 0
+
+
+async def test_new_call_after_cancellation_starts_fresh_work():
+    flight = SingleFlight()
+    work = Work()
+    caller = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.gather(caller, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    work.release.set()
+    assert await flight.do("key", work) == "result"
+    assert work.started == 2